@@ -0,0 +1,88 @@
+"""Run many AsyncTracker instances on one event loop and report the CPU
+they use and how late the loop wakes up.
+
+    python -m benchmarks.async_timers --timers 10000 --seconds 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Any
+
+from focusedme.__main__ import AsyncTracker, Log, Pomodoro
+
+PROBE_INTERVAL = 0.01
+NO_SOUND = {"sound": "", "path": ""}
+
+
+async def probe_lateness(samples: list[float], stop: asyncio.Event) -> None:
+    """sleep in small steps and record how late each wakeup is"""
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        target = loop.time() + PROBE_INTERVAL
+        await asyncio.sleep(PROBE_INTERVAL)
+        samples.append(loop.time() - target)
+
+
+async def run(timers: int, seconds: float, session: float) -> dict[str, float]:
+    # session lengths are given in seconds, Round expects minutes, here
+    # fractions of one
+    len_args: dict[str, Any] = {
+        "focus_time": session / 60,
+        "short_break": session / 60,
+        "long_break": session / 60,
+    }
+    trackers = [
+        AsyncTracker(Pomodoro(len_args, 1).create_rounds(), Log())
+        for _ in range(timers)
+    ]
+    ticks = 0
+
+    def show_time(remainder: int, num_round: int, num_session: int, t: str) -> None:
+        nonlocal ticks
+        ticks += 1
+
+    samples: list[float] = []
+    stop = asyncio.Event()
+    probe = asyncio.create_task(probe_lateness(samples, stop))
+    tasks = [asyncio.create_task(t.start(show_time, NO_SOUND)) for t in trackers]
+
+    wall, cpu = time.perf_counter(), time.process_time()
+    await asyncio.sleep(seconds)
+    wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+
+    await asyncio.gather(*(t.quit() for t in trackers))
+    await asyncio.gather(*tasks)
+    stop.set()
+    await probe
+
+    samples.sort()
+    return {
+        "timers": timers,
+        "cpu_percent": 100 * cpu / wall,
+        "ticks_per_second": ticks / wall,
+        "lateness_median_ms": 1000 * statistics.median(samples),
+        "lateness_p99_ms": 1000 * samples[int(len(samples) * 0.99)],
+        "lateness_max_ms": 1000 * samples[-1],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--timers", type=int, default=10_000)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument(
+        "--session", type=float, default=3.0, help="session length in seconds"
+    )
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args.timers, args.seconds, args.session))
+    for key, value in results.items():
+        print(f"{key:>20}: {value:.2f}")
+
+
+if __name__ == "__main__":
+    main()
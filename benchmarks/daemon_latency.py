@@ -0,0 +1,70 @@
+"""Measure the round-trip latency of 'status' requests to the daemon, on a
+kept-alive connection and with one connection per request (as a status bar
+spawning 'focusedme client status' would).
+
+    python -m benchmarks.daemon_latency --requests 20000
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import socket
+import statistics
+import tempfile
+import threading
+import time
+
+from focusedme.__main__ import AsyncTracker, Pomodoro
+from focusedme.daemon import Daemon, request
+
+TIME_ARGS = {"focus_time": 25, "short_break": 5, "long_break": 25}
+NO_SOUND = {"sound": "", "path": ""}
+
+
+def report(label: str, samples: list[float]) -> None:
+    samples.sort()
+    print(
+        f"{label:>14}: median {1e6 * statistics.median(samples):7.1f} us, "
+        f"p99 {1e6 * samples[int(len(samples) * 0.99)]:7.1f} us, "
+        f"{len(samples) / sum(samples):9.0f} requests/s"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=20_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "focusedme.sock")
+        tracker = AsyncTracker(Pomodoro(TIME_ARGS, 1).create_rounds())
+        thread = threading.Thread(target=Daemon(tracker, NO_SOUND, path).run)
+        thread.start()
+        while not os.path.exists(path):
+            time.sleep(0.01)
+
+        kept_alive = []
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(path)
+            for _ in range(args.requests):
+                started = time.perf_counter()
+                sock.sendall(b"status\n")
+                sock.recv(256)
+                kept_alive.append(time.perf_counter() - started)
+
+        per_connection = []
+        for _ in range(args.requests // 10):
+            started = time.perf_counter()
+            request("status", path)
+            per_connection.append(time.perf_counter() - started)
+
+        request("quit", path)
+        thread.join()
+
+    report("kept alive", kept_alive)
+    report("new connection", per_connection)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Run many trackers without a display and draw them on a dashboard for a
+few seconds, all on one event loop, reporting the CPU used by the process
+and the rows written.
+
+    python -m benchmarks.dashboard --timers 500 --fps 4 --seconds 10
+
+Frames go to a null stream, so the figures are those of the render loop and
+the timers, not of a terminal emulator.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import time
+
+from focusedme.__main__ import AsyncTracker, Log, Pomodoro
+from focusedme.dashboard import Dashboard
+
+TIME_ARGS = {"focus_time": 25, "short_break": 5, "long_break": 25, "num_rounds": 4}
+NO_SOUND = {"sound": "", "path": "Ring01.wav"}
+
+
+async def run(args: argparse.Namespace) -> None:
+    board = Dashboard(out=open(os.devnull, "w"), fps=args.fps, height=args.timers + 1)
+    tasks = []
+    for i in range(args.timers):
+        tracker = AsyncTracker(Pomodoro(TIME_ARGS, 4).create_rounds(), Log())
+        board.add(f"timer{i}", tracker)
+        tasks.append(asyncio.ensure_future(tracker.start(None, NO_SOUND)))
+        # spread the trackers over a second, as if started by hand
+        await asyncio.sleep(1 / args.timers)
+
+    frames = board.frames
+    rows = board.rows_written
+    cpu = time.process_time()
+    started = time.perf_counter()
+    try:
+        await asyncio.wait_for(board.run(), args.seconds)
+    except asyncio.TimeoutError:
+        pass
+    elapsed = time.perf_counter() - started
+    cpu = time.process_time() - cpu
+    frames = board.frames - frames
+    rows = board.rows_written - rows
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+    print(
+        f"{args.timers} timers at {args.fps:g} fps: {frames} frames in"
+        f" {elapsed:.1f} s, {rows / frames:.0f} rows per frame,"
+        f" {100 * cpu / elapsed:.2f}% of one core"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--timers", type=int, default=500)
+    parser.add_argument("--fps", type=float, default=4.0)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
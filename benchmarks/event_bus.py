@@ -0,0 +1,54 @@
+"""Show that publishing a tick costs the timer the same time with one or a
+thousand subscribers, fast or slow.
+
+    python -m benchmarks.event_bus --subscribers 1000 --ticks 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from focusedme.events import Event, EventBus, Tick
+
+
+def publish_cost(subscribers: int, ticks: int, work: float) -> tuple[float, EventBus]:
+    """mean seconds spent in publish() per tick"""
+    bus = EventBus()
+
+    def subscriber(event: Event) -> None:
+        # stand-in for a consumer doing some work with every event
+        end = time.perf_counter() + work
+        while time.perf_counter() < end:
+            pass
+
+    for _ in range(subscribers):
+        bus.subscribe(subscriber, [Tick])
+
+    started = time.perf_counter()
+    for remainder in range(ticks, 0, -1):
+        bus.publish(Tick(1, 1, remainder, "focus_time"))
+    elapsed = time.perf_counter() - started
+    bus.flush()
+    return elapsed / ticks, bus
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--subscribers", type=int, default=1000)
+    parser.add_argument("--ticks", type=int, default=100_000)
+    parser.add_argument(
+        "--work", type=float, default=1e-6, help="seconds spent per delivery"
+    )
+    args = parser.parse_args()
+
+    for subscribers in (1, args.subscribers):
+        cost, bus = publish_cost(subscribers, args.ticks, args.work)
+        print(
+            f"{subscribers:>6} subscribers: {1e6 * cost:6.2f} us per publish, "
+            f"{bus.coalesced} of {args.ticks} ticks coalesced before the fan-out"
+        )
+
+
+if __name__ == "__main__":
+    main()
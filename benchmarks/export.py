@@ -0,0 +1,52 @@
+"""Export a synthetic history in every available format and report the
+time taken, the output size and the peak memory allocated while writing.
+
+    python -m benchmarks.export --sessions 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.history_queries import synthetic_sessions
+from focusedme.export import FORMATS, TEXT_FORMATS, ExportError, check_format, export
+from focusedme.history import History
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    # about a year of sessions at 24 a day
+    parser.add_argument("--sessions", type=int, default=9_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        history = History(os.path.join(tmp, "history.sqlite3"))
+        history.record_many(synthetic_sessions(args.sessions))
+        for fmt in FORMATS:
+            try:
+                check_format(fmt)
+            except ExportError as exc:
+                print(f"{fmt:>8}: skipped, {exc}")
+                continue
+            path = os.path.join(tmp, "export." + fmt)
+            with open(path, "w" if fmt in TEXT_FORMATS else "wb") as out:
+                tracemalloc.start()
+                started = time.perf_counter()
+                count = export(history.sessions(), fmt, out)
+                elapsed = time.perf_counter() - started
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+            size = os.path.getsize(path)
+            print(
+                f"{fmt:>8}: {count} sessions in {1000 * elapsed:7.1f} ms,"
+                f" {size / 1e6:6.1f} MB, peak {peak / 1e6:5.2f} MB allocated"
+            )
+        history.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Load a synthetic history of sessions into a database and time the queries
+behind 'focusedme stats'.
+
+    python -m benchmarks.history_queries --sessions 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from typing import Any, Callable, Iterator
+
+from focusedme.history import History, Row
+
+PROJECTS = ["", "book", "code", "email", "study"]
+# focus, break, focus, break, ... as in Round.round_template
+PATTERN = [("focus_time", 25), ("short_break", 5)] * 3 + [
+    ("focus_time", 25),
+    ("long_break", 25),
+]
+
+
+def synthetic_sessions(count: int, seed: int = 0) -> Iterator[Row]:
+    """about 24 sessions per working day, going back as far as needed"""
+    rng = random.Random(seed)
+    day = 86400
+    start = time.time() - (count // 24 + 1) * day
+    n = 0
+    while n < count:
+        now = start + rng.randint(7, 10) * 3600
+        project = rng.choice(PROJECTS)
+        for _ in range(24):
+            session_type, planned = PATTERN[n % len(PATTERN)]
+            skipped = rng.random() < 0.1
+            length = planned * 60 * (rng.random() if skipped else 1)
+            yield (
+                now,
+                now + length,
+                session_type,
+                planned,
+                "skipped" if skipped else "done",
+                project,
+                n % 24 // 8 + 1,
+                n % 8 + 1,
+            )
+            now += length
+            n += 1
+            if n == count:
+                return
+        start += day
+
+
+def timed(label: str, func: Callable[[], list[Any]], repeat: int = 5) -> None:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        rows = func()
+        best = min(best, time.perf_counter() - started)
+    print(f"{label:>28}: {1000 * best:8.2f} ms ({len(rows)} rows)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        history = History(os.path.join(tmp, "history.sqlite3"))
+        started = time.perf_counter()
+        history.record_many(synthetic_sessions(args.sessions))
+        elapsed = time.perf_counter() - started
+        print(f"inserted {args.sessions} sessions in {elapsed:.1f} s")
+
+        timed("focus minutes per day", lambda: history.focus_minutes("day"))
+        timed("focus minutes per week", lambda: history.focus_minutes("week"))
+        timed("focus minutes per project", lambda: history.focus_minutes("project"))
+        timed("skip rate by hour", history.skip_rate_by_hour)
+        history.close()
+
+
+if __name__ == "__main__":
+    main()
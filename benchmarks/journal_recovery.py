@@ -0,0 +1,71 @@
+"""Time the recovery of an interrupted run from a journal holding a year of
+history.
+
+    python -m benchmarks.journal_recovery --days 365
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+
+from focusedme.__main__ import Log, Pomodoro, Tracker
+from focusedme.journal import DONE, END, RECORD, RUN, STARTED, Journal
+
+TIME_ARGS = {"focus_time": 25, "short_break": 5, "long_break": 25, "num_rounds": 3}
+ZERO = (0.0, 0.0, 0.0)
+SESSIONS_PER_ROUND = len(Pomodoro(TIME_ARGS).create_rounds()[0].sessions)
+
+
+def write_history(path: str, days: int) -> int:
+    """write one finished run per day, then an unfinished one"""
+    lengths = (25.0, 5.0, 25.0)
+    records = bytearray()
+    now = time.time() - days * 86400
+    for day in range(days + 1):
+        if day == days:
+            # the unfinished run is recent enough to be resumed
+            now = time.time() - 30 * 60
+        records += RECORD.pack(now, RUN, 0, TIME_ARGS["num_rounds"], *lengths)
+        for round_idx in range(TIME_ARGS["num_rounds"]):
+            for session_idx in range(SESSIONS_PER_ROUND):
+                if day == days and round_idx == 1 and session_idx == 3:
+                    # the process crashed in the middle of this session
+                    records += RECORD.pack(now, STARTED, session_idx, round_idx, *ZERO)
+                    with open(path, "wb") as f:
+                        f.write(records)
+                    return len(records) // RECORD.size
+                for event in (STARTED, DONE):
+                    records += RECORD.pack(now, event, session_idx, round_idx, *ZERO)
+                    now += 60
+        records += RECORD.pack(now, END, 0, 0, *ZERO)
+        now += 86400 - 140 * 60 * TIME_ARGS["num_rounds"]
+    raise AssertionError("unreachable")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "journal.bin")
+        count = write_history(path, args.days)
+        journal = Journal(path)
+
+        best = float("inf")
+        for _ in range(args.repeat):
+            tracker = Tracker(Pomodoro(TIME_ARGS, 3).create_rounds(), Log())
+            started = time.perf_counter()
+            assert journal.restore(tracker, TIME_ARGS)
+            best = min(best, time.perf_counter() - started)
+
+    print(f"{count} records ({count * RECORD.size / 1024:.0f} KiB)")
+    print(f"recovery: {1000 * best:.3f} ms (budget 50 ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""Simulate the same days on 1, 2, 4... processes and report the days per
+second and the speedup over one process.
+
+    python -m benchmarks.montecarlo --days 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import time
+
+from focusedme.montecarlo import Behaviour, Plan, monte_carlo
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=int, default=50_000)
+    parser.add_argument("--schedule", default="25,5,25,3")
+    parser.add_argument(
+        "--workers", help="comma separated counts, default is 1, 2, 4... cores"
+    )
+    args = parser.parse_args()
+
+    plan = Plan.parse(args.schedule)
+    if args.workers:
+        counts = [int(n) for n in args.workers.split(",")]
+    else:
+        cores = os.cpu_count() or 1
+        counts = [1]
+        while counts[-1] * 2 <= cores:
+            counts.append(counts[-1] * 2)
+        if counts[-1] != cores:
+            counts.append(cores)
+
+    single = None
+    for workers in counts:
+        started = time.perf_counter()
+        monte_carlo(plan, Behaviour(), args.days, workers=workers)
+        rate = args.days / (time.perf_counter() - started)
+        single = single or rate
+        print(
+            f"{workers:>3} workers: {rate:10,.0f} days/s,"
+            f" {rate / single:5.2f}x one worker"
+        )
+
+
+if __name__ == "__main__":
+    main()
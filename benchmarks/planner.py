@@ -0,0 +1,63 @@
+"""Plan 100k sessions with the bulk planner and with Round objects built one
+by one through Pomodoro.create_rounds, and report the time taken by each.
+
+    python -m benchmarks.planner --sessions 100000
+
+The object path only stamps the sessions back to back, without working
+hours or lunch, so it is a lower bound of what planning with it would cost.
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime
+import time
+
+from focusedme import planner
+from focusedme.__main__ import Pomodoro, Round
+
+TIME_ARGS = {"focus_time": 25, "short_break": 5, "long_break": 25, "num_rounds": 0}
+
+
+def with_objects(sessions: int, start: float) -> list[Round]:
+    rounds = Pomodoro(TIME_ARGS, -(-sessions // 8)).create_rounds()
+    now = start
+    for cur_round in rounds:
+        for session in cur_round.sessions:
+            session.started_at = now
+            now += session.length * 60
+            session.ended_at = now
+    return rounds
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    start = datetime.datetime(2026, 1, 5, 9)
+    hours = (datetime.time(9), datetime.time(17))
+    lunch = (datetime.time(12), datetime.time(13))
+    windows = planner.working_windows(hours, [lunch])
+    per_day = len(planner.plan_day(TIME_ARGS, windows)[0])
+    days = -(-args.sessions // per_day)
+
+    best = {"planner": float("inf"), "objects": float("inf")}
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        table = planner.plan(TIME_ARGS, start, days, weekdays=range(7))
+        best["planner"] = min(best["planner"], time.perf_counter() - started)
+
+        started = time.perf_counter()
+        with_objects(len(table), start.timestamp())
+        best["objects"] = min(best["objects"], time.perf_counter() - started)
+
+    backend = "numpy" if planner._numpy() is not None else "arrays, without numpy"
+    print(f"{len(table):,} sessions over {days} days")
+    print(f"  planner ({backend}): {best['planner'] * 1e3:8.1f} ms")
+    print(f"  Round objects:       {best['objects'] * 1e3:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Count the bytes and write syscalls View.show_time sends to a terminal over
+one minute of countdown, compared with the former print-based renderer.
+
+    python -m benchmarks.render --minutes 25
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+
+from focusedme.__main__ import View
+
+
+class CountingTTY(io.StringIO):
+    """terminal stand-in counting bytes written and flushes"""
+
+    def __init__(self) -> None:
+        self.bytes = 0
+        self.flushes = 0
+
+    def isatty(self) -> bool:
+        return True
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        self.bytes += len(text.encode())
+        return len(text)
+
+    def flush(self) -> None:
+        self.flushes += 1
+
+
+def legacy_show_time(remainder: int, num_round: int, num_session: int) -> None:
+    """the renderer shipped before frames were diffed"""
+    minutes, seconds = divmod(remainder, 60)
+    label = View.get_color("lightred") + "FOCUS TIME" + View.get_color("reset")
+    print(
+        "Round",
+        num_round,
+        "/",
+        "Session",
+        num_session,
+        "-",
+        label,
+        ": ",
+        "{:00}min {:00}s remaining   ".format(minutes, seconds),
+        end="",
+        flush=True,
+    )
+    print("\r", end="", flush=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--minutes", type=int, default=25)
+    args = parser.parse_args()
+    seconds = args.minutes * 60
+
+    legacy = CountingTTY()
+    with contextlib.redirect_stdout(legacy):
+        for remainder in range(seconds, 0, -1):
+            legacy_show_time(remainder, 1, 1)
+
+    current = CountingTTY()
+    view = View(current)
+    for remainder in range(seconds, 0, -1):
+        view.show_time(remainder, 1, 1, "focus_time")
+
+    # every flush of a buffered terminal stream is one write(2)
+    for name, tty in (("print", legacy), ("diff", current)):
+        print(
+            f"{name:>5}: {tty.bytes / args.minutes:8.1f} bytes/min, "
+            f"{tty.flushes / args.minutes:6.1f} syscalls/min"
+        )
+
+
+if __name__ == "__main__":
+    main()
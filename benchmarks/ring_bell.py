@@ -0,0 +1,45 @@
+"""Measure the time between the end of a session and the moment the
+notification sound is handed to the audio backend, with and without the
+decoded sound cache.
+
+    python -m benchmarks.ring_bell --repeat 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import time
+
+import focusedme.__main__ as focusedme_main
+from focusedme.__main__ import View
+
+
+def time_to_sound(path: str, cached: bool) -> float:
+    if not cached:
+        focusedme_main._SOUNDS.clear()
+    started = time.perf_counter()
+    View.ring_bell(path)
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--path", default="Ring01.wav")
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+    if focusedme_main._simpleaudio() is None and sys.platform != "darwin":
+        parser.error("simpleaudio is not installed")
+
+    for cached in (False, True):
+        samples = [time_to_sound(args.path, cached) for _ in range(args.repeat)]
+        label = "cached" if cached else "cold"
+        print(
+            f"{label:>6}: median {1000 * statistics.median(samples):.3f} ms, "
+            f"max {1000 * max(samples):.3f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
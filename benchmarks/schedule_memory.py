@@ -0,0 +1,46 @@
+"""Compare the memory used per session by Round/Session objects and by the
+column oriented Schedule.
+
+    python -m benchmarks.schedule_memory --sessions 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import tracemalloc
+from typing import Any, Callable
+
+from focusedme.__main__ import Pomodoro, Round
+
+TIME_ARGS = {"focus_time": 25, "short_break": 5, "long_break": 25}
+
+
+def allocated(build: Callable[[], Any]) -> int:
+    """bytes still allocated by what ``build`` returns"""
+    tracemalloc.start()
+    kept = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    num_rounds = args.sessions // len(Round.round_template)
+    sessions = num_rounds * len(Round.round_template)
+    pomodoro = Pomodoro(TIME_ARGS, num_rounds)
+
+    for label, build in (
+        ("Round/Session objects", pomodoro.create_rounds),
+        ("Schedule columns", pomodoro.create_schedule),
+    ):
+        size = allocated(build)
+        print(f"{label:>22}: {size / sessions:7.1f} bytes/session")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Cold start regression check: import the command line module under
+``python -X importtime`` and fail if it takes longer than a budget or pulls
+in modules that should only load when first used.
+
+    python -m benchmarks.startup --budget-ms 100
+"""
+
+from __future__ import annotations
+
+import argparse
+import subprocess
+import sys
+
+MODULE = "focusedme.__main__"
+# only imported by the features that need them
+DEFERRED = (
+    "asyncio",
+    "configparser",
+    "importlib.metadata",
+    "pkg_resources",
+    "simpleaudio",
+    "sqlite3",
+    "subprocess",
+    "focusedme.daemon",
+    "focusedme.events",
+    "focusedme.history",
+    "focusedme.journal",
+    "focusedme.profiling",
+    "focusedme.schedule",
+    "focusedme.segment",
+)
+PROBE = (
+    f"import sys, {MODULE}; "
+    f"print(','.join(m for m in {DEFERRED!r} if m in sys.modules))"
+)
+
+
+def import_time() -> tuple[int, list[str]]:
+    """cumulative microseconds spent importing MODULE, and the deferred
+    modules it imported anyway
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    # lines read "import time: self [us] | cumulative | module"
+    for line in result.stderr.splitlines():
+        parts = line.split("|")
+        if len(parts) == 3 and parts[2].strip() == MODULE:
+            cumulative = parts[1].strip()
+            loaded = [m for m in result.stdout.strip().split(",") if m]
+            return int(cumulative), loaded
+    raise RuntimeError("no import time reported for " + MODULE)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=100.0)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    # the first run also compiles and warms the file cache
+    runs = [import_time() for _ in range(args.repeat + 1)][1:]
+    best = min(micros for micros, _ in runs) / 1000
+    loaded = runs[-1][1]
+
+    print(f"import {MODULE}: {best:.1f} ms (budget {args.budget_ms:.0f} ms)")
+    if loaded:
+        print("imported at startup: " + ", ".join(loaded))
+    if best > args.budget_ms or loaded:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Read the status file in a loop while another process keeps publishing to
+it, and report the reads per second and how often the seqlock made a reader
+start over.
+
+    python -m benchmarks.status_segment --seconds 3 --updates 0
+
+--updates is the number of updates per second of the writer, 0 for as many
+as it can. A tracker publishes once per transition, a few times an hour,
+so the writer here is many orders of magnitude busier than a real one.
+"""
+
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+import os
+import tempfile
+import time
+
+from focusedme.segment import (
+    HEADER,
+    PAYLOAD,
+    RUNNING,
+    SIZE,
+    StatusReader,
+    StatusSegment,
+)
+
+
+def write(path: str, updates: float, stop: float) -> None:
+    """publish payloads with equal fields until ``stop``"""
+    segment = StatusSegment(path)
+    interval = 1 / updates if updates else 0.0
+    i = 0
+    while time.time() < stop:
+        i += 1
+        segment.publish(RUNNING, i, i, "focus_time", i, i, i)
+        if interval:
+            time.sleep(interval)
+    segment.close()
+
+
+def unguarded_torn(path: str, seconds: float) -> tuple[int, int]:
+    """copy the payload without the seqlock; return (reads, torn reads)"""
+    import mmap
+
+    with open(path, "rb") as f:
+        view = mmap.mmap(f.fileno(), SIZE, access=mmap.ACCESS_READ)
+    reads = torn = 0
+    stop = time.perf_counter() + seconds
+    while time.perf_counter() < stop:
+        _, r, s, n, _, _, deadline, remaining, _ = PAYLOAD.unpack_from(
+            view, HEADER.size
+        )
+        reads += 1
+        torn += not r == s == n == deadline == remaining
+    view.close()
+    return reads, torn
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--updates", type=float, default=0.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "focusedme.status")
+        idle = StatusSegment(path)
+        idle.publish(RUNNING)
+
+        reader = StatusReader(path)
+        reads = 0
+        stop = time.perf_counter() + args.seconds
+        while time.perf_counter() < stop:
+            reader.read()
+            reads += 1
+        print(f"  idle writer: {reads / args.seconds:,.0f} reads/s")
+        idle.close()
+
+        # the writer gets the time of both measurements below
+        until = time.time() + 2 * args.seconds + 0.5
+        writer = multiprocessing.Process(target=write, args=(path, args.updates, until))
+        writer.start()
+        time.sleep(0.5)
+        reads = 0
+        stop = time.perf_counter() + args.seconds
+        while time.perf_counter() < stop:
+            snapshot = reader.read()
+            reads += 1
+            assert snapshot is not None
+            assert snapshot.round == snapshot.session == snapshot.num_rounds
+        print(
+            f"  busy writer: {reads / args.seconds:,.0f} reads/s,"
+            f" {reader.retries / reads:.2%} started over"
+        )
+        reads, torn = unguarded_torn(path, args.seconds)
+        print(f"without the seqlock: {torn / reads:.2%} of {reads:,} copies torn")
+        writer.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""Benchmarks of the timer hot paths, compared with a JSON baseline.
+
+    python -m benchmarks.suite                 # run and compare
+    python -m benchmarks.suite --save          # record a new baseline
+
+Every benchmark reports a rate (operations per second, higher is better).
+The run fails when a rate drops below the baseline by more than the
+tolerance. Timers run against a virtual clock, so a full schedule takes
+only as long as the code that processes it.
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import os
+import sys
+import time
+from typing import Callable
+
+import focusedme.__main__ as focusedme_main
+from focusedme.__main__ import Config, Log, Pomodoro, Round, Tracker, View
+from focusedme.util import VirtualClock
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+TIME_ARGS = {"focus_time": 25, "short_break": 5, "long_break": 25, "num_rounds": 1}
+NO_SOUND = {"sound": "", "path": ""}
+
+
+class NullTTY(io.StringIO):
+    def isatty(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        return len(text)
+
+
+def tracker_ticks() -> int:
+    """one round of countdown with a refresh every second"""
+    rounds = Pomodoro(TIME_ARGS, 1).create_rounds()
+    ticks = 0
+
+    def show_time(remainder: int, num_round: int, num_session: int, t: str) -> None:
+        nonlocal ticks
+        ticks += 1
+
+    clock = VirtualClock()
+    tracker = Tracker(rounds, Log(), clock=clock.monotonic, sleep=clock.sleep)
+    tracker.start(show_time, NO_SOUND)
+    return ticks
+
+
+def show_time_frames() -> int:
+    view = View(NullTTY())
+    for remainder in range(1500, 0, -1):
+        view.show_time(remainder, 1, 1, "focus_time")
+    return 1500
+
+
+def create_rounds_sessions() -> int:
+    rounds = Pomodoro(TIME_ARGS, 10_000).create_rounds()
+    return sum(len(r.sessions) for r in rounds)
+
+
+def plot_results_calls() -> int:
+    """summaries of a finished schedule, which Log.record keeps up to date"""
+    log = Log(Pomodoro(TIME_ARGS, 4).create_rounds())
+    for round_idx, cur_round in enumerate(log.tracked_rounds):
+        for session in cur_round.sessions:
+            log.record(round_idx, session.session_type, "done", 60.0 * session.length)
+    for _ in range(100_000):
+        log.plot_results(lambda summaries, total: None)
+    return 100_000
+
+
+def log_record_sessions() -> int:
+    log = Log()
+    for round_idx in range(10_000):
+        for session_type in Round.round_template:
+            log.record(round_idx, session_type, "done", 300.0)
+    return 10_000 * len(Round.round_template)
+
+
+def load_init_cached() -> int:
+    for _ in range(1000):
+        Config.load_init()
+    return 1000
+
+
+def load_init_cold() -> int:
+    for _ in range(100):
+        focusedme_main._SETTINGS.clear()
+        Config.load_init()
+    return 100
+
+
+BENCHMARKS: dict[str, Callable[[], int]] = {
+    "tracker_ticks_per_s": tracker_ticks,
+    "show_time_frames_per_s": show_time_frames,
+    "create_rounds_sessions_per_s": create_rounds_sessions,
+    "plot_results_calls_per_s": plot_results_calls,
+    "log_record_sessions_per_s": log_record_sessions,
+    "load_init_cached_per_s": load_init_cached,
+    "load_init_cold_per_s": load_init_cold,
+}
+
+
+def measure(bench: Callable[[], int], repeat: int) -> float:
+    """best rate over ``repeat`` runs"""
+    best = 0.0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        count = bench()
+        best = max(best, count / (time.perf_counter() - started))
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--save", action="store_true", help="write a new baseline")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.3,
+        help="allowed slowdown, as a fraction of the baseline rate",
+    )
+    parser.add_argument("-k", dest="only", help="only run benchmarks matching this")
+    args = parser.parse_args()
+
+    results = {
+        name: measure(bench, args.repeat)
+        for name, bench in BENCHMARKS.items()
+        if not args.only or args.only in name
+    }
+
+    baseline: dict[str, float] = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    failed = False
+    for name, rate in results.items():
+        line = f"{name:>30}: {rate:14,.0f}"
+        if name in baseline:
+            change = rate / baseline[name] - 1
+            line += f"  ({change:+.0%} vs baseline)"
+            if change < -args.tolerance:
+                line += "  REGRESSION"
+                failed = True
+        print(line)
+
+    if args.save:
+        with open(args.baseline, "w") as f:
+            json.dump(dict(baseline, **results), f, indent=2, sort_keys=True)
+            f.write("\n")
+    elif failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""Load test of the team server: many simulated users, each with a named
+timer, sending commands over a local socket. Reports the latency of the
+requests as seen by the clients.
+
+    python -m benchmarks.team_load --users 50000 --connections 200
+
+The server runs in its own process, as 'focusedme team' would, with the
+journals in a temporary directory unless --no-journals is given.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+from focusedme.profiling import Histogram
+
+# status requests dominate, as with status bars polling their timer
+MIX = ("status",) * 7 + ("pause", "resume", "skip")
+
+
+class User:
+    """a connection shared by some of the simulated users, sending one
+    request at a time
+    """
+
+    def __init__(self, names: list[str], seed: int) -> None:
+        self.names = names
+        self.rng = random.Random(seed)
+
+    async def connect(self, path: str) -> None:
+        self.reader, self.writer = await asyncio.open_unix_connection(path)
+
+    async def send(self, line: str, histogram: Histogram) -> None:
+        started = time.perf_counter()
+        self.writer.write(line.encode() + b"\n")
+        answer = await self.reader.readline()
+        histogram.record(time.perf_counter() - started)
+        if answer.startswith(b"error"):
+            raise RuntimeError(f"{line!r}: {answer.decode().strip()}")
+
+    async def start(self, histogram: Histogram) -> None:
+        for name in self.names:
+            await self.send("start " + name, histogram)
+
+    async def command(self, histogram: Histogram, commands: int) -> None:
+        for _ in range(commands):
+            for name in self.names:
+                await self.send(f"{self.rng.choice(MIX)} {name}", histogram)
+
+
+async def load(args: argparse.Namespace, path: str) -> None:
+    names = [f"user{i}" for i in range(args.users)]
+    users = [User(names[i :: args.connections], i) for i in range(args.connections)]
+    await asyncio.gather(*(user.connect(path) for user in users))
+
+    starts = Histogram("start")
+    started = time.perf_counter()
+    await asyncio.gather(*(user.start(starts) for user in users))
+    report(starts, time.perf_counter() - started)
+
+    commands = Histogram("commands")
+    started = time.perf_counter()
+    await asyncio.gather(*(user.command(commands, args.commands) for user in users))
+    report(commands, time.perf_counter() - started)
+
+    for user in users:
+        user.writer.close()
+
+
+def report(histogram: Histogram, elapsed: float) -> None:
+    print(
+        f"{histogram.name:>10}: {histogram.count} requests in {elapsed:.1f} s,"
+        f" {histogram.count / elapsed:,.0f}/s,"
+        f" p50 {histogram.percentile(50) / 1e3:.2f} ms,"
+        f" p99 {histogram.percentile(99) / 1e3:.2f} ms,"
+        f" max {histogram.max / 1e3:.2f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=50_000)
+    parser.add_argument("--connections", type=int, default=200)
+    parser.add_argument(
+        "--commands", type=int, default=4, help="commands sent by each user"
+    )
+    parser.add_argument("--no-journals", action="store_true")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "team.sock")
+        journals = "" if args.no_journals else os.path.join(tmp, "journals")
+        server = subprocess.Popen(
+            [sys.executable, "-m", "focusedme", "--socket", path, "team"]
+            + ["--journals", journals],
+            stdout=subprocess.DEVNULL,
+        )
+        try:
+            for _ in range(500):
+                if os.path.exists(path) or server.poll() is not None:
+                    break
+                time.sleep(0.01)
+            if not os.path.exists(path):
+                sys.exit("the team server did not start")
+            asyncio.run(load(args, path))
+        finally:
+            server.terminate()
+            server.wait(10)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,10 +3,14 @@
 __author__ = """Fabio Scopeta"""
 __email__ = "scopeta@gmail.com"
 
-from importlib.metadata import PackageNotFoundError, version
 
-__version__: str
-try:
-    __version__ = version(__name__)
-except PackageNotFoundError:
-    __version__ = "0.0.0"
+def __getattr__(name: str) -> str:
+    # importlib.metadata is slow to import: look the version up on demand
+    if name == "__version__":
+        from importlib.metadata import PackageNotFoundError, version
+
+        try:
+            return version(__name__)
+        except PackageNotFoundError:
+            return "0.0.0"
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -10,20 +10,49 @@ as well as allow them to control its progress.
 from __future__ import annotations
 
 import argparse
-import subprocess
+import functools
+import itertools
+import math
+import queue
+import re
 import sys
+import threading
 import time
-from configparser import ConfigParser
+from collections import deque
 from dataclasses import dataclass, field
-from timeit import default_timer
-from typing import Callable
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
+    NoReturn,
+    Sequence,
+    TextIO,
+)
+
+from focusedme.util import CLOCK_SLACK, VirtualClock, as_bool, every, in_app_path
+
+if TYPE_CHECKING:  # pragma: no cover
+    import asyncio
+
+    from focusedme.events import Event, EventBus
+    from focusedme.history import History
+    from focusedme.journal import Journal
+    from focusedme.schedule import Schedule, SessionLike, Timeline
+    from focusedme.segment import StatusSegment
+
+# requests answered by the team server on top of those of the daemon
+TEAM_REQUESTS = ("start", "timers")
 
-try:
-    import simpleaudio as sa
-except ImportError:
-    sa = None
+# modules that are slow to import (asyncio, subprocess, configparser, the
+# audio backend, and the modules of the features built on the timer) are
+# imported where they are first needed, so that the command line starts
+# quickly
 
-from focusedme.util import in_app_path  # noqa: E402
+# simpleaudio, imported with the first sound that is loaded
+sa: Any = None
+_sa_imported = False
 
 BANNER = r"""
   __                              _ __  __
@@ -45,11 +74,44 @@ RESULTS = r"""
 
 GOODBYE = "\n\nThanks for using focusedMe. Goodbye!\n\n"
 
+# decoded notification sounds keyed by resolved file path
+_SOUNDS: dict[str, Any] = {}
+_SOUNDS_LOCK = threading.Lock()
+
+
+def _simpleaudio() -> Any:
+    """return the simpleaudio module, or None if it is not installed"""
+    global sa, _sa_imported
+    if not _sa_imported:
+        _sa_imported = True
+        if sa is None:
+            try:
+                import simpleaudio
+
+                sa = simpleaudio
+            except ImportError:
+                pass
+    return sa
+
+
+# colored session labels keyed by session type, built on first use
+_LABELS: dict[str, str] = {}
+_ANSI_CODE = re.compile(r"\033\[[0-9;]*m")
+
 
 @dataclass
 class View:
     """class responsible for user interaction through terminal."""
 
+    # defaults to sys.stdout, looked up when the first frame is written
+    out: TextIO | None = None
+
+    # non init attributes: the frame currently on screen
+    _tty: bool | None = field(default=None, repr=False)
+    _head: str = field(default="", repr=False)
+    _head_width: int = field(default=0, repr=False)
+    _tail: str = field(default="", repr=False)
+
     @classmethod
     def get_color(cls, color: str) -> str:
         """Print fore ground colors in terminal
@@ -87,19 +149,60 @@ class View:
 
         return "{:00}min {:00}s remaining   ".format(minutes, seconds)
 
+    @classmethod
+    def load_sound(cls, PATH: str) -> Any:
+        """Return the notification sound ready to be played, decoding it
+        only the first time a given file is requested.
+        On macOS this is the 'afplay' command line, with the file read once
+        so that it is already in the OS page cache.
+        """
+        audio_path = in_app_path(PATH)
+        with _SOUNDS_LOCK:
+            if audio_path not in _SOUNDS:
+                if sys.platform == "darwin":
+                    import shutil
+
+                    with open(audio_path, "rb") as wav:
+                        wav.read()
+                    afplay = shutil.which("afplay") or "afplay"
+                    _SOUNDS[audio_path] = [afplay, audio_path]
+                else:
+                    wave = _simpleaudio().WaveObject
+                    _SOUNDS[audio_path] = wave.from_wave_file(audio_path)
+            return _SOUNDS[audio_path]
+
+    @classmethod
+    def preload_sounds(cls, paths: Iterable[str]) -> threading.Thread:
+        """decode the given sounds in a background thread so that the
+        first bell does not wait on the disk
+        """
+
+        def load_all() -> None:
+            for PATH in paths:
+                try:
+                    cls.load_sound(PATH)
+                except Exception:
+                    # ring_bell will retry and ignore the error
+                    pass
+
+        thread = threading.Thread(target=load_all, name="preload-sounds", daemon=True)
+        thread.start()
+        return thread
+
     @classmethod
     def ring_bell(cls, PATH: str) -> None:
         """
         Play a notification sound: use 'afplay' on macOS to avoid simpleaudio issues,
         otherwise use simpleaudio.
         """
-        audio_path = in_app_path(PATH)
         try:
+            sound = cls.load_sound(PATH)
             if sys.platform == "darwin":
-                subprocess.run(["afplay", audio_path], check=True)
+                import subprocess
+
+                subprocess.run(sound, check=True)
             else:
-                wave_obj = sa.WaveObject.from_wave_file(audio_path)
-                wave_obj.play()
+                sound.play()
         except Exception:
             # ignore any playback errors
             pass
@@ -117,38 +220,76 @@ class View:
             colored_type = self.get_color("lightblue") + stype + self.get_color("reset")
         return colored_type
 
+    def __label(self, type_session: str) -> str:
+        """return the colored label of a session type"""
+        label = _LABELS.get(type_session)
+        if label is None:
+            label = self.__get_colore_type(type_session.replace("_", " ").upper())
+            _LABELS[type_session] = label
+        return label
+
+    def __diff(self, tail: str) -> str:
+        """return the escape sequence that turns the text after the
+        session label into ``tail``, rewriting only the cells that changed
+        """
+        old = self._tail.ljust(len(tail))
+        new = tail.ljust(len(self._tail))
+        changed = [i for i, (a, b) in enumerate(zip(old, new)) if a != b]
+        if not changed:
+            return ""
+        first, last = changed[0], changed[-1]
+        column = self._head_width + first
+        return "\r\033[{}C{}\r".format(column, new[first : last + 1])
+
+    def reset_screen(self) -> None:
+        """forget the frame on screen so that the next one is drawn in full,
+        e.g. after other text has been printed
+        """
+        self._head = self._tail = ""
+
     def show_time(
         self, remainder: int, num_round: int, num_session: int, type_session: str
     ) -> None:
         """Show timer countdown in terminal.
 
+        Only the cells that changed since the previous frame are written,
+        in a single write. When the output is not a terminal a plain line
+        is written each time the session or the minute changes.
+
         Args:
             remainder: Remaining time in seconds
             num_round: Current round number
             num_session: Current session number
             type_session: Type of session (FOCUS TIME, SHORT BREAK, LONG BREAK)
         """
+        out = self.out or sys.stdout
+        if self._tty is None:
+            self._tty = out.isatty()
 
-        colored_type = self.__get_colore_type(
-            type_session.replace("_", " ").upper()
-        )  # noqa E501
-
-        print(
-            "Round",
-            num_round,
-            "/",
-            "Session",
-            num_session,
-            "-",
-            colored_type,
-            ": ",
-            self.__format_time(remainder),
-            end="",
-            flush=True,
+        head = "Round {} / Session {} - {} :  ".format(
+            num_round, num_session, self.__label(type_session)
         )
-        print("\r", end="", flush=True)
-
-    def plot(self, logged_data: list[str], time_args: dict[str, int]) -> None:
+        tail = self.__format_time(remainder)
+
+        if not self._tty:
+            minute = tail.split("min")[0]
+            if head == self._head and minute == self._tail:
+                return
+            frame = _ANSI_CODE.sub("", head) + tail.rstrip() + "\n"
+            self._head, self._tail = head, minute
+        elif head != self._head:
+            frame = "\r" + head + tail + "\033[K\r"
+            self._head, self._tail = head, tail
+            self._head_width = len(_ANSI_CODE.sub("", head))
+        else:
+            frame = self.__diff(tail)
+            self._tail = tail
+
+        if frame:
+            out.write(frame)
+            out.flush()
+
+    def plot(self, summaries: list[Summary], total: Summary) -> None:
         """create text from logged data and return it to be plotted to user
         in the terminal"""
 
@@ -156,48 +297,174 @@ class View:
         print(RESULTS)
         print(self.get_color("reset"))
 
-        for dt in logged_data:
-            if "Round" in dt:
-                print(dt)
-            else:
-                print(
-                    "".join(map(str, dt)),
-                    "-",
-                    dt.count("X") * time_args["focus_time"],
-                    "minutes",
-                )
-                print()
+        # minutes actually focused, skipped sessions count for what was done
+        for i, summary in enumerate(summaries):
+            print("Round #" + str(i + 1) + ": ")
+            print(
+                summary.marks.decode(),
+                "-",
+                round(summary.focus_seconds / 60),
+                "minutes",
+            )
+            print()
+        print(
+            "Total:",
+            total.focus_done,
+            "completed,",
+            total.focus_skipped,
+            "skipped -",
+            round(total.focus_seconds / 60),
+            "minutes focused,",
+            round(total.break_seconds / 60),
+            "minutes of breaks",
+        )
+        print()
 
         print("[legend: (X) completed sessions, (O) skipped sessions]")
         print("______________________________________________________\n")
 
-    def run(self, time_args: dict[str, int], sound_args: dict[str, str]) -> None:
+    def run(
+        self,
+        time_args: dict[str, int],
+        sound_args: dict[str, str],
+        journal: Journal | None = None,
+        history: History | None = None,
+        status_file: StatusSegment | None = None,
+    ) -> None:
         """method that orchestrates overal execution"""
 
         # initialize with parameters informed through cli arguments
         pomodoro = Pomodoro(time_args, time_args["num_rounds"])
-        rounds = pomodoro.create_rounds()
         log = Log()
-        tracker = Tracker(rounds, log)
+        tracker = Tracker(
+            [],
+            log,
+            upcoming=pomodoro.iter_rounds(),
+            journal=journal,
+            history=history,
+            num_rounds=time_args["num_rounds"],
+        )
+        tracker.status_file = status_file
+        if sound_args["sound"]:
+            self.preload_sounds([sound_args["path"]])
+        if journal is not None:
+            if journal.restore(tracker, time_args):
+                print("Resuming the last unfinished run..\n")
+            else:
+                journal.begin(time_args)
 
         while True:
             try:
                 tracker.start(self.show_time, sound_args)
             except KeyboardInterrupt:
-                user_cmd = input(
-                    "\n\nWhat would you like to do?"
-                    "\n\n[S]kip current session, [P]lot summary, "
-                    "[ANY] other key to Quit : "
-                ).upper()
-                if user_cmd == "S":
-                    print("\n\nSkipping to next session..\n\n")
-                elif user_cmd == "P":
-                    log.plot_results(self.plot, time_args)
-                    print(GOODBYE)
-                    sys.exit(0)
-                else:
-                    print(GOODBYE)
-                    sys.exit(0)
+                # the session is paused while the menu waits for an answer
+                self.__menu(tracker, journal)
+                continue
+            # every round is completed
+            self.__goodbye(log, journal, plot=True)
+            return
+
+    def __menu(self, tracker: Tracker, journal: Journal | None) -> None:
+        """ask what to do with the interrupted session; exit on quit"""
+        self.reset_screen()
+        user_cmd = input(
+            "\n\nWhat would you like to do?"
+            "\n\n[R]esume, [S]kip current session, [P]lot summary, "
+            "[ANY] other key to Quit : "
+        ).upper()
+        if user_cmd == "R":
+            print("\n\nResuming..\n\n")
+            return
+        tracker.skip()
+        if user_cmd == "S":
+            print("\n\nSkipping to next session..\n\n")
+            return
+        self.__goodbye(tracker.log, journal, plot=user_cmd == "P")
+        sys.exit(0)
+
+    def __goodbye(self, log: Log, journal: Journal | None, plot: bool) -> None:
+        """end the run, showing its summary if ``plot`` is True, and let the
+        last bell finish
+        """
+        if journal is not None:
+            journal.end()
+        if plot:
+            log.plot_results(self.plot)
+        print(GOODBYE)
+        BELL.join(BELL_GRACE)
+
+
+@dataclass
+class BellPlayer:
+    """Plays notification sounds on a background thread so that the timer
+    never waits for a clip to finish. Bells that arrive while the queue is
+    full are dropped: overlapping notifications merge into one.
+    """
+
+    maxsize: int = 1
+
+    # non init attributes
+    dropped: int = 0
+    _queue: queue.Queue[str] | None = field(default=None, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def __worker(self) -> queue.Queue[str]:
+        """return the bell queue, starting the playback thread on first use"""
+        with self._lock:
+            if self._queue is None:
+                self._queue = queue.Queue(self.maxsize)
+                threading.Thread(
+                    target=self.__run, args=(self._queue,), name="bell", daemon=True
+                ).start()
+            return self._queue
+
+    def __run(self, bells: queue.Queue[str]) -> None:
+        from focusedme import profiling
+
+        while True:
+            PATH = bells.get()
+            profiler = profiling.PROFILER
+            started = time.perf_counter()
+            try:
+                View.ring_bell(PATH)
+            finally:
+                bells.task_done()
+                if profiler is not None:
+                    profiler.bell_playback.record(time.perf_counter() - started)
+
+    def play(self, PATH: str) -> bool:
+        """queue a bell without blocking; return False if it was dropped"""
+        from focusedme import profiling
+
+        profiler = profiling.PROFILER
+        started = time.perf_counter()
+        try:
+            self.__worker().put_nowait(PATH)
+        except queue.Full:
+            self.dropped += 1
+            return False
+        finally:
+            if profiler is not None:
+                profiler.bell_dispatch.record(time.perf_counter() - started)
+        return True
+
+    def join(self, timeout: float | None = None) -> bool:
+        """block until every queued bell has been played, or for at most
+        ``timeout`` seconds; return False if one is still playing
+        """
+        bells = self._queue
+        if bells is None:
+            return True
+        with bells.all_tasks_done:
+            return bells.all_tasks_done.wait_for(
+                lambda: not bells.unfinished_tasks, timeout
+            )
+
+
+# shared by every tracker in the process
+BELL = BellPlayer()
+# seconds the last bell may take to play before the process exits
+BELL_GRACE = 5.0
 
 
 @dataclass
@@ -207,7 +474,7 @@ class Round:
     len_args: dict[str, int] = field(default_factory=dict)
 
     # non init attributes
-    sessions: list[Session] = field(default_factory=list)
+    sessions: Sequence[SessionLike] = field(default_factory=list)
     current_session_idx: int = 0
     completed: bool = False
 
@@ -223,7 +490,9 @@ class Round:
     )
 
     def __post_init__(self) -> None:
-        self.sessions = self.__build_new_round(self.len_args)
+        # sessions may be given, e.g. as views over a compact Schedule
+        if not self.sessions:
+            self.sessions = self.__build_new_round(self.len_args)
 
     def __build_new_round(self, len_args: dict[str, int]) -> list[Session]:
         """build a list of sessions that will define this round
@@ -250,7 +519,7 @@ class Round:
         ):  # done and not the last one
             self.current_session_idx += 1
 
-    def get_current_session(self) -> "Session":
+    def get_current_session(self) -> SessionLike:
         """return the instance of the current session."""
 
         # if the session has already been skipped, go to next session
@@ -270,6 +539,35 @@ class Session:
     session_type: str = ""
     length: int = 0
     status: str = "not started"  # other possible value: skipped, done
+    # wall clock times, in seconds since the epoch, once the session has run
+    started_at: float = 0.0
+    ended_at: float = 0.0
+
+
+@dataclass
+class Summary:
+    """counters of the finished sessions of a round, or of a whole run"""
+
+    focus_done: int = 0
+    focus_skipped: int = 0
+    # seconds actually spent in the sessions, pauses excluded
+    focus_seconds: float = 0.0
+    break_seconds: float = 0.0
+    # "X" for every completed focus session and "O" for every skipped one,
+    # appended in place however long the run
+    marks: bytearray = field(default_factory=bytearray)
+
+    def add(self, session_type: str, status: str, seconds: float) -> None:
+        if session_type != "focus_time":
+            self.break_seconds += seconds
+            return
+        self.focus_seconds += seconds
+        if status == "done":
+            self.focus_done += 1
+            self.marks.append(ord("X"))
+        else:
+            self.focus_skipped += 1
+            self.marks.append(ord("O"))
 
 
 @dataclass
@@ -280,35 +578,83 @@ class Log:
     """
 
     tracked_rounds: list[Round] = field(default_factory=list)
+    # one summary per round reached, updated as each session ends
+    summaries: list[Summary] = field(default_factory=list)
+    total: Summary = field(default_factory=Summary)
 
     def save_rounds(self, tracked_rounds: list[Round]) -> None:
         """save all tracked rounds"""
         self.tracked_rounds = tracked_rounds
 
-    def plot_results(
-        self,
-        plot: Callable[[list[str], dict[str, int]], None],
-        time_args: dict[str, int],
+    def record(
+        self, round_idx: int, session_type: str, status: str, seconds: float
     ) -> None:
-        """return user friendly text with completion information
-        about user's focus sessions
+        """count a finished session of round ``round_idx``, in which
+        ``seconds`` were spent
         """
+        summaries = self.summaries
+        while len(summaries) <= round_idx:
+            summaries.append(Summary())
+        summaries[round_idx].add(session_type, status, seconds)
+        self.total.add(session_type, status, seconds)
+
+    def plot_results(self, plot: Callable[[list[Summary], Summary], None]) -> None:
+        """hand the summaries of the rounds and of the run to ``plot``;
+        the counters are kept up to date, so nothing is scanned here
+        """
+        plot(self.summaries, self.total)
 
-        # iterate in tracked_rounds and test for completion
-        # format string showing completed and skipped rounds
-        # add total focused minutes
 
-        graphic = []
-        for i in range(len(self.tracked_rounds)):
-            graphic.append("Round #" + str(i + 1) + ": ")
-            session_status = "".join(
-                "X" if s.status == "done" else "O"
-                for s in self.tracked_rounds[i].sessions
-                if s.session_type == "focus_time"
-            )
-            graphic.append(session_status)
+class ConfigError(ValueError):
+    """raised when fm.init holds a value that cannot be used"""
+
 
-        plot(graphic, time_args)
+@dataclass(frozen=True)
+class Settings:
+    """validated content of fm.init"""
+
+    focus_time: int = 25
+    short_break: int = 5
+    long_break: int = 25
+    num_rounds: int = 3
+    sound: bool = True
+    path: str = "Ring01.wav"
+
+    def __post_init__(self) -> None:
+        for name in ("focus_time", "short_break", "long_break"):
+            if getattr(self, name) <= 0:
+                raise ConfigError(name + " must be a positive number of minutes")
+        if self.num_rounds < 0:
+            raise ConfigError("num_rounds must be 0 (no limit) or more")
+
+    @classmethod
+    def from_args(
+        cls, time_args: dict[str, int], sound_args: dict[str, str]
+    ) -> Settings:
+        return cls(
+            focus_time=int(time_args["focus_time"]),
+            short_break=int(time_args["short_break"]),
+            long_break=int(time_args["long_break"]),
+            num_rounds=int(time_args["num_rounds"]),
+            sound=as_bool(sound_args["sound"]),
+            path=str(sound_args["path"]),
+        )
+
+    def time_args(self) -> dict[str, int]:
+        return {
+            "focus_time": self.focus_time,
+            "short_break": self.short_break,
+            "long_break": self.long_break,
+            "num_rounds": self.num_rounds,
+        }
+
+    def sound_args(self) -> dict[str, str]:
+        # an empty string disables the bell, as any string is truthy
+        return {"sound": "True" if self.sound else "", "path": self.path}
+
+
+# parsed fm.init files keyed by path: (modification time, settings)
+_SETTINGS: dict[str, tuple[int, Settings]] = {}
 
 
 @dataclass
@@ -318,65 +664,108 @@ class Config:
     """
 
     @staticmethod
-    def load_init() -> tuple[dict[str, int], dict[str, str]]:
-        """return the a object array with the lenght os the default values"""
+    @functools.lru_cache(maxsize=None)
+    def file() -> str:
+        """return the path of fm.init: next to the package when installed,
+        or in the project (or current) directory when running from source.
+        The same file is used for loading and saving.
+        """
         import os
 
-        # locate fm.init in package data
-        file = in_app_path("config/fm.init")
-        # fallback to project root config directory
-        if not os.path.exists(file):
-            cwd_cfg = os.path.join(os.getcwd(), "config", "fm.init")
-            if os.path.exists(cwd_cfg):
-                file = cwd_cfg
+        candidates = [
+            in_app_path("config/fm.init"),
+            in_app_path("../config/fm.init"),
+            os.path.join(os.getcwd(), "config", "fm.init"),
+        ]
+        existing = [f for f in candidates if os.path.exists(f)]
+        return (existing or candidates[1:])[0]
+
+    @staticmethod
+    def load(file: str | None = None) -> Settings:
+        """return the settings in ``file`` (fm.init by default). The file is
+        only parsed again when its modification time changes, so this is
+        cheap enough to call whenever the settings are needed.
+        """
+        import os
+
+        file = file or Config.file()
+        try:
+            mtime = os.stat(file).st_mtime_ns
+        except OSError:
+            return Settings()
+        cached = _SETTINGS.get(file)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        from configparser import ConfigParser
+
         config = ConfigParser()
         config.read(file)
-
         # populate defaults if sections missing
         if "time" not in config or "sound" not in config:
-            return {
-                "focus_time": 25,
-                "short_break": 5,
-                "long_break": 25,
-                "num_rounds": 3,
-            }, {"sound": "True", "path": "Ring01.wav"}
-        time_args = {}
-        sound_args = {}
+            settings = Settings()
+        else:
+            try:
+                settings = Settings(
+                    **{k: int(v) for k, v in config["time"].items()},
+                    sound=config["sound"].getboolean("sound", True),
+                    path=config["sound"].get("path", Settings.path),
+                )
+            except (TypeError, ValueError) as exc:
+                raise ConfigError("{}: {}".format(file, exc)) from exc
+        _SETTINGS[file] = (mtime, settings)
+        return settings
 
-        for section in list(config["time"]):
-            time_args[section] = int(config["time"][section])
+    @staticmethod
+    def load_init() -> tuple[dict[str, int], dict[str, str]]:
+        """return the a object array with the lenght os the default values"""
+        settings = Config.load()
+        return settings.time_args(), settings.sound_args()
 
-        for section in list(config["sound"]):
-            sound_args[section] = str(config["sound"][section])
+    @staticmethod
+    def save(settings: Settings, file: str | None = None) -> None:
+        """write ``settings`` to ``file`` (fm.init by default). The new file
+        replaces the old one in a single rename, so a reader never sees it
+        half written.
+        """
+        import os
+        import tempfile
+        from configparser import ConfigParser
 
-        if sound_args["sound"]:
-            bool(sound_args["sound"])
+        file = file or Config.file()
+        config = ConfigParser()
+        config["time"] = {k: str(v) for k, v in settings.time_args().items()}
+        config["sound"] = {"sound": str(settings.sound), "path": settings.path}
 
-        return time_args, sound_args
+        directory = os.path.dirname(os.path.abspath(file))
+        os.makedirs(directory, exist_ok=True)
+        try:
+            mode = os.stat(file).st_mode & 0o7777
+        except FileNotFoundError:
+            # the mode open() would have created it with
+            umask = os.umask(0)
+            os.umask(umask)
+            mode = 0o666 & ~umask
+        fd, tmp = tempfile.mkstemp(prefix=".fm.init.", dir=directory)
+        try:
+            # mkstemp makes the file readable by its owner only
+            os.fchmod(fd, mode)
+            with os.fdopen(fd, "w") as configfile:
+                config.write(configfile)
+            os.replace(tmp, file)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        _SETTINGS[file] = (os.stat(file).st_mtime_ns, settings)
 
     @staticmethod
     def save_init(time_args: dict[str, int], sound_args: dict[str, str]) -> None:
         """save the new values as the default values"""
-        file = in_app_path("../config/fm.init")
-        config = ConfigParser()
-        config.read(file)
-
-        for section in list(config["time"]):
-            config.set("time", section, str(time_args[section]))
-
-        for section in list(config["sound"]):
-            config.set("sound", section, str(sound_args[section]))
-
-        with open(file, "w") as configfile:
-            config.write(configfile)
+        Config.save(Settings.from_args(time_args, sound_args))
 
     @staticmethod
     def show_init(time_args: dict[str, int], sound_args: dict[str, str]) -> None:
         """prints the 'time' values that are saved in the init files."""
-        file = in_app_path("../config/fm.init")
-        config = ConfigParser()
-        config.read(file)
-
         print("Default Values:")
         print(
             View.get_color("green") + "   Focus Time: " + str(time_args["focus_time"])
@@ -388,7 +777,9 @@ class Config:
         )
         print(View.get_color("red") + "   Long Break: " + str(time_args["long_break"]))
         print(View.get_color("blue") + "   Rounds: " + str(time_args["num_rounds"]))
-        print(View.get_color("purple") + "   Sound: " + str(sound_args["sound"]))
+        print(
+            View.get_color("purple") + "   Sound: " + str(as_bool(sound_args["sound"]))
+        )
         print(View.get_color("pink") + "   Sound File: " + str(sound_args["path"]))
         print(View.get_color("reset"))
 
@@ -411,91 +802,636 @@ class Pomodoro:
 
         return rounds
 
+    def __round_numbers(self) -> Iterable[int]:
+        # a schedule without a number of rounds runs until it is stopped
+        if self.num_rounds <= 0:
+            return itertools.count()
+        return range(self.num_rounds)
+
+    def iter_rounds(self) -> Iterator[Round]:
+        """yield the rounds one at a time, building each only when it is
+        requested; never ends if num_rounds is 0
+        """
+        for _ in self.__round_numbers():
+            yield Round(self.len_args)
+
+    def iter_sessions(self) -> Iterator[tuple[int, int, Session]]:
+        """yield (round index, session index, session) for every session
+        of the schedule, following Round.round_template
+        """
+        for round_idx in self.__round_numbers():
+            for session_idx, session_type in enumerate(Round.round_template):
+                session = Session(session_type, self.len_args[session_type])
+                yield round_idx, session_idx, session
+
+    def create_schedule(self) -> Schedule:
+        """create the sessions of every round as a compact Schedule"""
+        from focusedme.schedule import Schedule
+
+        return Schedule.from_template(
+            self.len_args, self.num_rounds, Round.round_template
+        )
+
+    def create_compact_rounds(self) -> list[Round]:
+        """same as create_rounds, with the sessions stored in a Schedule"""
+        schedule = self.create_schedule()
+        return [Round(self.len_args, schedule.views(i)) for i in range(self.num_rounds)]
+
 
 @dataclass
-class Tracker:
-    """Control timer according to session durations
-    and trigger log saving and user interface updates
-    """
+class _TrackerBase:
+    """rounds, log and bookkeeping shared by Tracker and AsyncTracker"""
 
     rounds: list[Round] = field(default_factory=list)
     log: Log = field(default_factory=Log)
     current_round_idx: int = 0
+    # seconds between screen refreshes; the countdown only changes once a second
+    tick: float = 1.0
+    # rounds not reached yet; appended to ``rounds`` once they start
+    upcoming: Iterator[Round] | None = None
+    # receives a Tick every second and an event for every transition
+    events: EventBus | None = None
+    history: History | None = None
+    # rounds in the whole schedule, 0 if it never ends; counted from
+    # ``rounds`` when there are no upcoming rounds
+    num_rounds: int | None = None
 
-    def __cur_time(self) -> int:
-        return int(default_timer())
+    # non init attributes
+    # deadlines of the schedule, set by start()
+    timeline: Timeline | None = field(default=None, init=False, repr=False)
+    # difference between the wall clock and the clock of the timeline
+    _wall_offset: float = field(default=0.0, init=False, repr=False)
+
+    def round_at(self, round_idx: int) -> Round | None:
+        """return round ``round_idx``, pulling it from the upcoming rounds
+        if it has not been reached yet; None past the end of the schedule
+        """
+        rounds, upcoming = self.rounds, self.upcoming
+        while len(rounds) <= round_idx:
+            new_round = next(upcoming, None) if upcoming is not None else None
+            if new_round is None:
+                return None
+            rounds.append(new_round)
+        return rounds[round_idx]
+
+    def _new_timeline(self) -> Timeline:
+        """a timeline of the rounds, with the lengths of the first one"""
+        from focusedme.schedule import Timeline
+
+        num_rounds = self.num_rounds
+        if num_rounds is None:
+            num_rounds = len(self.rounds) if self.upcoming is None else 0
+        return Timeline.from_lengths(
+            [s.length * SECONDS_PER_MIN for s in self.rounds[0].sessions],
+            num_rounds=num_rounds,
+        )
+
+    def _publish(self, kind: type[Event], cur_round: Round, *args: Any) -> None:
+        """publish a transition of the current session of ``cur_round``"""
+        if self.events is not None:
+            num_session = cur_round.current_session_idx + 1
+            self.events.publish(kind(self.current_round_idx + 1, num_session, *args))
+
+    def _finish(
+        self,
+        session_idx: int,
+        session: SessionLike,
+        seconds: float,
+        now: float,
+    ) -> None:
+        """stamp the end of session ``session_idx`` of the current round at
+        clock time ``now``, in which ``seconds`` were spent, and keep it in
+        the log and history
+        """
+        session.ended_at = now + self._wall_offset
+        self.log.record(
+            self.current_round_idx, session.session_type, session.status, seconds
+        )
+        if self.history is not None:
+            self.history.record(
+                session.session_type,
+                session.started_at,
+                session.ended_at,
+                session.length,
+                session.status,
+                self.current_round_idx + 1,
+                session_idx + 1,
+                seconds,
+            )
+
+
+@dataclass
+class Tracker(_TrackerBase):
+    """Control timer according to session durations
+    and trigger log saving and user interface updates
+    """
+
+    journal: Journal | None = None
+    # seconds already spent in the current session when start() is called
+    elapsed: float = 0.0
+    # time source and sleeper, time.monotonic and time.sleep when not given
+    clock: Callable[[], float] | None = None
+    sleep: Callable[[float], None] | None = None
+    # shared memory file the position is published to on every transition
+    status_file: StatusSegment | None = None
+
+    def __cur_time(self) -> float:
+        return (self.clock or time.monotonic)()
+
+    def __publish_status(self, done: bool = False) -> None:
+        """write the current position on the timeline to the status file,
+        or that the schedule is ``done``
+        """
+        status_file, timeline = self.status_file, self.timeline
+        if status_file is None or timeline is None:
+            return
+        from focusedme import segment
+
+        now = self.__cur_time()
+        position = None if done else timeline.position(now)
+        if position is None:
+            status_file.publish(segment.DONE, num_rounds=timeline.num_rounds)
+            return
+        round_idx, session_idx, remaining = position
+        status_file.publish(
+            segment.RUNNING if timeline.paused_at is None else segment.PAUSED,
+            round_idx,
+            session_idx,
+            self.rounds[0].sessions[session_idx].session_type,
+            now + remaining + self._wall_offset,
+            remaining,
+            timeline.num_rounds,
+        )
+
+    def __countdown(
+        self,
+        deadline: float,
+        cur_round: Round,
+        cur_session: SessionLike,
+        show_time: Callable[[int, int, int, str], None] | None,
+    ) -> None:
+        """sleep until ``deadline``, waking up only when the displayed
+        remainder changes (or once at the deadline if nothing is shown)
+        """
+        from focusedme import profiling
+        from focusedme.events import Tick
+
+        events = self.events
+        num_round = self.current_round_idx + 1
+        num_session = cur_round.current_session_idx + 1
+
+        def refresh(now: float) -> bool:
+            # waking up a hair early must not repeat the previous second
+            remainder = deadline - now - CLOCK_SLACK
+            if remainder > 0:
+                seconds = math.ceil(remainder)
+                if show_time is not None:
+                    show_time(seconds, num_round, num_session, cur_session.session_type)
+                if events is not None:
+                    events.publish(
+                        Tick(num_round, num_session, seconds, cur_session.session_type)
+                    )
+            return remainder > 0
+
+        sleep = self.sleep
+        profiler = profiling.PROFILER
+        if profiler is not None:
+            sleep = profiler.sleeper(self.clock or time.monotonic, sleep or time.sleep)
+
+        ticking = show_time is not None or events is not None
+        every(
+            self.tick if ticking else math.inf,
+            refresh,
+            until=deadline,
+            clock=self.clock,
+            sleep=sleep,
+        )
 
     def start(
         self,
-        show_time: Callable[[int, int, int, str], None],
+        show_time: Callable[[int, int, int, str], None] | None,
         sound_args: dict[str, str],
     ) -> None:
         """method to process the list of rounds.
         It tracks and saves progress while sending visual information
          for the UI function received as a parameter
         """
+        from focusedme import profiling
+        from focusedme.events import RoundCompleted, SessionDone
 
         SOUND = sound_args["sound"]
         PATH = sound_args["path"]
+        profiler = profiling.PROFILER
+        if profiler is not None and show_time is not None:
+            show_time = profiler.timed(profiler.render, show_time)
+
+        now = self.__cur_time()
+        self._wall_offset = time.time() - now
+        resumed = self.timeline is not None and self.timeline.paused_at is not None
+        found = self.__resume_position(resumed)
+        if found is None:
+            return
+        round_idx, session_idx = found
+        timeline = self.__timeline(round_idx, session_idx, now)
 
-        # outter loop - runs until end of rounds
         while True:
-
-            # return the valid round, either a new one if completed
-            # or the next one available
-            self.current_round_idx = self.__get_round()
-            # if the current round is already completed, there is
-            # no round left and the loop should be broken
-            if self.rounds[self.current_round_idx].completed:
+            cur_round = self.round_at(round_idx)
+            if cur_round is None:
                 break
+            self.current_round_idx = round_idx
+            cur_round.current_session_idx = session_idx
+            cur_session = cur_round.sessions[session_idx]
 
-            # iterate over all session in a round()
-            cur_round = self.rounds[self.current_round_idx]
-            for _ in range(len(cur_round.sessions)):
-                cur_session = cur_round.get_current_session()
-                # set intermmediary value of "skipped"; once the time is up
-                # update session to "done"
-                cur_round.update_session("skipped")
-                self.log.save_rounds(self.rounds)
+            if not resumed:
+                self.__begin(cur_round, round_idx, session_idx, timeline)
+            resumed = False
+            self.__publish_status()
 
-                remainder = cur_session.length * SECONDS_PER_MIN
+            try:
+                self.__countdown(
+                    timeline.deadline(round_idx, session_idx),
+                    cur_round,
+                    cur_session,
+                    show_time,
+                )
+            except KeyboardInterrupt:
+                # stop the clock until start() resumes or skip() is called
+                self.pause()
+                raise
+
+            if self.journal is not None:
+                self.journal.done(round_idx, session_idx)
+            self._publish(SessionDone, cur_round, cur_session.session_type)
+            cur_round.update_session("done")
+            self.log.save_rounds(self.rounds)
+            self._finish(
+                session_idx,
+                cur_session,
+                timeline.length(session_idx),
+                self.__cur_time(),
+            )
+            if SOUND:
+                BELL.play(PATH)
+
+            session_idx += 1
+            if session_idx == len(cur_round.sessions):
+                self._publish(RoundCompleted, cur_round)
+                round_idx, session_idx = round_idx + 1, 0
+        # the last countdown may return a hair before its deadline
+        self.__publish_status(done=True)
+
+    def __begin(
+        self, cur_round: Round, round_idx: int, session_idx: int, timeline: Timeline
+    ) -> None:
+        """record the start of a session"""
+        from focusedme.events import SessionStarted
+
+        cur_session = cur_round.sessions[session_idx]
+        # set intermmediary value of "skipped"; once the time is up
+        # update session to "done"
+        cur_round.update_session("skipped")
+        self.log.save_rounds(self.rounds)
+        if self.journal is not None:
+            self.journal.started(round_idx, session_idx)
+        self._publish(
+            SessionStarted,
+            cur_round,
+            cur_session.session_type,
+            cur_session.length,
+        )
+        started_at = timeline.deadline(round_idx, session_idx)
+        started_at -= timeline.length(session_idx)
+        cur_session.started_at = started_at + self._wall_offset
 
-                started_at = self.__cur_time()
+    def __resume_position(self, paused: bool) -> tuple[int, int] | None:
+        """round and session to start from: the current session, or the
+        next one if it already ran (it was skipped, or restored as done)
+        """
+        from focusedme.events import RoundCompleted
+
+        cur_round = self.round_at(self.current_round_idx)
+        if cur_round is None:
+            return None
+        if paused:
+            # pick up the interrupted session with the time it had left
+            self.resume()
+            return self.current_round_idx, cur_round.current_session_idx
+        session_idx = cur_round.current_session_idx
+        if cur_round.sessions[session_idx].status != "not started":
+            session_idx += 1
+        if session_idx < len(cur_round.sessions):
+            return self.current_round_idx, session_idx
+        self._publish(RoundCompleted, cur_round)
+        return self.current_round_idx + 1, 0
+
+    def __timeline(self, round_idx: int, session_idx: int, now: float) -> Timeline:
+        """the timeline of the schedule, created on the first start"""
+        if self.timeline is not None:
+            return self.timeline
+        # sessions end on deadlines precomputed from the start of the
+        # schedule, so that time spent rendering or ringing the bell
+        # never pushes it back
+        timeline = self.timeline = self._new_timeline()
+        # a session recovered from the journal may already be over
+        into = min(self.elapsed, timeline.length(session_idx))
+        timeline.seek(round_idx, session_idx, now, into)
+        self.elapsed = 0.0
+        return timeline
+
+    def pause(self) -> None:
+        """freeze the remaining time of the current session; nothing wakes
+        up until start() is called again
+        """
+        timeline = self.timeline
+        if timeline is None or timeline.paused_at is not None:
+            return
+        now = self.__cur_time()
+        position = timeline.position(now)
+        timeline.pause(now)
+        if self.journal is not None and position is not None:
+            self.journal.paused(*position[:2])
+        self.__publish_status()
+
+    def resume(self) -> None:
+        """shift the remaining deadlines by the time spent paused"""
+        timeline = self.timeline
+        if timeline is None or timeline.paused_at is None:
+            return
+        timeline.resume(self.__cur_time())
+        position = timeline.position(self.__cur_time())
+        if self.journal is not None and position is not None:
+            self.journal.resumed(*position[:2])
+        self.__publish_status()
+
+    def skip(self) -> None:
+        """end the interrupted session as skipped; the next one starts
+        with the next call to start()
+        """
+        from focusedme.events import SessionSkipped
+
+        cur_round = self.round_at(self.current_round_idx)
+        if self.timeline is None or cur_round is None:
+            return
+        cur_session = cur_round.sessions[cur_round.current_session_idx]
+        if cur_session.status != "skipped":
+            return
+        self.resume()
+        now = self.__cur_time()
+        session_idx = cur_round.current_session_idx
+        # time spent in the session so far, pauses excluded
+        position = self.timeline.position(now)
+        remaining = position[2] if position is not None else 0.0
+        seconds = self.timeline.length(session_idx) - remaining
+        self.timeline.skip(now)
+        self.__publish_status()
+        self._finish(session_idx, cur_session, seconds, self.__cur_time())
+        self._publish(SessionSkipped, cur_round, cur_session.session_type)
+
+    def position(self) -> tuple[int, int, float] | None:
+        """(round index, session index, seconds left) of the running
+        schedule, looked up on its timeline; None if it is not running
+        """
+        if self.timeline is None:
+            return None
+        return self.timeline.position(self.__cur_time())
+
+
+def simulate(
+    time_args: dict[str, int],
+    events: EventBus | None = None,
+    show_time: Callable[[int, int, int, str], None] | None = None,
+) -> Log:
+    """run the whole schedule on a virtual clock, without sound, and return
+    the log it produced; sessions are stamped as if started right now
+    """
+    if not time_args["num_rounds"]:
+        raise ConfigError("an endless schedule can not be simulated")
+    clock = VirtualClock()
+    log = Log()
+    pomodoro = Pomodoro(time_args, time_args["num_rounds"])
+    tracker = Tracker(
+        [],
+        log,
+        upcoming=pomodoro.iter_rounds(),
+        events=events,
+        num_rounds=time_args["num_rounds"],
+        clock=clock.monotonic,
+        sleep=clock.sleep,
+    )
+    tracker.start(show_time, {"sound": "", "path": ""})
+    return log
 
-                while True:
-                    show_time(
-                        remainder,
-                        self.current_round_idx + 1,
-                        cur_round.current_session_idx + 1,
-                        cur_session.session_type,
-                    )
-                    time.sleep(1)
-                    cur = self.__cur_time()
-                    remainder = max(remainder - (cur - started_at), 0)
-                    started_at = cur
-                    if remainder <= 0:
-                        break
-                cur_round.update_session("done")
-                self.log.save_rounds(self.rounds)
-                if SOUND:
-                    View.ring_bell(PATH)
 
-    def __get_round(self) -> int:
-        """Return the current round
-        check if current_round is completed
-        otherwise return a new round
+@dataclass
+class AsyncTracker(_TrackerBase):
+    """Control timer according to session durations on an asyncio event loop.
+
+    Many trackers can share one loop; skip, pause, resume and quit are sent
+    as awaitable commands instead of signals.
+    """
+
+    # non init attributes
+    paused: bool = False
+    # the loop clock while start() runs
+    _clock: Callable[[], float] | None = field(default=None, repr=False)
+    _commands: deque[str] = field(default_factory=deque, repr=False)
+    _waiter: asyncio.Future[None] | None = field(default=None, repr=False)
+
+    def position(self) -> tuple[int, int, float] | None:
+        """(round index, session index, seconds left) of the running
+        schedule, looked up on its timeline; None if it is not running
         """
-        if (self.rounds[self.current_round_idx].completed) and (
-            self.current_round_idx < len(self.rounds) - 1
-        ):
-            self.current_round_idx += 1
+        if self.timeline is None or self._clock is None:
+            return None
+        return self.timeline.position(self._clock())
+
+    def __send(self, cmd: str) -> None:
+        self._commands.append(cmd)
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(None)
+
+    async def skip(self) -> None:
+        """skip the current session"""
+        self.__send("skip")
+
+    async def pause(self) -> None:
+        """freeze the countdown keeping the remaining time"""
+        self.__send("pause")
+
+    async def resume(self) -> None:
+        """continue a paused countdown"""
+        self.__send("resume")
+
+    async def quit(self) -> None:
+        """stop tracking; start() returns as soon as the command is read"""
+        self.__send("quit")
+
+    async def __next_command(self, wake_at: float | None) -> str | None:
+        """wait for a command, returning None if the loop clock reaches
+        ``wake_at`` first. A bare future and timer handle are used instead of
+        ``asyncio.wait_for`` so that a tick does not cost a new Task.
+        """
+        if not self._commands:
+            import asyncio
 
-        return self.current_round_idx
+            from focusedme.daemon import set_if_pending
 
+            loop = asyncio.get_running_loop()
+            self._waiter = waiter = loop.create_future()
+            handle = None
+            if wake_at is not None:
+                handle = loop.call_at(wake_at, set_if_pending, waiter)
+            try:
+                await waiter
+            finally:
+                if handle is not None:
+                    handle.cancel()
+                self._waiter = None
+        return self._commands.popleft() if self._commands else None
+
+    async def __countdown(
+        self,
+        deadline: float,
+        cur_round: Round,
+        cur_session: SessionLike,
+        show_time: Callable[[int, int, int, str], None] | None,
+        timeline: Timeline,
+    ) -> tuple[str, float]:
+        """wait until ``deadline`` or a command ends the session.
+        Return "done", "skip" or "quit" and the seconds that were left.
+        """
+        import asyncio
 
-def main() -> None:
-    """parse cli arguments and start sequence of object calls"""
+        from focusedme.events import Tick
 
+        loop = asyncio.get_running_loop()
+        while True:
+            remainder = deadline - loop.time() - CLOCK_SLACK
+            if remainder <= 0:
+                return "done", 0.0
+            wake_at = deadline
+            if show_time is not None or self.events is not None:
+                seconds = math.ceil(remainder)
+                num_round = self.current_round_idx + 1
+                num_session = cur_round.current_session_idx + 1
+                if show_time is not None:
+                    show_time(seconds, num_round, num_session, cur_session.session_type)
+                if self.events is not None:
+                    self.events.publish(
+                        Tick(num_round, num_session, seconds, cur_session.session_type)
+                    )
+                steps = math.ceil(remainder / self.tick)
+                wake_at = deadline - (steps - 1) * self.tick
+
+            cmd = await self.__next_command(wake_at)
+            if cmd == "pause":
+                remaining = deadline - loop.time()
+                self.paused = True
+                timeline.pause(loop.time())
+                # no timeout: a paused tracker does not wake up at all
+                while cmd not in ("resume", "skip", "quit"):
+                    cmd = await self.__next_command(None)
+                self.paused = False
+                timeline.resume(loop.time())
+                deadline = loop.time() + remaining
+            if cmd in ("skip", "quit"):
+                return cmd, max(deadline - loop.time(), 0.0)
+
+    async def start(
+        self,
+        show_time: Callable[[int, int, int, str], None] | None,
+        sound_args: dict[str, str],
+    ) -> None:
+        """coroutine that processes the list of rounds until they are all
+        completed or a quit command is received.
+        """
+
+        import asyncio
+
+        SOUND = sound_args["sound"]
+        PATH = sound_args["path"]
+
+        loop = asyncio.get_running_loop()
+        started_at = loop.time()
+        self._wall_offset = time.time() - started_at
+        if self.round_at(0) is None:
+            return
+        timeline = self.timeline = self._new_timeline()
+        self._clock = loop.time
+        try:
+            await self.__run(timeline, started_at, show_time, SOUND, PATH)
+        finally:
+            self._clock = None
+
+    async def __run(
+        self,
+        timeline: Timeline,
+        started_at: float,
+        show_time: Callable[[int, int, int, str], None] | None,
+        SOUND: str,
+        PATH: str,
+    ) -> None:
+        """go through the sessions from the loop time ``started_at`` on"""
+        import asyncio
+
+        from focusedme.events import (
+            RoundCompleted,
+            SessionDone,
+            SessionSkipped,
+            SessionStarted,
+        )
+
+        loop = asyncio.get_running_loop()
+        for round_idx in itertools.count():
+            cur_round = self.round_at(round_idx)
+            if cur_round is None:
+                break
+            self.current_round_idx = round_idx
+            while True:
+                cur_session = cur_round.get_current_session()
+                # the last session of a round stays current once finished
+                if cur_session.status != "not started":
+                    self._publish(RoundCompleted, cur_round)
+                    break
+                session_idx = cur_round.current_session_idx
+                cur_round.update_session("skipped")
+                self.log.save_rounds(self.rounds)
+                self._publish(
+                    SessionStarted,
+                    cur_round,
+                    cur_session.session_type,
+                    cur_session.length,
+                )
+
+                timeline.seek(round_idx, session_idx, started_at)
+                cur_session.started_at = started_at + self._wall_offset
+                outcome, remaining = await self.__countdown(
+                    timeline.deadline(round_idx, session_idx),
+                    cur_round,
+                    cur_session,
+                    show_time,
+                    timeline,
+                )
+                if outcome == "quit":
+                    return
+                length = cur_session.length * SECONDS_PER_MIN
+                if outcome == "skip":
+                    self._publish(SessionSkipped, cur_round, cur_session.session_type)
+                    started_at = loop.time()
+                    spent = length - remaining
+                    self._finish(session_idx, cur_session, spent, started_at)
+                    continue
+
+                started_at = timeline.deadline(round_idx, session_idx)
+                self._publish(SessionDone, cur_round, cur_session.session_type)
+                cur_round.update_session("done")
+                self.log.save_rounds(self.rounds)
+                self._finish(session_idx, cur_session, length, started_at)
+                if SOUND:
+                    BELL.play(PATH)
+
+
+def show_banner() -> None:
     print(BANNER, "\n")
 
     print(
@@ -508,17 +1444,23 @@ def main() -> None:
         + View.get_color("reset")
         + "\n\n"
     )
+
+
+def main() -> None:
+    """parse cli arguments and start sequence of object calls"""
+
     parser = argparse.ArgumentParser(
         description="Welcome to the focusedMe app. Start your Pomodoro timer"
         " and enjoy the focus! (Stop it with Ctrl+c)",
-        usage="%(prog)s [-f] [-sb] [-lb] [-r] [-s]",
+        usage="%(prog)s [-f] [-sb] [-lb] [-r] [-s] [-j] [--project] [--profile]"
+        " [--simulate] [--daemon] [command]",
     )
     parser.add_argument(
         "-r",
         "--num_rounds",
         type=int,
         metavar="",
-        help="number of rounds, default is 3",
+        help="number of rounds, default is 3, 0 to run until stopped",
     )
     parser.add_argument(
         "-f",
@@ -547,25 +1489,522 @@ def main() -> None:
         action="store_true",
         help="save the duration in minutes os the session/break as new default values",
     )
+    parser.add_argument(
+        "-j",
+        "--journal",
+        metavar="",
+        help="file where progress is saved to resume after a crash,"
+        " default is in $XDG_STATE_HOME",
+    )
+    parser.add_argument(
+        "--status-file",
+        metavar="",
+        help="file the current session is published to for status bars,"
+        " '' for none, default is in $XDG_RUNTIME_DIR",
+    )
+    parser.add_argument(
+        "--project",
+        metavar="",
+        default="",
+        help="project the sessions are recorded under in the history",
+    )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="run in the background and answer 'focusedme client' requests",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="time ticks, rendering and bells and print the histograms at exit"
+        " or on SIGUSR1 (or set $FOCUSEDME_PROFILE)",
+    )
+    parser.add_argument(
+        "--simulate",
+        action="store_true",
+        help="run the whole schedule instantly and show its summary",
+    )
+    parser.add_argument(
+        "--socket",
+        metavar="",
+        help="socket of the daemon, default is in $XDG_RUNTIME_DIR",
+    )
+    commands = parser.add_subparsers(dest="command", metavar="command")
+    stats = commands.add_parser("stats", help="summary of past sessions")
+    stats.add_argument(
+        "--by",
+        choices=["day", "week", "month", "project", "hour"],
+        default="day",
+        help="total focus minutes per day/week/month/project,"
+        " or skip rate per hour of day",
+    )
+    stats.add_argument(
+        "--since",
+        metavar="YYYY-MM-DD",
+        type=_day,
+        default="",
+        help="first day to include",
+    )
+    stats.add_argument(
+        "--project",
+        metavar="",
+        default=argparse.SUPPRESS,
+        help="only include this project, default is every project",
+    )
+
+    dashboard = commands.add_parser(
+        "dashboard", help="run a timer per name, e.g. per project, on one screen"
+    )
+    dashboard.add_argument("names", nargs="+", metavar="NAME")
+    dashboard.add_argument(
+        "--fps", type=float, default=4.0, help="frames per second, default is 4"
+    )
+
+    simulation = commands.add_parser(
+        "simulate", help="compare schedules on many randomly interrupted days"
+    )
+    simulation.add_argument(
+        "--schedule",
+        action="append",
+        metavar="F,S,L,R[:TEMPLATE]",
+        help="lengths, rounds and optionally a template of F, S and L such as"
+        " FSFSFSFL; repeat to compare, default is the configured schedule",
+    )
+    simulation.add_argument("--days", type=int, default=100_000)
+    simulation.add_argument(
+        "--workers",
+        type=_positive,
+        help="processes to use, default is every core",
+    )
+    simulation.add_argument(
+        "--interrupt",
+        type=float,
+        default=0.2,
+        help="chance that a session is interrupted, default is %(default)s",
+    )
+    simulation.add_argument(
+        "--quit",
+        type=float,
+        default=0.05,
+        help="chance that an interruption ends the day, default is %(default)s",
+    )
+    simulation.add_argument(
+        "--skip",
+        type=float,
+        default=0.5,
+        help="chance that an interrupted session is skipped instead of resumed,"
+        " default is %(default)s",
+    )
+    simulation.add_argument(
+        "--pause",
+        type=float,
+        default=3.0,
+        help="mean minutes away before resuming, default is %(default)s",
+    )
+    simulation.add_argument("--seed", type=int, default=0)
+
+    plan_cmd = commands.add_parser(
+        "plan", help="write the sessions of the coming days as CSV or iCalendar"
+    )
+    plan_cmd.add_argument(
+        "--start", metavar="YYYY-MM-DDTHH:MM", help="first session, default is now"
+    )
+    plan_cmd.add_argument(
+        "--days", type=int, default=5, help="calendar days to plan, default is 5"
+    )
+    plan_cmd.add_argument(
+        "--hours",
+        metavar="HH:MM-HH:MM",
+        default="09:00-17:00",
+        help="working hours, default is %(default)s",
+    )
+    plan_cmd.add_argument(
+        "--lunch",
+        metavar="HH:MM-HH:MM",
+        default="12:00-13:00",
+        help="'' for none, default is %(default)s",
+    )
+    plan_cmd.add_argument(
+        "--block",
+        action="append",
+        default=[],
+        metavar="HH:MM-HH:MM",
+        help="other time off every day, may be repeated",
+    )
+    plan_cmd.add_argument(
+        "--weekends", action="store_true", help="plan Saturdays and Sundays too"
+    )
+    plan_cmd.add_argument("--format", choices=["csv", "ics"], default="csv")
+    plan_cmd.add_argument(
+        "--focus-only", action="store_true", help="leave the breaks out of .ics"
+    )
+    plan_cmd.add_argument(
+        "-o", "--output", metavar="FILE", help="file to write, default is stdout"
+    )
+
+    export_cmd = commands.add_parser("export", help="write the session history")
+    export_cmd.add_argument(
+        "--format",
+        choices=["ndjson", "csv", "arrow", "parquet"],
+        default="ndjson",
+        help="default is %(default)s; arrow and parquet need pyarrow",
+    )
+    export_cmd.add_argument(
+        "-o", "--output", metavar="FILE", help="file to write, default is stdout"
+    )
+    export_cmd.add_argument(
+        "--since",
+        metavar="YYYY-MM-DD",
+        type=_day,
+        default="",
+        help="first day to include",
+    )
+    export_cmd.add_argument("--project", metavar="", help="only include this project")
+
+    from focusedme.daemon import COMMANDS as DAEMON_COMMANDS
+
+    client = commands.add_parser(
+        "client", help="send a command to the daemon or the team server"
+    )
+    client.add_argument(
+        "request",
+        choices=DAEMON_COMMANDS + TEAM_REQUESTS,
+        help="start and timers are only answered by the team server",
+    )
+    client.add_argument(
+        "--timer", metavar="NAME", help="timer of the team server to send it to"
+    )
+    client.add_argument(
+        "--lengths",
+        nargs=4,
+        type=int,
+        metavar=("FOCUS", "SHORT", "LONG", "ROUNDS"),
+        help="minutes of each session and number of rounds of a timer being"
+        " started, default are those of the team server",
+    )
+
+    team = commands.add_parser("team", help="serve many named timers")
+    team.add_argument(
+        "--journals",
+        metavar="DIR",
+        help="directory of the timer journals, '' for none,"
+        " default is in $XDG_STATE_HOME",
+    )
+
+    parser.set_defaults(func=_cmd_timer)
+    stats.set_defaults(func=_cmd_stats)
+    dashboard.set_defaults(func=_cmd_dashboard)
+    simulation.set_defaults(func=_cmd_simulate)
+    plan_cmd.set_defaults(func=_cmd_plan)
+    export_cmd.set_defaults(func=_cmd_export)
+    client.set_defaults(func=_cmd_client)
+    team.set_defaults(func=_cmd_team)
 
     args = parser.parse_args()
-    time_args, sound_args = Config.load_init()
-    # dictionary that store Pomodor initialization parameters
-    if args.focus_time:
-        time_args["focus_time"] = args.focus_time
-    if args.short_break:
-        time_args["short_break"] = args.short_break
-    if args.long_break:
-        time_args["long_break"] = args.long_break
-    if args.num_rounds:
-        time_args["num_rounds"] = args.num_rounds
-    if args.save:
-        Config.save_init(time_args, sound_args)
-        Config.show_init(time_args, sound_args)
+    # these neither run a timer nor read fm.init
+    if args.command not in ("stats", "export", "client"):
+        from focusedme import profiling
+
+        if args.profile or profiling.requested():
+            profiling.enable()
+        # the plan may be written to stdout
+        if args.command != "plan":
+            show_banner()
+    args.func(args)
+
+
+def _day(value: str) -> str:
+    """a local date given on the command line, as YYYY-MM-DD"""
+    try:
+        day = time.strptime(value, "%Y-%m-%d")
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            "expected a date as YYYY-MM-DD, not {!r}".format(value)
+        ) from None
+    # days are compared as text
+    return time.strftime("%Y-%m-%d", day)
+
+
+def _positive(value: str) -> int:
+    """a count given on the command line, 1 or more"""
+    count = int(value)
+    if count < 1:
+        raise argparse.ArgumentTypeError("expected 1 or more, not {}".format(count))
+    return count
+
+
+def _fail(exc: Exception | str) -> NoReturn:
+    print(exc, file=sys.stderr)
+    sys.exit(1)
+
+
+def _settings(args: argparse.Namespace) -> tuple[dict[str, int], dict[str, str]]:
+    """the settings of fm.init with those given on the command line, saved
+    as the new defaults if asked to
+    """
+    try:
+        time_args, sound_args = Config.load_init()
+        # dictionary that store Pomodor initialization parameters
+        if args.focus_time:
+            time_args["focus_time"] = args.focus_time
+        if args.short_break:
+            time_args["short_break"] = args.short_break
+        if args.long_break:
+            time_args["long_break"] = args.long_break
+        if args.num_rounds is not None:
+            time_args["num_rounds"] = args.num_rounds
+        # validate the values given on the command line as well
+        Settings.from_args(time_args, sound_args)
+        if args.save:
+            Config.save_init(time_args, sound_args)
+            Config.show_init(time_args, sound_args)
+    except ConfigError as exc:
+        _fail(exc)
+    return time_args, sound_args
+
+
+def _cmd_stats(args: argparse.Namespace) -> None:
+    from focusedme.history import History, show_stats
+
+    # --project may be given before or after the command
+    show_stats(History(), args.by, args.since, args.project or None)
+
+
+def _cmd_export(args: argparse.Namespace) -> None:
+    from focusedme.export import TEXT_FORMATS, ExportError, check_format, export
+    from focusedme.history import History
+
+    rows = History().sessions(args.since, args.project)
+    text = args.format in TEXT_FORMATS
+    try:
+        check_format(args.format)
+        if args.output:
+            with open(args.output, "w" if text else "wb") as out:
+                export(rows, args.format, out)
+        else:
+            export(rows, args.format, sys.stdout if text else sys.stdout.buffer)
+    except ExportError as exc:
+        _fail(exc)
+
+
+def _cmd_client(args: argparse.Namespace) -> None:
+    from focusedme.daemon import DaemonError, request
+
+    line = _client_request(args)
+    try:
+        if args.timer or args.request in TEAM_REQUESTS:
+            from focusedme.team import default_socket_path
+
+            print(request(line, args.socket or default_socket_path()))
+        else:
+            print(request(line, args.socket))
+    except DaemonError as exc:
+        _fail(exc)
+
+
+def _client_request(args: argparse.Namespace) -> str:
+    """the line sent by ``focusedme client``; a request naming a timer, or
+    one only the team server answers, goes to the team server
+    """
+    if args.lengths and args.request != "start":
+        _fail("--lengths is only sent with start")
+    words: list[str] = [args.request]
+    if args.request == "timers":
+        if args.timer:
+            _fail("timers counts every timer, leave out --timer")
+        return words[0]
+    if args.request == "start" and not args.timer:
+        _fail("start needs the --timer to start")
+    if args.timer:
+        words.append(args.timer)
+    words.extend(str(value) for value in args.lengths or ())
+    return " ".join(words)
+
+
+def _cmd_dashboard(args: argparse.Namespace) -> None:
+    import asyncio
+
+    from focusedme.dashboard import Dashboard
+    from focusedme.history import History
+
+    time_args, sound_args = _settings(args)
+    board = Dashboard(fps=args.fps)
+    trackers = []
+    for name in args.names:
+        schedule = Pomodoro(time_args, time_args["num_rounds"])
+        timer = AsyncTracker(
+            upcoming=schedule.iter_rounds(),
+            history=History(project=name),
+            num_rounds=time_args["num_rounds"],
+        )
+        board.add(name, timer)
+        trackers.append(timer)
+
+    async def run() -> None:
+        # every tracker and the dashboard share one loop and one thread
+        tasks = [asyncio.ensure_future(t.start(None, sound_args)) for t in trackers]
+        try:
+            await board.run()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+def _cmd_plan(args: argparse.Namespace) -> None:
+    import datetime
+
+    from focusedme import planner
+
+    def time_range(text: str) -> tuple[datetime.time, datetime.time]:
+        first, _, last = text.partition("-")
+        return planner.clock_time(first), planner.clock_time(last)
+
+    time_args, _ = _settings(args)
+    try:
+        start = datetime.datetime.now().replace(second=0, microsecond=0)
+        if args.start:
+            start = datetime.datetime.fromisoformat(args.start)
+        blocks = [time_range(b) for b in [args.lunch] + args.block if b]
+        weekdays = range(7) if args.weekends else planner.WEEKDAYS
+        table = planner.plan(
+            time_args, start, args.days, time_range(args.hours), blocks, weekdays
+        )
+    except ValueError as exc:
+        _fail(exc)
+    out = open(args.output, "w", newline="") if args.output else sys.stdout
+    try:
+        if args.format == "ics":
+            planner.write_ics(table, out, breaks=not args.focus_only)
+        else:
+            planner.write_csv(table, out)
+    finally:
+        if args.output:
+            out.close()
+
+
+def _cmd_simulate(args: argparse.Namespace) -> None:
+    from focusedme import montecarlo
+
+    time_args, sound_args = _settings(args)
+    try:
+        if args.schedule:
+            plans = [montecarlo.Plan.parse(spec) for spec in args.schedule]
+        else:
+            plans = [
+                montecarlo.Plan(
+                    focus_time=time_args["focus_time"],
+                    short_break=time_args["short_break"],
+                    long_break=time_args["long_break"],
+                    num_rounds=time_args["num_rounds"],
+                )
+            ]
+        for plan in plans:
+            Settings.from_args(plan.time_args(), sound_args)
+        behaviour = montecarlo.Behaviour(
+            interrupt=args.interrupt,
+            quit=args.quit,
+            skip=args.skip,
+            pause=args.pause,
+        )
+    except ValueError as exc:
+        _fail(exc)
+    results = []
+    for plan in plans:
+        distribution = montecarlo.monte_carlo(
+            plan, behaviour, args.days, args.workers, args.seed
+        )
+        results.append((plan, distribution))
+    montecarlo.show_results(results)
+
+
+def _cmd_team(args: argparse.Namespace) -> None:
+    from focusedme.daemon import DaemonError
+    from focusedme.team import TeamServer
+
+    time_args, sound_args = _settings(args)
+    server = TeamServer(
+        time_args,
+        Round.round_template,
+        validate=functools.partial(Settings.from_args, sound_args=sound_args),
+    )
+    if args.socket:
+        server.path = args.socket
+    if args.journals is not None:
+        server.journal_dir = args.journals
+    try:
+        server.run()
+    except DaemonError as exc:
+        _fail(exc)
+
+
+def _cmd_timer(args: argparse.Namespace) -> None:
+    """run the timer in the terminal, or as a daemon or a simulation"""
+    time_args, sound_args = _settings(args)
+    if args.simulate:
+        try:
+            log = simulate(time_args)
+        except ConfigError as exc:
+            _fail(exc)
+        log.plot_results(View().plot)
+        return
+    if args.daemon:
+        from focusedme.daemon import Daemon, DaemonError
+
+        pomodoro = Pomodoro(time_args, time_args["num_rounds"])
+        tracker = AsyncTracker(
+            [], upcoming=pomodoro.iter_rounds(), num_rounds=time_args["num_rounds"]
+        )
+        daemon = Daemon(tracker, sound_args)
+        if args.socket:
+            daemon.path = args.socket
+        try:
+            daemon.run()
+        except DaemonError as exc:
+            _fail(exc)
+        return
+    from focusedme.history import History
+    from focusedme.journal import Journal
+    from focusedme.journal import default_path as default_journal_path
+
+    status_file = _open_status_file(args.status_file)
     # initialize view
     view = View()
     # start pomodoro
-    view.run(time_args, sound_args)
+    try:
+        view.run(
+            time_args,
+            sound_args,
+            Journal(args.journal or default_journal_path()),
+            History(project=args.project),
+            status_file,
+        )
+    finally:
+        if status_file is not None:
+            status_file.close()
+
+
+def _open_status_file(path: str | None) -> StatusSegment | None:
+    """the status file at ``path`` (the default one if None), None if it
+    is '' or another focusedme is publishing there
+    """
+    if path == "":
+        return None
+    from focusedme import segment
+
+    status_file = segment.StatusSegment(path or segment.default_path())
+    try:
+        status_file.open()
+    except segment.SegmentError as exc:
+        # run without it
+        print(exc, file=sys.stderr)
+        return None
+    return status_file
 
 
 if __name__ == "__main__":
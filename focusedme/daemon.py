@@ -0,0 +1,179 @@
+"""Background timer serving its state over a Unix domain socket.
+
+``focusedme --daemon`` owns an ``AsyncTracker`` and answers one line
+requests on a local socket, one line per answer:
+
+    status                -> "1/2 FOCUS TIME 24:59"
+    skip, pause, resume,
+    quit                  -> "ok"
+
+The status line is rendered once per tick and served as cached bytes, so
+status bars can poll it as often as they like. ``focusedme client <command>``
+sends a single request and prints the answer.
+"""
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Awaitable, Callable
+
+from focusedme.schedule import LABELS
+
+if TYPE_CHECKING:  # pragma: no cover
+    import asyncio
+
+    from focusedme.__main__ import AsyncTracker
+
+COMMANDS = ("status", "skip", "pause", "resume", "quit")
+
+
+class DaemonError(Exception):
+    """raised when the daemon cannot be reached or is already running"""
+
+
+def default_socket_path(name: str = "focusedme") -> str:
+    """socket location in $XDG_RUNTIME_DIR, or a per user file in /tmp"""
+    runtime = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime:
+        return os.path.join(runtime, name + ".sock")
+    import tempfile
+
+    uid = os.getuid() if hasattr(os, "getuid") else 0
+    return os.path.join(tempfile.gettempdir(), "{}-{}.sock".format(name, uid))
+
+
+def request(command: str, path: str | None = None, timeout: float = 2.0) -> str:
+    """send one command to the daemon and return its answer"""
+    import socket
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        try:
+            sock.connect(path or default_socket_path())
+        except OSError as exc:
+            raise DaemonError("focusedme is not running") from exc
+        sock.sendall(command.encode() + b"\n")
+        answer = b""
+        while not answer.endswith(b"\n"):
+            chunk = sock.recv(4096)
+            if not chunk:
+                break
+            answer += chunk
+    return answer.decode().rstrip("\n")
+
+
+def claim_socket(path: str) -> None:
+    """remove a socket file left behind by a server that died"""
+    if not os.path.exists(path):
+        return
+    try:
+        request("status", path, timeout=0.5)
+    except DaemonError:
+        os.unlink(path)
+    else:
+        raise DaemonError("focusedme is already running on " + path)
+
+
+def set_if_pending(future: asyncio.Future[None]) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+async def serve_lines(
+    path: str,
+    answer: Callable[[str], Awaitable[bytes]],
+    until: Callable[[], Awaitable[object]],
+) -> None:
+    """answer every line sent to the socket at ``path`` with ``answer(line)``
+    until ``until()`` returns, then hang up on the clients and remove the
+    socket
+    """
+    import asyncio
+
+    clients: dict[asyncio.Task[None], asyncio.StreamWriter] = {}
+
+    async def handle(
+        reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        task = asyncio.current_task()
+        if task is not None:
+            clients[task] = writer
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                writer.write(await answer(line.decode(errors="replace")))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            if task is not None:
+                del clients[task]
+            writer.close()
+
+    claim_socket(path)
+    server = await asyncio.start_unix_server(handle, path=path)
+    try:
+        await until()
+    finally:
+        server.close()
+        # hang up on idle clients holding their connection open
+        for writer in list(clients.values()):
+            writer.close()
+        await asyncio.gather(*list(clients), return_exceptions=True)
+        await server.wait_closed()
+        if os.path.exists(path):
+            os.unlink(path)
+
+
+@dataclass
+class Daemon:
+    """serve the state of a tracker and forward commands to it"""
+
+    tracker: AsyncTracker
+    sound_args: dict[str, str]
+    path: str = field(default_factory=default_socket_path)
+
+    # non init attributes: the status line of the current tick
+    _status: bytes = field(default=b"starting\n", repr=False)
+
+    def show_time(
+        self, remainder: int, num_round: int, num_session: int, type_session: str
+    ) -> None:
+        """render the status line; called by the tracker on every tick"""
+        minutes, seconds = divmod(remainder, 60)
+        label = LABELS.get(type_session, type_session)
+        self._status = "{}/{} {} {:02}:{:02}\n".format(
+            num_round, num_session, label, minutes, seconds
+        ).encode()
+
+    def status(self) -> bytes:
+        if self.tracker.paused:
+            return b"PAUSED " + self._status
+        return self._status
+
+    async def __answer(self, line: str) -> bytes:
+        command = line.strip()
+        if command == "status":
+            return self.status()
+        if command in COMMANDS:
+            await getattr(self.tracker, command)()
+            return b"ok\n"
+        return b"error: unknown command\n"
+
+    async def serve(self) -> None:
+        """run the tracker and the server until the schedule ends or a
+        quit command is received
+        """
+        await serve_lines(
+            self.path,
+            self.__answer,
+            lambda: self.tracker.start(self.show_time, self.sound_args),
+        )
+
+    def run(self) -> None:
+        import asyncio
+
+        asyncio.run(self.serve())
@@ -0,0 +1,197 @@
+"""Full screen dashboard of many trackers at once.
+
+``focusedme dashboard NAME...`` runs one tracker per name, e.g. one per
+project, and shows them as a table. The trackers share one event loop, run
+without a display and only wake up when a session ends; the dashboard draws
+on the same loop at a capped frame rate, reading each tracker's position
+from its timeline.
+A row is only formatted when its round, session, remaining second or pause
+state changed since the previous frame, and only the rows that changed are
+written, each with one cursor move, in a single write per frame.
+Session labels are styled with ``rich`` once per session type; rich only
+formats them, so a frame still holds nothing but the rows that changed.
+"""
+
+from __future__ import annotations
+
+import math
+import sys
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Protocol, TextIO
+
+from rich.console import Console
+from rich.text import Text
+
+from focusedme.schedule import LABELS
+from focusedme.util import CLOCK_SLACK
+
+if TYPE_CHECKING:  # pragma: no cover
+    from focusedme.__main__ import Round
+    from focusedme.schedule import Timeline
+
+# rich styles of the session labels, as the colors of View.show_time
+STYLES = {
+    "focus_time": "bright_red",
+    "short_break": "bright_green",
+    "long_break": "bright_blue",
+}
+NAME_WIDTH = 20
+LABEL_WIDTH = max(len(label) for label in LABELS.values())
+
+ALT_SCREEN = "\033[?1049h\033[?25l"
+MAIN_SCREEN = "\033[?25h\033[?1049l"
+
+
+class Tracker(Protocol):
+    """what a row reads of a tracker, Tracker and AsyncTracker alike"""
+
+    rounds: list[Round]
+    timeline: Timeline | None
+
+    def position(self) -> tuple[int, int, float] | None: ...
+
+
+@dataclass
+class Dashboard:
+    """table of named trackers redrawn at most ``fps`` times a second"""
+
+    trackers: dict[str, Tracker] = field(default_factory=dict)
+    # defaults to sys.stdout, looked up when the first frame is written
+    out: TextIO | None = None
+    fps: float = 4.0
+    # lines available, the height of the terminal if not given
+    height: int | None = None
+
+    # non init attributes
+    frames: int = 0
+    # rows written since the dashboard started, header included
+    rows_written: int = 0
+    # (round, session, seconds, paused) of each row in the last frame
+    _states: list[tuple[int, int, int, bool] | None] = field(
+        default_factory=list, repr=False
+    )
+    _header: str = field(default="", repr=False)
+    # every tracker was over in the last frame
+    _finished: bool = field(default=False, repr=False)
+    _labels: dict[str, str] = field(default_factory=dict, repr=False)
+
+    def add(self, name: str, tracker: Tracker) -> None:
+        self.trackers[name] = tracker
+
+    def __label(self, session_type: str) -> str:
+        """the padded label of a session type, styled once and cached"""
+        label = self._labels.get(session_type)
+        if label is None:
+            text = LABELS.get(session_type, session_type).ljust(LABEL_WIDTH)
+            console = Console(file=self.out, force_terminal=True)
+            with console.capture() as capture:
+                console.print(Text(text, style=STYLES.get(session_type, "")), end="")
+            label = self._labels[session_type] = capture.get()
+        return label
+
+    @staticmethod
+    def __state(tracker: Tracker) -> tuple[int, int, int, bool] | None:
+        """what a row shows: (round, session, seconds left, paused), with
+        round -1 before the tracker starts and None once it is over
+        """
+        timeline = tracker.timeline
+        if timeline is None:
+            return -1, 0, 0, False
+        position = tracker.position()
+        if position is None:
+            return None
+        round_idx, session_idx, remainder = position
+        seconds = max(0, math.ceil(remainder - CLOCK_SLACK))
+        return round_idx, session_idx, seconds, timeline.paused_at is not None
+
+    def __row(
+        self, name: str, tracker: Tracker, state: tuple[int, int, int, bool] | None
+    ) -> str:
+        if state is None:
+            return "{:<{}} done".format(name, NAME_WIDTH)
+        round_idx, session_idx, seconds, paused = state
+        if round_idx < 0:
+            return "{:<{}} starting".format(name, NAME_WIDTH)
+        # every round follows the same template
+        session_type = tracker.rounds[0].sessions[session_idx].session_type
+        minutes, seconds = divmod(seconds, 60)
+        return "{:<{}} {:>3}/{} {} {:02}:{:02}{}".format(
+            name[:NAME_WIDTH],
+            NAME_WIDTH,
+            round_idx + 1,
+            session_idx + 1,
+            self.__label(session_type),
+            minutes,
+            seconds,
+            "  PAUSED" if paused else "",
+        )
+
+    def render(self) -> str:
+        """escape sequences turning the last frame into the current one"""
+        height = self.height
+        if height is None:
+            import shutil
+
+            height = shutil.get_terminal_size().lines
+        visible = max(0, height - 1)
+        if len(self._states) != len(self.trackers):
+            # first frame, or the set of trackers changed: draw everything
+            self._states = [(-2, 0, 0, False)] * len(self.trackers)
+            self._header = ""
+            parts = ["\033[H\033[J"]
+        else:
+            parts = []
+
+        finished = paused = 0
+        for i, (name, tracker) in enumerate(self.trackers.items()):
+            state = self.__state(tracker)
+            if state is None:
+                finished += 1
+            elif state[3]:
+                paused += 1
+            # rows below the bottom of the screen are counted, not drawn
+            if i < visible and state != self._states[i]:
+                self._states[i] = state
+                row = self.__row(name, tracker, state)
+                parts.append("\033[{};1H{}\033[K".format(i + 2, row))
+                self.rows_written += 1
+
+        self._finished = finished == len(self.trackers)
+        header = "focusedme - {} timers, {} paused, {} done".format(
+            len(self.trackers), paused, finished
+        )
+        if header != self._header:
+            self._header = header
+            parts.append("\033[1;1H" + header + "\033[K")
+            self.rows_written += 1
+        return "".join(parts)
+
+    def draw(self) -> None:
+        out = self.out or sys.stdout
+        frame = self.render()
+        self.frames += 1
+        if frame:
+            out.write(frame)
+            out.flush()
+
+    async def run(self) -> None:
+        """draw frames on the running event loop until every tracker is done"""
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        delay = 1 / self.fps
+        anchor = loop.time()
+        out = self.out or sys.stdout
+        out.write(ALT_SCREEN)
+        try:
+            while True:
+                self.draw()
+                if self._finished:
+                    break
+                # frames stay on a fixed grid; missed ones are skipped
+                now = loop.time()
+                next_frame = anchor + (math.floor((now - anchor) / delay) + 1) * delay
+                await asyncio.sleep(next_frame - now)
+        finally:
+            out.write(MAIN_SCREEN)
+            out.flush()
@@ -0,0 +1,241 @@
+"""Typed timer events and a bus delivering them to subscribers.
+
+Trackers publish an event for every tick and session transition. Publishing
+only stores the event and wakes the dispatcher thread, so it takes the same
+time whatever the number or speed of the subscribers. The dispatcher hands
+every event to each interested subscription, which delivers it on a thread
+of its own: a slow subscriber only delays itself. Ticks a subscriber has not
+received yet are coalesced into the latest one, for that subscriber alone,
+and each subscriber can ask to receive ticks at most every ``min_interval``
+seconds; transitions are always delivered, in order.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, Iterable
+
+
+@dataclass(frozen=True)
+class Event:
+    """base class of the events published by a tracker"""
+
+    round: int  # counted from 1, as shown to the user
+    session: int  # counted from 1 within the round
+
+
+@dataclass(frozen=True)
+class Tick(Event):
+    remainder: int
+    session_type: str
+
+
+@dataclass(frozen=True)
+class SessionStarted(Event):
+    session_type: str
+    length: float  # minutes
+
+
+@dataclass(frozen=True)
+class SessionDone(Event):
+    session_type: str
+
+
+@dataclass(frozen=True)
+class SessionSkipped(Event):
+    session_type: str
+
+
+@dataclass(frozen=True)
+class RoundCompleted(Event):
+    pass
+
+
+@dataclass
+class Subscription:
+    """a subscriber, the events it wants and those not delivered yet"""
+
+    callback: Callable[[Event], None]
+    kinds: tuple[type[Event], ...] = (Event,)
+    # minimum number of seconds between two ticks delivered
+    min_interval: float = 0.0
+
+    # non init attributes
+    delivered: int = 0
+    # ticks not delivered because of min_interval
+    throttled: int = 0
+    # ticks replaced by a newer one before this subscriber was ready
+    coalesced: int = 0
+    _last_tick: float = field(default=float("-inf"), repr=False)
+    _tick: Tick | None = field(default=None, repr=False)
+    _pending: deque[Event] = field(default_factory=deque, repr=False)
+    _busy: bool = field(default=False, repr=False)
+    _closed: bool = field(default=False, repr=False)
+    _cond: threading.Condition = field(default_factory=threading.Condition, repr=False)
+    _thread: threading.Thread | None = field(default=None, repr=False)
+
+    def offer(self, event: Event) -> None:
+        """queue ``event`` if it is of a wanted kind, without waiting for
+        the subscriber
+        """
+        if not isinstance(event, self.kinds):
+            return
+        with self._cond:
+            if self._closed:
+                return
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self.__run, name="event-subscriber", daemon=True
+                )
+                self._thread.start()
+            if isinstance(event, Tick):
+                if self._tick is not None:
+                    self.coalesced += 1
+                self._tick = event
+            else:
+                # keep a pending tick ahead of the transition that follows it
+                if self._tick is not None:
+                    self._pending.append(self._tick)
+                    self._tick = None
+                self._pending.append(event)
+            self._cond.notify_all()
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """wait until every queued event has been delivered"""
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: not (self._pending or self._tick or self._busy), timeout
+            )
+
+    def close(self) -> None:
+        """drop the events not delivered yet and stop the delivery thread"""
+        with self._cond:
+            self._closed = True
+            self._pending.clear()
+            self._tick = None
+            self._cond.notify_all()
+
+    def __run(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending or self._tick or self._closed)
+                if self._closed:
+                    return
+                batch = list(self._pending)
+                self._pending.clear()
+                if self._tick is not None:
+                    batch.append(self._tick)
+                    self._tick = None
+                self._busy = True
+            for event in batch:
+                self.__deliver(event, time.monotonic())
+            with self._cond:
+                self._busy = False
+                self._cond.notify_all()
+
+    def __deliver(self, event: Event, now: float) -> None:
+        if isinstance(event, Tick):
+            if now - self._last_tick < self.min_interval:
+                self.throttled += 1
+                return
+            self._last_tick = now
+        self.delivered += 1
+        try:
+            self.callback(event)
+        except Exception:
+            # a broken subscriber must not stop its later deliveries
+            import logging
+
+            logging.getLogger(__name__).exception(
+                "event subscriber %r failed on %r", self.callback, event
+            )
+
+
+@dataclass
+class EventBus:
+    """publish events from the timer and fan them out on a thread"""
+
+    subscriptions: list[Subscription] = field(default_factory=list)
+
+    # non init attributes
+    # ticks replaced by a newer one before they were handed to anyone,
+    # which only happens when they are published faster than fanned out
+    coalesced: int = 0
+    _pending: deque[Event] = field(default_factory=deque, repr=False)
+    _busy: bool = field(default=False, repr=False)
+    _cond: threading.Condition = field(default_factory=threading.Condition, repr=False)
+    _thread: threading.Thread | None = field(default=None, repr=False)
+
+    def subscribe(
+        self,
+        callback: Callable[[Event], None],
+        kinds: Iterable[type[Event]] = (Event,),
+        min_interval: float = 0.0,
+    ) -> Subscription:
+        subscription = Subscription(callback, tuple(kinds), min_interval)
+        with self._cond:
+            # copy on write, the dispatcher iterates without the lock
+            self.subscriptions = self.subscriptions + [subscription]
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._cond:
+            self.subscriptions = [
+                s for s in self.subscriptions if s is not subscription
+            ]
+        subscription.close()
+
+    def publish(self, event: Event) -> None:
+        """queue an event without waiting for any subscriber"""
+        with self._cond:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self.__dispatch, name="events", daemon=True
+                )
+                self._thread.start()
+            self._pending.append(event)
+            self._cond.notify_all()
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """wait until every published event has been delivered"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            if not self._cond.wait_for(
+                lambda: not (self._pending or self._busy), timeout
+            ):
+                return False
+        for subscription in self.subscriptions:
+            left = None if deadline is None else max(deadline - time.monotonic(), 0)
+            if not subscription.flush(left):
+                return False
+        return True
+
+    def __dispatch(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending)
+                batch = self.__coalesce(self._pending)
+                self._pending.clear()
+                self._busy = True
+                subscriptions = self.subscriptions
+            # only queues the events, the subscribers run on their threads
+            for event in batch:
+                for subscription in subscriptions:
+                    subscription.offer(event)
+            with self._cond:
+                self._busy = False
+                self._cond.notify_all()
+
+    def __coalesce(self, events: Iterable[Event]) -> list[Event]:
+        """``events`` without the ticks followed by another tick"""
+        batch: list[Event] = []
+        for event in events:
+            if isinstance(event, Tick) and batch and isinstance(batch[-1], Tick):
+                self.coalesced += 1
+                batch[-1] = event
+            else:
+                batch.append(event)
+        return batch
@@ -0,0 +1,175 @@
+"""Streaming export of the session history.
+
+``focusedme export`` writes one record per stored session as NDJSON, CSV,
+Apache Arrow (IPC file) or Parquet. Rows are read from the database and
+written ``CHUNK`` at a time, so memory stays flat whatever the length of
+the history. Arrow and Parquet need the optional ``pyarrow`` package; they
+keep the timestamps typed, so ``pandas.read_parquet`` needs no parsing.
+"""
+
+from __future__ import annotations
+
+import datetime
+import json
+from typing import TYPE_CHECKING, Any, BinaryIO, Iterable, Iterator, TextIO
+
+from focusedme.history import CHUNK, Row
+
+if TYPE_CHECKING:  # pragma: no cover
+    import pyarrow
+
+FORMATS = ("ndjson", "csv", "arrow", "parquet")
+# formats written as text, the others are binary
+TEXT_FORMATS = ("ndjson", "csv")
+FIELDS = (
+    "round",
+    "session",
+    "session_type",
+    "planned",
+    "started_at",
+    "ended_at",
+    "status",
+    "project",
+)
+
+
+class ExportError(Exception):
+    """raised when the history cannot be exported in the requested format"""
+
+
+def _isoformat(timestamp: float) -> str:
+    utc = datetime.timezone.utc
+    return datetime.datetime.fromtimestamp(timestamp, utc).isoformat()
+
+
+def _chunks(rows: Iterable[Row]) -> Iterator[list[Row]]:
+    chunk: list[Row] = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == CHUNK:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def records(rows: Iterable[Row]) -> Iterator[dict[str, Any]]:
+    """the rows as dictionaries keyed by FIELDS, times in ISO 8601 UTC"""
+    for started_at, ended_at, session_type, planned, status, project, r, s in rows:
+        yield {
+            "round": r,
+            "session": s,
+            "session_type": session_type,
+            "planned": planned,
+            "started_at": _isoformat(started_at),
+            "ended_at": _isoformat(ended_at),
+            "status": status,
+            "project": project,
+        }
+
+
+def write_ndjson(rows: Iterable[Row], out: TextIO) -> int:
+    """write one JSON object per line; return the number of rows"""
+    count = 0
+    for chunk in _chunks(rows):
+        out.write("".join(json.dumps(r) + "\n" for r in records(chunk)))
+        count += len(chunk)
+    return count
+
+
+def write_csv(rows: Iterable[Row], out: TextIO) -> int:
+    """write a header and one line per row; return the number of rows"""
+    import csv
+
+    writer = csv.DictWriter(out, FIELDS, lineterminator="\n")
+    writer.writeheader()
+    count = 0
+    for chunk in _chunks(rows):
+        writer.writerows(records(chunk))
+        count += len(chunk)
+    return count
+
+
+def _pyarrow() -> Any:
+    try:
+        import pyarrow
+    except ImportError as exc:
+        raise ExportError(
+            "arrow and parquet exports need pyarrow: pip install focusedme[arrow]"
+        ) from exc
+    return pyarrow
+
+
+def _batch(pa: Any, schema: pyarrow.Schema, chunk: list[Row]) -> Any:
+    columns = list(zip(*chunk))
+    # started_at and ended_at are seconds, the schema stores microseconds
+    started_at = [round(t * 1e6) for t in columns[0]]
+    ended_at = [round(t * 1e6) for t in columns[1]]
+    return pa.RecordBatch.from_arrays(
+        [
+            pa.array(columns[6], pa.int32()),
+            pa.array(columns[7], pa.int32()),
+            pa.array(columns[2], pa.string()),
+            pa.array(columns[3], pa.float64()),
+            pa.array(started_at, schema.field("started_at").type),
+            pa.array(ended_at, schema.field("ended_at").type),
+            pa.array(columns[4], pa.string()),
+            pa.array(columns[5], pa.string()),
+        ],
+        schema=schema,
+    )
+
+
+def write_arrow(rows: Iterable[Row], out: BinaryIO, parquet: bool = False) -> int:
+    """write the rows as an Arrow IPC file, or as Parquet, one record batch
+    or row group per chunk; return the number of rows
+    """
+    pa = _pyarrow()
+    timestamp = pa.timestamp("us", tz="UTC")
+    schema = pa.schema(
+        [
+            ("round", pa.int32()),
+            ("session", pa.int32()),
+            ("session_type", pa.string()),
+            ("planned", pa.float64()),
+            ("started_at", timestamp),
+            ("ended_at", timestamp),
+            ("status", pa.string()),
+            ("project", pa.string()),
+        ]
+    )
+    if parquet:
+        import pyarrow.parquet as pq
+
+        writer = pq.ParquetWriter(out, schema)
+    else:
+        writer = pa.ipc.new_file(out, schema)
+    count = 0
+    with writer:
+        for chunk in _chunks(rows):
+            writer.write_table(pa.Table.from_batches([_batch(pa, schema, chunk)]))
+            count += len(chunk)
+    return count
+
+
+def check_format(fmt: str) -> None:
+    """raise ExportError if ``fmt`` cannot be written, before any output
+    file is created
+    """
+    if fmt not in FORMATS:
+        raise ExportError("unknown export format " + fmt)
+    if fmt not in TEXT_FORMATS:
+        _pyarrow()
+
+
+def export(rows: Iterable[Row], fmt: str, out: Any) -> int:
+    """write ``rows`` to ``out`` in format ``fmt``, a text stream for the
+    text formats and a binary one for the others
+    """
+    if fmt == "ndjson":
+        return write_ndjson(rows, out)
+    if fmt == "csv":
+        return write_csv(rows, out)
+    if fmt in ("arrow", "parquet"):
+        return write_arrow(rows, out, parquet=fmt == "parquet")
+    raise ExportError("unknown export format " + fmt)
@@ -0,0 +1,249 @@
+"""Long term history of tracked sessions in a local SQLite database.
+
+Every finished or skipped session is stored as one row of ``sessions``.
+Rollup tables bucketed by local day and by hour of day are kept up to date
+by triggers as rows are inserted, so aggregate queries read a few hundred
+rollup rows instead of scanning years of sessions.
+"""
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Iterable, Iterator
+
+if TYPE_CHECKING:  # pragma: no cover
+    import sqlite3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    started_at REAL NOT NULL,
+    ended_at REAL NOT NULL,
+    session_type TEXT NOT NULL,
+    planned REAL NOT NULL,
+    status TEXT NOT NULL,
+    project TEXT NOT NULL DEFAULT '',
+    -- counted from 1 as shown to the user; NULL in older databases
+    round INTEGER,
+    session INTEGER,
+    -- seconds actually spent, pauses excluded; NULL if not measured
+    spent REAL
+);
+CREATE INDEX IF NOT EXISTS sessions_started_at ON sessions (started_at);
+
+CREATE TABLE IF NOT EXISTS daily (
+    day TEXT NOT NULL,
+    project TEXT NOT NULL,
+    session_type TEXT NOT NULL,
+    seconds REAL NOT NULL,
+    done INTEGER NOT NULL,
+    skipped INTEGER NOT NULL,
+    PRIMARY KEY (day, project, session_type)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS hourly (
+    hour INTEGER NOT NULL,
+    project TEXT NOT NULL,
+    session_type TEXT NOT NULL,
+    done INTEGER NOT NULL,
+    skipped INTEGER NOT NULL,
+    PRIMARY KEY (hour, project, session_type)
+) WITHOUT ROWID;
+
+CREATE TRIGGER IF NOT EXISTS sessions_rollup AFTER INSERT ON sessions
+BEGIN
+    INSERT INTO daily VALUES (
+        date(NEW.started_at, 'unixepoch', 'localtime'),
+        NEW.project,
+        NEW.session_type,
+        COALESCE(NEW.spent, NEW.ended_at - NEW.started_at),
+        NEW.status = 'done',
+        NEW.status = 'skipped'
+    )
+    ON CONFLICT (day, project, session_type) DO UPDATE SET
+        seconds = seconds + excluded.seconds,
+        done = done + excluded.done,
+        skipped = skipped + excluded.skipped;
+    INSERT INTO hourly VALUES (
+        CAST(strftime('%H', NEW.started_at, 'unixepoch', 'localtime') AS INTEGER),
+        NEW.project,
+        NEW.session_type,
+        NEW.status = 'done',
+        NEW.status = 'skipped'
+    )
+    ON CONFLICT (hour, project, session_type) DO UPDATE SET
+        done = done + excluded.done,
+        skipped = skipped + excluded.skipped;
+END;
+"""
+
+# columns added after the first release, with their type
+COLUMNS = (("round", "INTEGER"), ("session", "INTEGER"), ("spent", "REAL"))
+
+# SQL expression of the bucket for each grouping of focus minutes
+BUCKETS = {
+    "day": "day",
+    "week": "strftime('%Y-W%W', day)",
+    "month": "substr(day, 1, 7)",
+    "project": "project",
+}
+
+# (started_at, ended_at, session_type, planned minutes, status, project,
+#  round, session)
+Row = tuple[float, float, str, float, str, str, "int | None", "int | None"]
+# rows fetched at once when streaming the sessions
+CHUNK = 1024
+
+
+def default_path() -> str:
+    """database location under $XDG_DATA_HOME (~/.local/share)"""
+    data = os.environ.get("XDG_DATA_HOME") or os.path.join(
+        os.path.expanduser("~"), ".local", "share"
+    )
+    return os.path.join(data, "focusedme", "history.sqlite3")
+
+
+@dataclass
+class History:
+    """store of past sessions and the queries made over it"""
+
+    path: str = field(default_factory=default_path)
+    # project recorded with the sessions of this process
+    project: str = ""
+
+    # non init attributes
+    _db: sqlite3.Connection | None = field(default=None, repr=False)
+
+    def __connect(self) -> sqlite3.Connection:
+        if self._db is None:
+            import sqlite3
+
+            if self.path != ":memory:":
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._db = db = sqlite3.connect(self.path)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.executescript(SCHEMA)
+            columns = {c[1] for c in db.execute("PRAGMA table_info(sessions)")}
+            for column, kind in COLUMNS:
+                if column not in columns:
+                    db.execute(f"ALTER TABLE sessions ADD COLUMN {column} {kind}")
+            if "spent" not in columns:
+                # the rollup trigger of older databases ignores the column
+                db.execute("DROP TRIGGER sessions_rollup")
+                db.executescript(SCHEMA)
+        return self._db
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def record(
+        self,
+        session_type: str,
+        started_at: float,
+        ended_at: float,
+        planned: float,
+        status: str,
+        num_round: int | None = None,
+        num_session: int | None = None,
+        spent: float | None = None,
+    ) -> None:
+        """store one session; times are seconds since the epoch, ``planned``
+        is the configured length in minutes and ``spent`` the seconds
+        actually spent in it, which defaults to the time from start to end
+        """
+        row = (started_at, ended_at, session_type, planned, status, self.project)
+        db = self.__connect()
+        with db:
+            db.execute(
+                "INSERT INTO sessions (started_at, ended_at, session_type,"
+                " planned, status, project, round, session, spent)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                row + (num_round, num_session, spent),
+            )
+
+    def record_many(self, rows: Iterable[Row]) -> None:
+        """store many sessions in a single transaction, spent from start
+        to end
+        """
+        db = self.__connect()
+        with db:
+            db.executemany(
+                "INSERT INTO sessions (started_at, ended_at, session_type,"
+                " planned, status, project, round, session)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    def sessions(self, since: str = "", project: str | None = None) -> Iterator[Row]:
+        """stream the stored sessions in the order they started, from the
+        local date ``since`` (YYYY-MM-DD) on, ``CHUNK`` rows at a time
+        """
+        query = (
+            "SELECT started_at, ended_at, session_type, planned, status, project,"
+            " round, session FROM sessions WHERE started_at >= ?"
+        )
+        params: list[float | str] = [_local_timestamp(since)]
+        if project is not None:
+            query += " AND project = ?"
+            params.append(project)
+        cursor = self.__connect().execute(query + " ORDER BY started_at", params)
+        while True:
+            rows = cursor.fetchmany(CHUNK)
+            if not rows:
+                return
+            yield from rows
+
+    def focus_minutes(
+        self, by: str = "day", since: str = "", project: str | None = None
+    ) -> list[tuple[str, float]]:
+        """total focused minutes per day, week, month or project, from the
+        local date ``since`` (YYYY-MM-DD) on
+        """
+        bucket = BUCKETS[by]
+        query = (
+            f"SELECT {bucket} AS bucket, SUM(seconds) / 60.0 FROM daily"
+            " WHERE session_type = 'focus_time' AND day >= ?"
+        )
+        params: list[str] = [since]
+        if project is not None:
+            query += " AND project = ?"
+            params.append(project)
+        query += " GROUP BY bucket ORDER BY bucket"
+        return self.__connect().execute(query, params).fetchall()
+
+    def skip_rate_by_hour(self, project: str | None = None) -> list[tuple[int, float]]:
+        """share of focus sessions skipped, by local hour they started at"""
+        query = (
+            "SELECT hour, CAST(SUM(skipped) AS REAL) / SUM(done + skipped)"
+            " FROM hourly WHERE session_type = 'focus_time'"
+        )
+        params: list[str] = []
+        if project is not None:
+            query += " AND project = ?"
+            params.append(project)
+        query += " GROUP BY hour ORDER BY hour"
+        return self.__connect().execute(query, params).fetchall()
+
+
+def _local_timestamp(day: str) -> float:
+    """seconds since the epoch at local midnight of ``day``, 0 if empty"""
+    if not day:
+        return 0.0
+    import time
+
+    return time.mktime(time.strptime(day, "%Y-%m-%d"))
+
+
+def show_stats(history: History, by: str, since: str, project: str | None) -> None:
+    """print a stats report to the terminal"""
+    if by == "hour":
+        print("Skipped focus sessions by hour of day:")
+        for hour, rate in history.skip_rate_by_hour(project):
+            print("   {:02}h  {:5.1f}%".format(hour, 100 * rate))
+        return
+    print("Focus minutes by {}:".format(by))
+    for bucket, minutes in history.focus_minutes(by, since, project):
+        print("   {:<12} {:8.0f} min".format(bucket or "(none)", minutes))
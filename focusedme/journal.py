@@ -0,0 +1,257 @@
+"""Append-only journal of session transitions.
+
+Every transition of a tracked schedule is appended to a binary file as one
+fixed-size record, so that a tracker killed halfway through a session can
+be rebuilt at the same round and session, with the same remaining time,
+the next time focusedme starts.
+Records are only ever appended; recovery reads the file backwards from the
+end and stops at the beginning of the last run, so its cost does not grow
+with the length of the history.
+"""
+
+from __future__ import annotations
+
+import os
+import struct
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Iterable, Iterator, NamedTuple, Tuple
+
+if TYPE_CHECKING:  # pragma: no cover
+    from focusedme.__main__ import Tracker
+
+# event codes
+RUN = 0  # a new schedule: round holds num_rounds, lengths the session lengths
+STARTED = 1
+DONE = 2
+END = 3  # the schedule was finished or abandoned on purpose
+PAUSED = 4
+RESUMED = 5
+
+# wall clock time, event, session index, round index, three lengths in minutes
+RECORD = struct.Struct("<dBBIfff")
+# records read at once when scanning the journal backwards
+CHUNK = 256
+
+LENGTH_KEYS = ("focus_time", "short_break", "long_break")
+
+
+class Record(NamedTuple):
+    timestamp: float
+    event: int
+    session: int
+    round: int
+    lengths: tuple[float, float, float]
+
+
+# record of a session, "done", "skipped" or "running", and the seconds
+# spent in it, pauses excluded
+Session = Tuple[Record, str, float]
+
+
+def _lengths(time_args: dict[str, int]) -> tuple[float, float, float]:
+    """session lengths as they read back from a record"""
+    packed = struct.pack("<fff", *(time_args[key] for key in LENGTH_KEYS))
+    focus, short, long = struct.unpack("<fff", packed)
+    return focus, short, long
+
+
+def _spent(started: Record, pauses: list[Record], until: float) -> float:
+    """seconds from the ``started`` record to the wall clock time ``until``,
+    without the time between the PAUSED and RESUMED records in ``pauses``
+    """
+    spent = 0.0
+    since: float | None = started.timestamp
+    for record in pauses:
+        if record.event == PAUSED and since is not None:
+            spent += record.timestamp - since
+            since = None
+        elif record.event == RESUMED and since is None:
+            since = record.timestamp
+    if since is not None:
+        spent += until - since
+    return max(spent, 0.0)
+
+
+def replay(records: Iterable[Record], until: float) -> Iterator[Session]:
+    """the sessions of a run in the order they started, from its records
+    oldest first; the last one is running if it was left unfinished
+    """
+    pending: Record | None = None
+    # pauses of the pending session
+    pauses: list[Record] = []
+    for record in records:
+        if record.event in (PAUSED, RESUMED):
+            pauses.append(record)
+            continue
+        if pending is not None and record.event == DONE:
+            yield record, "done", _spent(pending, pauses, record.timestamp)
+        elif pending is not None:
+            # a new session started before the last one was done
+            yield pending, "skipped", _spent(pending, pauses, record.timestamp)
+        pending = record if record.event == STARTED else None
+        pauses = []
+    if pending is not None:
+        # a pause left open by a crash lasts until ``until``
+        yield pending, "running", _spent(pending, pauses, until)
+
+
+def default_path() -> str:
+    """journal location under $XDG_STATE_HOME (~/.local/state)"""
+    state = os.environ.get("XDG_STATE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".local", "state"
+    )
+    return os.path.join(state, "focusedme", "journal.bin")
+
+
+@dataclass
+class Journal:
+    """write side and recovery of the session journal"""
+
+    path: str = field(default_factory=default_path)
+    # seconds between two fsync calls; every record still reaches the OS
+    # as soon as it is written, so only a power loss can lose it
+    fsync_interval: float = 5.0
+    # False leaves every fsync to the owner, see detach()
+    auto_sync: bool = True
+
+    # non init attributes
+    _fd: int | None = field(default=None, repr=False)
+    _synced_at: float = field(default=0.0, repr=False)
+    _dirty: bool = field(default=False, repr=False)
+
+    def __append(
+        self,
+        event: int,
+        round_idx: int,
+        session_idx: int = 0,
+        lengths: tuple[float, float, float] = (0.0, 0.0, 0.0),
+    ) -> None:
+        if self._fd is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            flags = os.O_WRONLY | os.O_APPEND | os.O_CREAT
+            self._fd = os.open(self.path, flags, 0o644)
+        record = RECORD.pack(time.time(), event, session_idx, round_idx, *lengths)
+        os.write(self._fd, record)
+        self._dirty = True
+        if not self.auto_sync:
+            return
+        now = time.monotonic()
+        if event in (RUN, END) or now - self._synced_at >= self.fsync_interval:
+            self.sync()
+
+    def sync(self) -> None:
+        """flush written records to stable storage"""
+        if self._fd is not None and self._dirty:
+            os.fsync(self._fd)
+            self._dirty = False
+        self._synced_at = time.monotonic()
+
+    def close(self) -> None:
+        if self._fd is not None:
+            self.sync()
+            os.close(self._fd)
+            self._fd = None
+
+    def detach(self) -> int | None:
+        """hand over the open file descriptor, if any, for the caller to
+        fsync and close; the next record opens the file again
+        """
+        fd, self._fd = self._fd, None
+        self._dirty = False
+        return fd
+
+    def begin(self, time_args: dict[str, int]) -> None:
+        """record the start of a new schedule"""
+        self.__append(RUN, time_args["num_rounds"], 0, _lengths(time_args))
+
+    def started(self, round_idx: int, session_idx: int) -> None:
+        self.__append(STARTED, round_idx, session_idx)
+
+    def done(self, round_idx: int, session_idx: int) -> None:
+        self.__append(DONE, round_idx, session_idx)
+
+    def paused(self, round_idx: int, session_idx: int) -> None:
+        self.__append(PAUSED, round_idx, session_idx)
+
+    def resumed(self, round_idx: int, session_idx: int) -> None:
+        self.__append(RESUMED, round_idx, session_idx)
+
+    def end(self) -> None:
+        """record that the schedule must not be resumed"""
+        self.__append(END, 0)
+
+    def records(self) -> Iterator[Record]:
+        """iterate over the journal from the newest record to the oldest"""
+        try:
+            f = open(self.path, "rb")
+        except FileNotFoundError:
+            return
+        with f:
+            end = f.seek(0, os.SEEK_END)
+            # ignore a record torn by a crash in the middle of a write
+            end -= end % RECORD.size
+            while end > 0:
+                start = max(0, end - CHUNK * RECORD.size)
+                f.seek(start)
+                chunk = f.read(end - start)
+                for offset in range(len(chunk) - RECORD.size, -1, -RECORD.size):
+                    ts, event, session, round_idx, *lengths = RECORD.unpack_from(
+                        chunk, offset
+                    )
+                    yield Record(ts, event, session, round_idx, tuple(lengths))
+                end = start
+
+    def last_run(self) -> tuple[Record, list[Record]] | None:
+        """return the RUN record of an unfinished schedule and the records
+        written after it, oldest first; None if there is nothing to resume.
+        A run left alone for longer than its longest session is stale and
+        not resumed either.
+        """
+        tail: list[Record] = []
+        for record in self.records():
+            if record.event == END:
+                return None
+            if record.event == RUN:
+                last = tail[0] if tail else record
+                if time.time() - last.timestamp > 60 * max(record.lengths):
+                    return None
+                tail.reverse()
+                return record, tail
+            tail.append(record)
+        return None
+
+    def resumable(self, time_args: dict[str, int]) -> list[Record] | None:
+        """the records of the last unfinished run, oldest first, if it was
+        made with the same ``time_args``; None if there is none
+        """
+        found = self.last_run()
+        if found is None:
+            return None
+        run, records = found
+        if run.round != time_args["num_rounds"] or run.lengths != _lengths(time_args):
+            return None
+        return records
+
+    def restore(self, tracker: Tracker, time_args: dict[str, int]) -> bool:
+        """rebuild the state of ``tracker`` from the last unfinished run if
+        it was made with the same ``time_args``. Return True if it was.
+        """
+        records = self.resumable(time_args)
+        if records is None:
+            return False
+        for record, status, spent in replay(records, time.time()):
+            cur_round = tracker.round_at(record.round)
+            if cur_round is None:
+                return False
+            tracker.current_round_idx = record.round
+            cur_round.current_session_idx = record.session
+            if status == "running":
+                tracker.elapsed = spent
+                continue
+            cur_round.update_session(status)
+            session = cur_round.sessions[record.session]
+            if status == "done":
+                spent = 60.0 * session.length
+            tracker.log.record(record.round, session.session_type, status, spent)
+        return True
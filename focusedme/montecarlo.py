@@ -0,0 +1,269 @@
+"""Monte Carlo comparison of schedules.
+
+``focusedme simulate`` runs a schedule many times, one simulated day each,
+through the real ``Round`` and ``Tracker`` code on a virtual clock. A
+random ``Behaviour`` interrupts the sessions the way Ctrl+C does: the
+tracker pauses, and the simulated person then resumes after a while, skips
+the session or quits for the day. The focused minutes of every day are
+reduced into a distribution per schedule.
+
+Days are simulated in chunks spread over a process pool. Each chunk has its
+own seed, so the results do not depend on the number of workers, and
+workers only send back small counters. The work therefore scales with the
+number of cores.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import math
+import random
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Iterator
+
+from focusedme.__main__ import SECONDS_PER_MIN, Log, Round, Tracker
+from focusedme.schedule import Schedule
+from focusedme.util import VirtualClock
+
+# letters of the session types in a template, e.g. "FSFSFSFL"
+TEMPLATE_LETTERS = {"F": "focus_time", "S": "short_break", "L": "long_break"}
+# days simulated by a worker at a time
+CHUNK_DAYS = 2_000
+PERCENTILES = (10.0, 50.0, 90.0)
+
+
+@dataclass(frozen=True)
+class Behaviour:
+    """how a simulated person interrupts their sessions"""
+
+    # chance that a session, or what is left of it after a pause, is
+    # interrupted at some uniformly random point
+    interrupt: float = 0.2
+    # chance that an interruption ends the day
+    quit: float = 0.05
+    # chance that the interrupted session is skipped rather than resumed
+    skip: float = 0.5
+    # mean minutes away before resuming, exponentially distributed
+    pause: float = 3.0
+
+    def __post_init__(self) -> None:
+        for name in ("interrupt", "quit", "skip"):
+            if not 0 <= getattr(self, name) <= 1:
+                raise ValueError(name + " must be a probability between 0 and 1")
+        if self.pause <= 0:
+            raise ValueError("pause must be a positive number of minutes")
+
+
+@dataclass(frozen=True)
+class Plan:
+    """a schedule to simulate: session lengths, rounds and round template"""
+
+    focus_time: int
+    short_break: int
+    long_break: int
+    num_rounds: int
+    template: tuple[str, ...] = Round.round_template
+
+    def __post_init__(self) -> None:
+        if self.num_rounds <= 0:
+            raise ValueError("an endless schedule can not be simulated")
+        if not self.template:
+            raise ValueError("a round needs at least one session")
+
+    @classmethod
+    def parse(cls, spec: str) -> Plan:
+        """read "FOCUS,SHORT,LONG,ROUNDS[:TEMPLATE]", e.g. "50,10,30,2:FSFL" """
+        lengths, _, letters = spec.partition(":")
+        try:
+            focus, short, long, rounds = (int(v) for v in lengths.split(","))
+        except ValueError:
+            raise ValueError(
+                "expected FOCUS,SHORT,LONG,ROUNDS[:TEMPLATE], got " + spec
+            ) from None
+        plan = cls(focus, short, long, rounds)
+        if letters:
+            try:
+                template = tuple(TEMPLATE_LETTERS[c] for c in letters.upper())
+            except KeyError:
+                raise ValueError(
+                    "a template is made of F, S and L, got " + letters
+                ) from None
+            plan = dataclasses.replace(plan, template=template)
+        return plan
+
+    def time_args(self) -> dict[str, int]:
+        return {
+            "focus_time": self.focus_time,
+            "short_break": self.short_break,
+            "long_break": self.long_break,
+            "num_rounds": self.num_rounds,
+        }
+
+    def label(self) -> str:
+        letters = {name: letter for letter, name in TEMPLATE_LETTERS.items()}
+        return "{},{},{},{}:{}".format(
+            self.focus_time,
+            self.short_break,
+            self.long_break,
+            self.num_rounds,
+            "".join(letters[t] for t in self.template),
+        )
+
+
+@dataclass
+class Distribution:
+    """focused minutes of the simulated days of one plan"""
+
+    # number of days per whole number of focused minutes
+    minutes: Counter[int] = field(default_factory=Counter)
+    days: int = 0
+    focused: float = 0.0  # minutes
+    completed: int = 0  # focus sessions
+    length: float = 0.0  # minutes from the first session to the end of the day
+
+    def add(self, focused: float, completed: int, length: float) -> None:
+        self.minutes[round(focused)] += 1
+        self.days += 1
+        self.focused += focused
+        self.completed += completed
+        self.length += length
+
+    def merge(self, other: Distribution) -> None:
+        self.minutes.update(other.minutes)
+        self.days += other.days
+        self.focused += other.focused
+        self.completed += other.completed
+        self.length += other.length
+
+    def mean(self) -> float:
+        return self.focused / self.days if self.days else 0.0
+
+    def percentile(self, percent: float) -> int:
+        """focused minutes reached or exceeded by ``100 - percent`` % of days"""
+        rank = max(1, math.ceil(self.days * percent / 100))
+        seen = 0
+        for minutes in sorted(self.minutes):
+            seen += self.minutes[minutes]
+            if seen >= rank:
+                return minutes
+        return 0
+
+
+class _Person(VirtualClock):
+    """virtual clock whose sleeps are cut short by interruptions"""
+
+    def __init__(self, behaviour: Behaviour, rng: random.Random) -> None:
+        super().__init__()
+        self.behaviour = behaviour
+        self.rng = rng
+
+    def sleep(self, seconds: float) -> None:
+        # the tracker sleeps once per stretch of a session when nothing is
+        # shown, so this is where a stretch gets interrupted
+        if seconds > 1 and self.rng.random() < self.behaviour.interrupt:
+            self.now += self.rng.random() * seconds
+            raise KeyboardInterrupt
+        self.now += max(0.0, seconds)
+
+
+def simulate_day(
+    plan: Plan, behaviour: Behaviour, rng: random.Random
+) -> tuple[float, int, float]:
+    """run the schedule once; return the minutes focused, the focus sessions
+    completed and the minutes the day lasted
+    """
+    time_args = plan.time_args()
+    schedule = Schedule.from_template(time_args, plan.num_rounds, plan.template)
+    rounds = [Round(time_args, schedule.views(i)) for i in range(plan.num_rounds)]
+    person = _Person(behaviour, rng)
+    tracker = Tracker(rounds, Log(), clock=person.monotonic, sleep=person.sleep)
+    sound_args = {"sound": "", "path": ""}
+    while True:
+        try:
+            tracker.start(None, sound_args)
+            break
+        except KeyboardInterrupt:
+            # the menu of View.run, answered at random
+            if rng.random() < behaviour.quit:
+                tracker.skip()
+                break
+            if rng.random() < behaviour.skip:
+                tracker.skip()
+            else:
+                person.now += rng.expovariate(1 / behaviour.pause) * SECONDS_PER_MIN
+    total = tracker.log.total
+    return (
+        total.focus_seconds / SECONDS_PER_MIN,
+        total.focus_done,
+        person.now / SECONDS_PER_MIN,
+    )
+
+
+def simulate_days(
+    plan: Plan, behaviour: Behaviour, days: int, seed: int
+) -> Distribution:
+    """simulate ``days`` days with their own random generator"""
+    rng = random.Random(seed)
+    distribution = Distribution()
+    for _ in range(days):
+        distribution.add(*simulate_day(plan, behaviour, rng))
+    return distribution
+
+
+def _chunks(days: int, seed: int) -> Iterator[tuple[int, int]]:
+    """(days, seed) of every chunk"""
+    for index, first in enumerate(range(0, days, CHUNK_DAYS)):
+        yield min(CHUNK_DAYS, days - first), seed * 1_000_003 + index
+
+
+def monte_carlo(
+    plan: Plan,
+    behaviour: Behaviour,
+    days: int,
+    workers: int | None = None,
+    seed: int = 0,
+) -> Distribution:
+    """simulate ``days`` days of ``plan`` on ``workers`` processes, all the
+    cores by default, or in this process if ``workers`` is 1
+    """
+    chunks = list(_chunks(days, seed))
+    distribution = Distribution()
+    if workers == 1:
+        for n, chunk_seed in chunks:
+            distribution.merge(simulate_days(plan, behaviour, n, chunk_seed))
+        return distribution
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(workers) as executor:
+        for result in executor.map(
+            simulate_days,
+            [plan] * len(chunks),
+            [behaviour] * len(chunks),
+            [n for n, _ in chunks],
+            [s for _, s in chunks],
+        ):
+            distribution.merge(result)
+    return distribution
+
+
+def show_results(results: list[tuple[Plan, Distribution]]) -> None:
+    """print one line per plan"""
+    head = "{:<22} {:>9} {:>8} {:>6} {:>6} {:>6} {:>10} {:>10}"
+    print(
+        head.format("schedule", "days", "mean", "p10", "p50", "p90", "completed", "day")
+    )
+    for plan, dist in results:
+        print(
+            "{:<22} {:>9} {:>8.1f} {:>6} {:>6} {:>6} {:>10.2f} {:>10.1f}".format(
+                plan.label(),
+                dist.days,
+                dist.mean(),
+                *(dist.percentile(p) for p in PERCENTILES),
+                dist.completed / dist.days if dist.days else 0.0,
+                dist.length / dist.days if dist.days else 0.0,
+            )
+        )
+    print("[focused minutes per day; completed focus sessions and day length")
+    print(" in minutes are means]")
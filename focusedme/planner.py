@@ -0,0 +1,280 @@
+"""Bulk planning of the sessions of days or weeks.
+
+``plan()`` lays the round template out over working hours, around blocks
+such as lunch, and returns the start and end of every session as columns
+of a ``Timetable``, ready to be written as CSV or iCalendar. No ``Round`` or
+``Session`` object is built: one working day is planned from the cumulative
+sums of the template, and every other day is that day shifted to its own
+start, added to all the sessions of all the days at once. With NumPy
+installed the columns are NumPy arrays and the shift is a single outer sum;
+without it they are plain arrays built by the same steps in Python.
+
+Every day starts again at the first session of the first round and runs
+``num_rounds`` rounds, or until the end of the working hours if it is 0.
+A session that does not fit before a block starts after it; one that does
+not fit before the end of the day is left out, as the next day starts over.
+"""
+
+from __future__ import annotations
+
+import bisect
+import datetime
+import itertools
+import time
+from array import array
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Iterator, Sequence, TextIO
+
+from focusedme.__main__ import SECONDS_PER_MIN, Round
+from focusedme.schedule import LABELS, TYPE_CODES, TYPE_NAMES
+
+if TYPE_CHECKING:  # pragma: no cover
+    import numpy
+
+TEMPLATE = Round.round_template
+WEEKDAYS = (0, 1, 2, 3, 4)
+FIELDS = ("start", "end", "session_type", "round", "session")
+
+
+def _numpy() -> Any:
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def clock_time(text: str) -> datetime.time:
+    """read "HH:MM" """
+    try:
+        hours, minutes = (int(v) for v in text.split(":"))
+        return datetime.time(hours, minutes)
+    except ValueError:
+        raise ValueError("expected a time of day as HH:MM, got " + text) from None
+
+
+def _seconds(value: datetime.time) -> int:
+    return value.hour * 3600 + value.minute * 60
+
+
+@dataclass
+class Timetable:
+    """sessions as columns, one row per session in time order"""
+
+    # wall clock times in seconds since the epoch
+    start: array[float] | numpy.ndarray
+    end: array[float] | numpy.ndarray
+    # codes of schedule.SessionType
+    kind: bytearray | numpy.ndarray
+    # counted from 0 within each day
+    round: array[int] | numpy.ndarray
+    session: array[int] | numpy.ndarray
+
+    def __len__(self) -> int:
+        return len(self.start)
+
+    def rows(self) -> Iterator[tuple[float, float, str, int, int]]:
+        """(start, end, session type, round, session) of every session, with
+        the round and session counted from 1 as shown to the user
+        """
+        columns = [self.start, self.end, self.kind, self.round, self.session]
+        # NumPy scalars are slow to format, convert them in one go
+        columns = [c.tolist() if hasattr(c, "tolist") else c for c in columns]
+        for start, end, kind, r, s in zip(*columns):
+            yield start, end, TYPE_NAMES[kind], r + 1, s + 1
+
+
+def working_windows(
+    hours: tuple[datetime.time, datetime.time],
+    blocks: Sequence[tuple[datetime.time, datetime.time]],
+) -> list[tuple[int, int]]:
+    """the working hours minus the blocks, in seconds from the start of the
+    working day
+    """
+    first, last = _seconds(hours[0]), _seconds(hours[1])
+    if last <= first:
+        raise ValueError("the working hours must end after they start")
+    windows = []
+    cursor = first
+    for block_start, block_end in sorted((_seconds(a), _seconds(b)) for a, b in blocks):
+        if block_end <= block_start:
+            raise ValueError("a block must end after it starts")
+        if block_start > cursor:
+            windows.append((cursor, min(block_start, last)))
+        cursor = max(cursor, block_end)
+    if cursor < last:
+        windows.append((cursor, last))
+    return [(a - first, b - first) for a, b in windows if b > a]
+
+
+def plan_day(
+    time_args: dict[str, int],
+    windows: Sequence[tuple[int, int]],
+    template: Sequence[str] = TEMPLATE,
+    earliest: float = 0.0,
+) -> tuple[list[float], list[float], list[int]]:
+    """starts, ends and indexes in the day of the sessions of one working
+    day, in seconds from its start; nothing starts before ``earliest``
+    """
+    lengths = [time_args[t] * SECONDS_PER_MIN for t in template]
+    if min(lengths) <= 0:
+        raise ValueError("every session must last at least a minute")
+    available = sum(b - a for a, b in windows)
+    limit = time_args["num_rounds"] * len(template)
+    if not limit:
+        # as many sessions as could possibly fit in the day
+        limit = int(available // min(lengths)) + len(windows)
+    # cumulative ends of the sessions of the day, were they back to back
+    pattern = itertools.islice(itertools.cycle(lengths), limit)
+    ends = list(itertools.accumulate(pattern))
+    starts: list[float] = []
+    stops: list[float] = []
+    indexes: list[int] = []
+    index = 0
+    for opens, last in windows:
+        first = max(opens, earliest)
+        if index == limit or first >= last:
+            continue
+        # sessions index.. end before ``last`` when the window starts with
+        # session ``index``
+        offset = first - (ends[index - 1] if index else 0)
+        count = bisect.bisect_right(ends, last - offset, index) - index
+        for i in range(index, index + count):
+            stops.append(ends[i] + offset)
+            starts.append(stops[-1] - lengths[i % len(lengths)])
+            indexes.append(i)
+        index += count
+    return starts, stops, indexes
+
+
+def _day_starts(
+    start: datetime.datetime,
+    days: int,
+    hours: tuple[datetime.time, datetime.time],
+    weekdays: Sequence[int],
+) -> list[float]:
+    """wall clock times at which the working days start"""
+    origins = []
+    for n in range(days):
+        date = start.date() + datetime.timedelta(days=n)
+        if date.weekday() in weekdays:
+            # each day from its own local time, which keeps the hours right
+            # across daylight saving time changes
+            origins.append(datetime.datetime.combine(date, hours[0]).timestamp())
+    return origins
+
+
+def _columns(
+    origins: list[float],
+    day: tuple[list[float], list[float], list[int]],
+    template: Sequence[str],
+    np: Any,
+) -> Timetable:
+    """the sessions of ``day`` repeated from each of ``origins``"""
+    starts, ends, indexes = day
+    codes = [TYPE_CODES[template[i % len(template)]] for i in indexes]
+    size = len(template)
+    if np is not None:
+        origin = np.array(origins, dtype=np.float64)
+        position = np.array(indexes, dtype=np.int32)
+        return Timetable(
+            np.add.outer(origin, np.array(starts, dtype=np.float64)).ravel(),
+            np.add.outer(origin, np.array(ends, dtype=np.float64)).ravel(),
+            np.tile(np.array(codes, dtype=np.uint8), len(origins)),
+            np.tile(position // size, len(origins)),
+            np.tile(position % size, len(origins)),
+        )
+    return Timetable(
+        array("d", [o + s for o in origins for s in starts]),
+        array("d", [o + e for o in origins for e in ends]),
+        bytearray(codes) * len(origins),
+        array("i", [i // size for i in indexes]) * len(origins),
+        array("i", [i % size for i in indexes]) * len(origins),
+    )
+
+
+def plan(
+    time_args: dict[str, int],
+    start: datetime.datetime,
+    days: int = 5,
+    hours: tuple[datetime.time, datetime.time] = (
+        datetime.time(9),
+        datetime.time(17),
+    ),
+    blocks: Sequence[tuple[datetime.time, datetime.time]] = (
+        (datetime.time(12), datetime.time(13)),
+    ),
+    weekdays: Sequence[int] = WEEKDAYS,
+    template: Sequence[str] = TEMPLATE,
+) -> Timetable:
+    """plan the sessions of ``days`` calendar days from ``start``, a naive
+    local time, working on ``weekdays`` (Monday is 0) within ``hours``
+    and outside ``blocks``
+    """
+    windows = working_windows(hours, blocks)
+    origins = _day_starts(start, days, hours, weekdays)
+    day = plan_day(time_args, windows, template)
+    np = _numpy()
+    if not origins or origins[0] >= start.timestamp():
+        return _columns(origins, day, template, np)
+
+    # the first day is already under way: it starts from ``start``
+    earliest = start.timestamp() - origins[0]
+    first_day = plan_day(time_args, windows, template, earliest)
+    first = _columns(origins[:1], first_day, template, np)
+    rest = _columns(origins[1:], day, template, np)
+    join = np.concatenate if np is not None else lambda parts: parts[0] + parts[1]
+    return Timetable(
+        *(
+            join([getattr(first, name), getattr(rest, name)])
+            for name in ("start", "end", "kind", "round", "session")
+        )
+    )
+
+
+def write_csv(table: Timetable, out: TextIO) -> int:
+    """write a header and one line per session, in local time; return the
+    number of sessions
+    """
+    import csv
+
+    fromtimestamp = datetime.datetime.fromtimestamp
+    writer = csv.writer(out, lineterminator="\n")
+    writer.writerow(FIELDS)
+    writer.writerows(
+        (fromtimestamp(start).isoformat(), fromtimestamp(end).isoformat(), *rest)
+        for start, end, *rest in table.rows()
+    )
+    return len(table)
+
+
+def _ics_time(timestamp: float) -> str:
+    return datetime.datetime.fromtimestamp(timestamp, datetime.timezone.utc).strftime(
+        "%Y%m%dT%H%M%SZ"
+    )
+
+
+def write_ics(table: Timetable, out: TextIO, breaks: bool = True) -> int:
+    """write an iCalendar file with an event per session, the breaks too
+    unless ``breaks`` is False; return the number of events
+    """
+    stamp = _ics_time(time.time())
+    out.write("BEGIN:VCALENDAR\r\nVERSION:2.0\r\n")
+    out.write("PRODID:-//focusedme//planner//EN\r\n")
+    count = 0
+    for start, end, session_type, r, s in table.rows():
+        if not breaks and session_type != "focus_time":
+            continue
+        dtstart = _ics_time(start)
+        out.write(
+            "BEGIN:VEVENT\r\n"
+            f"UID:{dtstart}-{r}-{s}@focusedme\r\n"
+            f"DTSTAMP:{stamp}\r\n"
+            f"DTSTART:{dtstart}\r\n"
+            f"DTEND:{_ics_time(end)}\r\n"
+            f"SUMMARY:{LABELS.get(session_type, session_type)} {r}/{s}\r\n"
+            "END:VEVENT\r\n"
+        )
+        count += 1
+    out.write("END:VCALENDAR\r\n")
+    return count
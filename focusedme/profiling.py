@@ -0,0 +1,175 @@
+"""Optional instrumentation of the timer hot paths.
+
+Enabled with ``--profile`` or by setting ``FOCUSEDME_PROFILE``; when it is
+off ``PROFILER`` is None and every hook is a single attribute check.
+Durations are kept in HDR-style histograms: counts live in a fixed array of
+log-linear buckets, two significant digits wide, so memory does not grow
+with the number of samples. The histograms are written to stderr at exit,
+and on SIGUSR1 where the platform has it.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import time
+from array import array
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Callable, TextIO
+
+from focusedme.util import as_bool
+
+if TYPE_CHECKING:  # pragma: no cover
+    from typing import TypeVar
+
+    # typing.ParamSpec is new in Python 3.10
+    from typing_extensions import ParamSpec
+
+    P = ParamSpec("P")
+    R = TypeVar("R")
+
+ENV_VAR = "FOCUSEDME_PROFILE"
+
+# 2**SUB_BITS buckets per power of two once values exceed 2**SUB_BITS
+SUB_BITS = 7
+HALF = 1 << (SUB_BITS - 1)
+# values are microseconds, clamped to about 19 hours
+MAX_VALUE = (1 << 36) - 1
+NUM_BUCKETS = ((MAX_VALUE.bit_length() - SUB_BITS) << (SUB_BITS - 1)) + (1 << SUB_BITS)
+PERCENTILES = (50.0, 90.0, 99.0, 99.9)
+
+
+def _bucket(value: int) -> int:
+    shift = value.bit_length() - SUB_BITS
+    if shift <= 0:
+        return value
+    return (shift << (SUB_BITS - 1)) + (value >> shift)
+
+
+def _bucket_range(index: int) -> tuple[int, int]:
+    """lowest and highest value counted in bucket ``index``"""
+    if index < 1 << SUB_BITS:
+        return index, index
+    shift = index // HALF - 1
+    low = (index - shift * HALF) << shift
+    return low, low + (1 << shift) - 1
+
+
+@dataclass
+class Histogram:
+    """durations in microseconds, recorded with about 1% precision"""
+
+    name: str
+    counts: array[int] = field(
+        default_factory=lambda: array("Q", bytes(8 * NUM_BUCKETS)), repr=False
+    )
+    count: int = 0
+    total: int = 0
+    min: int = MAX_VALUE
+    max: int = 0
+
+    def record(self, seconds: float) -> None:
+        value = min(max(int(seconds * 1e6), 0), MAX_VALUE)
+        self.counts[_bucket(value)] += 1
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, percent: float) -> int:
+        """highest value of the bucket holding the ``percent`` percentile"""
+        if not self.count:
+            return 0
+        rank = max(1, round(self.count * percent / 100))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return min(_bucket_range(index)[1], self.max)
+        return self.max
+
+    def summary(self) -> str:
+        if not self.count:
+            return f"{self.name:>14}: no samples"
+        cells = [f"n={self.count}", f"mean={self.total / self.count / 1e3:.3f}"]
+        cells += [f"p{p:g}={self.percentile(p) / 1e3:.3f}" for p in PERCENTILES]
+        cells.append(f"max={self.max / 1e3:.3f}")
+        return f"{self.name:>14}: " + " ".join(cells) + " ms"
+
+
+@dataclass
+class Profiler:
+    """histograms of the timer hot paths"""
+
+    # how late the tracker wakes up after each sleep
+    lateness: Histogram = field(default_factory=lambda: Histogram("tick lateness"))
+    # how long View.show_time takes to draw a frame
+    render: Histogram = field(default_factory=lambda: Histogram("render"))
+    # how long the tracker waits to hand a bell over to the player
+    bell_dispatch: Histogram = field(default_factory=lambda: Histogram("bell dispatch"))
+    # how long the player thread takes to start a bell
+    bell_playback: Histogram = field(default_factory=lambda: Histogram("bell playback"))
+
+    def histograms(self) -> list[Histogram]:
+        return [self.lateness, self.render, self.bell_dispatch, self.bell_playback]
+
+    def sleeper(
+        self, clock: Callable[[], float], sleep: Callable[[float], None]
+    ) -> Callable[[float], None]:
+        """wrap ``sleep`` to record how late it returns according to ``clock``"""
+
+        def timed_sleep(seconds: float) -> None:
+            wake_at = clock() + seconds
+            sleep(seconds)
+            self.lateness.record(clock() - wake_at)
+
+        return timed_sleep
+
+    def timed(self, histogram: Histogram, func: Callable[P, R]) -> Callable[P, R]:
+        """wrap ``func`` to record its duration in ``histogram``"""
+
+        def timed_func(*args: P.args, **kwargs: P.kwargs) -> R:
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                histogram.record(time.perf_counter() - started)
+
+        return timed_func
+
+    def dump(self, out: TextIO | None = None) -> None:
+        out = out or sys.stderr
+        out.write("\n".join(h.summary() for h in self.histograms()) + "\n")
+        out.flush()
+
+
+# the active profiler, None unless profiling is enabled
+PROFILER: Profiler | None = None
+
+
+def enable(dump_at_exit: bool = True) -> Profiler:
+    """start profiling, dumping the histograms at exit and on SIGUSR1"""
+    global PROFILER
+    if PROFILER is None:
+        PROFILER = Profiler()
+        if dump_at_exit:
+            import atexit
+            import signal
+
+            atexit.register(PROFILER.dump)
+            if hasattr(signal, "SIGUSR1"):
+                profiler = PROFILER
+                signal.signal(signal.SIGUSR1, lambda *_: profiler.dump())
+    return PROFILER
+
+
+def disable() -> None:
+    global PROFILER
+    PROFILER = None
+
+
+def requested() -> bool:
+    """whether profiling is asked for in the environment"""
+    return as_bool(os.environ.get(ENV_VAR, ""))
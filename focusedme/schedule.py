@@ -0,0 +1,251 @@
+"""Compact, column oriented storage of a schedule of sessions.
+
+A ``Schedule`` keeps one entry per session in flat ``array``/``bytearray``
+columns, with session types and statuses stored as one byte codes, instead
+of one ``Session`` object per session. ``SessionView`` exposes a row with
+the same attributes as ``Session`` so that ``Round`` and ``Tracker`` work on
+it unchanged; ``SessionLike`` is what they expect of either.
+
+A ``Timeline`` places the sessions on a clock: the deadlines of a round are
+precomputed once and every deadline of the schedule is derived from them
+and a single origin, which skipping and pausing move in constant time.
+"""
+
+from __future__ import annotations
+
+import bisect
+import math
+from array import array
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Protocol, Sequence, Tuple
+
+
+class SessionType(IntEnum):
+    FOCUS_TIME = 0
+    SHORT_BREAK = 1
+    LONG_BREAK = 2
+
+
+class Status(IntEnum):
+    NOT_STARTED = 0
+    SKIPPED = 1
+    DONE = 2
+
+
+# names used by Session, indexed by code
+TYPE_NAMES = tuple(t.name.lower() for t in SessionType)
+STATUS_NAMES = tuple(s.name.lower().replace("_", " ") for s in Status)
+TYPE_CODES = {name: code for code, name in enumerate(TYPE_NAMES)}
+STATUS_CODES = {name: code for code, name in enumerate(STATUS_NAMES)}
+# how the session types are shown
+LABELS = {
+    "focus_time": "FOCUS TIME",
+    "short_break": "SHORT BREAK",
+    "long_break": "LONG BREAK",
+}
+
+
+class SessionLike(Protocol):
+    """attributes of a session used by Round and Tracker, provided by
+    Session and SessionView alike
+    """
+
+    @property
+    def session_type(self) -> str: ...
+
+    @property
+    def length(self) -> float: ...
+
+    status: str
+    started_at: float
+    ended_at: float
+
+
+def _zeros(size: int) -> array[float]:
+    return array("d", [0.0]) * size
+
+
+@dataclass
+class Schedule:
+    """sessions of a whole schedule stored as columns"""
+
+    types: bytearray = field(default_factory=bytearray)
+    lengths: array[float] = field(default_factory=lambda: array("d"))
+    statuses: bytearray = field(default_factory=bytearray)
+    started_at: array[float] = field(default_factory=lambda: array("d"))
+    ended_at: array[float] = field(default_factory=lambda: array("d"))
+    # number of sessions in a round
+    round_size: int = 8
+
+    @classmethod
+    def from_template(
+        cls, len_args: dict[str, int], num_rounds: int, template: Sequence[str]
+    ) -> Schedule:
+        """repeat ``template`` for ``num_rounds`` rounds"""
+        size = len(template) * num_rounds
+        return cls(
+            types=bytearray(TYPE_CODES[t] for t in template) * num_rounds,
+            lengths=array("d", [len_args[t] for t in template]) * num_rounds,
+            statuses=bytearray(size),
+            started_at=_zeros(size),
+            ended_at=_zeros(size),
+            round_size=len(template),
+        )
+
+    def __len__(self) -> int:
+        return len(self.types)
+
+    def views(self, round_idx: int) -> list[SessionView]:
+        """the sessions of one round as Session-like objects"""
+        first = round_idx * self.round_size
+        return [SessionView(self, i) for i in range(first, first + self.round_size)]
+
+
+class SessionView:
+    """one row of a Schedule with the attributes of a Session"""
+
+    __slots__ = ("schedule", "index")
+
+    def __init__(self, schedule: Schedule, index: int) -> None:
+        self.schedule = schedule
+        self.index = index
+
+    def __repr__(self) -> str:
+        return "SessionView(session_type={!r}, length={!r}, status={!r})".format(
+            self.session_type, self.length, self.status
+        )
+
+    @property
+    def session_type(self) -> str:
+        return TYPE_NAMES[self.schedule.types[self.index]]
+
+    @property
+    def length(self) -> float:
+        return self.schedule.lengths[self.index]
+
+    @property
+    def status(self) -> str:
+        return STATUS_NAMES[self.schedule.statuses[self.index]]
+
+    @status.setter
+    def status(self, value: str) -> None:
+        self.schedule.statuses[self.index] = STATUS_CODES[value]
+
+    @property
+    def started_at(self) -> float:
+        return self.schedule.started_at[self.index]
+
+    @started_at.setter
+    def started_at(self, value: float) -> None:
+        self.schedule.started_at[self.index] = value
+
+    @property
+    def ended_at(self) -> float:
+        return self.schedule.ended_at[self.index]
+
+    @ended_at.setter
+    def ended_at(self, value: float) -> None:
+        self.schedule.ended_at[self.index] = value
+
+
+Position = Tuple[int, int, float]
+
+
+@dataclass
+class Timeline:
+    """Deadlines of a schedule of identical rounds on a monotonic clock.
+
+    ``ends`` holds the end of each session of a round in seconds from the
+    start of the round. The schedule started at clock time ``origin``; a
+    pause moves the origin by the time spent paused when it is resumed and
+    a skip moves it forward by the time left in the session, so every later
+    deadline is shifted at once without being rewritten.
+    """
+
+    ends: array[float] = field(default_factory=lambda: array("d"))
+    # rounds in the schedule, 0 if it never ends
+    num_rounds: int = 0
+    origin: float = 0.0
+    # clock time at which the schedule was paused, None while running
+    paused_at: float | None = None
+
+    @classmethod
+    def from_lengths(
+        cls, lengths: Sequence[float], num_rounds: int = 0, origin: float = 0.0
+    ) -> Timeline:
+        """timeline of rounds made of sessions of ``lengths`` seconds"""
+        ends = array("d")
+        total = 0.0
+        for length in lengths:
+            total += length
+            ends.append(total)
+        return cls(ends, num_rounds, origin)
+
+    @property
+    def round_length(self) -> float:
+        return self.ends[-1]
+
+    @property
+    def total(self) -> float:
+        """seconds in the whole schedule, inf if it never ends"""
+        if not self.num_rounds:
+            return math.inf
+        return self.num_rounds * self.round_length
+
+    def elapsed(self, now: float) -> float:
+        """seconds of the schedule behind us at clock time ``now``"""
+        if self.paused_at is not None:
+            now = self.paused_at
+        return now - self.origin
+
+    def locate(self, elapsed: float) -> Position | None:
+        """(round index, session index, seconds left in the session) at
+        ``elapsed`` seconds into the schedule; None once it is over
+        """
+        if elapsed >= self.total:
+            return None
+        round_idx, offset = divmod(max(elapsed, 0.0), self.round_length)
+        session_idx = bisect.bisect_right(self.ends, offset)
+        # rounding of divmod may put offset on the very end of the round
+        session_idx = min(session_idx, len(self.ends) - 1)
+        return int(round_idx), session_idx, self.ends[session_idx] - offset
+
+    def position(self, now: float) -> Position | None:
+        return self.locate(self.elapsed(now))
+
+    def length(self, session_idx: int) -> float:
+        """seconds in a session"""
+        start = self.ends[session_idx - 1] if session_idx else 0.0
+        return self.ends[session_idx] - start
+
+    def start_of(self, round_idx: int, session_idx: int) -> float:
+        """seconds into the schedule at which a session starts"""
+        start = self.ends[session_idx - 1] if session_idx else 0.0
+        return round_idx * self.round_length + start
+
+    def deadline(self, round_idx: int, session_idx: int) -> float:
+        """clock time at which a session ends, if nothing is paused or skipped"""
+        return self.origin + round_idx * self.round_length + self.ends[session_idx]
+
+    def seek(
+        self, round_idx: int, session_idx: int, now: float, into: float = 0.0
+    ) -> None:
+        """make the session start ``into`` seconds before ``now``"""
+        start = self.start_of(round_idx, session_idx) + into
+        self.origin = (now if self.paused_at is None else self.paused_at) - start
+
+    def skip(self, now: float) -> None:
+        """end the current session now and start the next one"""
+        found = self.position(now)
+        if found is not None:
+            self.origin -= found[2]
+
+    def pause(self, now: float) -> None:
+        if self.paused_at is None:
+            self.paused_at = now
+
+    def resume(self, now: float) -> None:
+        if self.paused_at is not None:
+            self.origin += now - self.paused_at
+            self.paused_at = None
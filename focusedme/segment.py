@@ -0,0 +1,288 @@
+"""Status of the running tracker in a small shared memory file.
+
+The tracker keeps its current round, session and deadline in a fixed
+layout file under $XDG_RUNTIME_DIR, mapped in memory, so that prompt hooks,
+editors and status bars can poll it as often as they like without a request
+to the tracker: a read is a few loads from the page cache. The file is only
+written on transitions (a session starting, a pause, a resume, a skip, the
+end of the schedule); readers derive the time left from the deadline.
+
+Layout, little endian, 64 bytes:
+
+    0   4s  magic b"FMST"
+    4   H   layout version
+    6   H   size of the file
+    8   Q   sequence number, odd while the writer is updating the payload
+    16  I   pid of the writer
+    20  i   round index
+    24  i   session index
+    28  i   number of rounds, 0 if endless
+    32  B   state: 0 stopped, 1 running, 2 paused, 3 done
+    33  B   session type: 0 focus time, 1 short break, 2 long break
+    40  d   wall clock time at which the session ends, while running
+    48  d   seconds left in the session, while paused
+    56  d   wall clock time of the update
+
+The payload is guarded by a seqlock: a reader copies it between two loads
+of the sequence number and starts over if they differ or are odd, so it
+never sees half of an update, and the writer never waits for readers.
+There is a single writer per file, made sure of with an exclusive lock.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import struct
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, NamedTuple
+
+from focusedme.schedule import LABELS, TYPE_CODES, TYPE_NAMES
+from focusedme.util import CLOCK_SLACK
+
+if TYPE_CHECKING:  # pragma: no cover
+    import mmap
+
+MAGIC = b"FMST"
+VERSION = 1
+HEADER = struct.Struct("<4sHHQ")
+SEQUENCE = struct.Struct("<Q")
+SEQUENCE_OFFSET = 8
+PAYLOAD = struct.Struct("<IiiiBB6xddd")
+SIZE = HEADER.size + PAYLOAD.size
+
+# states
+STOPPED = 0
+RUNNING = 1
+PAUSED = 2
+DONE = 3
+STATE_NAMES = ("stopped", "running", "paused", "done")
+
+# attempts at a consistent copy before read() starts yielding to the writer
+SPINS = 100
+# seconds before read() gives up on a writer stuck in an update
+TIMEOUT = 0.1
+
+
+class SegmentError(Exception):
+    """raised when the status file cannot be written or read"""
+
+
+def default_path() -> str:
+    """status file in $XDG_RUNTIME_DIR, or a per user file in /tmp"""
+    runtime = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime:
+        return os.path.join(runtime, "focusedme.status")
+    import tempfile
+
+    uid = os.getuid() if hasattr(os, "getuid") else 0
+    return os.path.join(tempfile.gettempdir(), "focusedme-{}.status".format(uid))
+
+
+class Snapshot(NamedTuple):
+    pid: int
+    round: int
+    session: int
+    num_rounds: int
+    state: str
+    session_type: str
+    deadline: float
+    remaining: float
+    updated_at: float
+
+    def remainder(self, now: float | None = None) -> float:
+        """seconds left in the session at wall clock time ``now``"""
+        if self.state == "running":
+            now = time.time() if now is None else now
+            return max(self.deadline - now, 0.0)
+        if self.state == "paused":
+            return self.remaining
+        return 0.0
+
+    def line(self, now: float | None = None) -> str:
+        """the status line served by the daemon, e.g. "1/2 FOCUS TIME 24:59" """
+        if self.state in ("stopped", "done"):
+            return self.state
+        seconds = max(0, math.ceil(self.remainder(now) - CLOCK_SLACK))
+        minutes, seconds = divmod(seconds, 60)
+        line = "{}/{} {} {:02}:{:02}".format(
+            self.round + 1,
+            self.session + 1,
+            LABELS.get(self.session_type, self.session_type),
+            minutes,
+            seconds,
+        )
+        return "PAUSED " + line if self.state == "paused" else line
+
+
+@dataclass
+class StatusSegment:
+    """write side of the status file"""
+
+    path: str = field(default_factory=default_path)
+
+    # non init attributes
+    _fd: int | None = field(default=None, repr=False)
+    _map: mmap.mmap | None = field(default=None, repr=False)
+    _sequence: int = field(default=0, repr=False)
+
+    def open(self) -> None:
+        """map the file, creating it; raise SegmentError if another tracker
+        is publishing to it
+        """
+        if self._map is not None:
+            return
+        import mmap
+
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        except OSError as exc:
+            raise SegmentError(str(exc)) from exc
+        try:
+            try:
+                import fcntl
+            except ImportError:  # pragma: no cover
+                pass
+            else:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            if os.fstat(fd).st_size < SIZE:
+                os.ftruncate(fd, SIZE)
+            view = mmap.mmap(fd, SIZE)
+        except OSError as exc:
+            os.close(fd)
+            raise SegmentError(
+                "cannot publish the status to {}: {}".format(self.path, exc)
+            ) from exc
+        # carry on from the sequence number left by a previous writer, so
+        # that a reader mapping the file across the restart cannot mistake
+        # a new payload for the one it started to copy
+        magic, _, _, sequence = HEADER.unpack_from(view)
+        self._sequence = sequence + (sequence & 1) if magic == MAGIC else 0
+        HEADER.pack_into(view, 0, MAGIC, VERSION, SIZE, self._sequence)
+        self._fd, self._map = fd, view
+
+    def publish(
+        self,
+        state: int,
+        round_idx: int = 0,
+        session_idx: int = 0,
+        session_type: str = "focus_time",
+        deadline: float = 0.0,
+        remaining: float = 0.0,
+        num_rounds: int = 0,
+    ) -> None:
+        """replace the payload; ``deadline`` is a wall clock time"""
+        self.open()
+        view = self._map
+        assert view is not None
+        sequence = self._sequence
+        SEQUENCE.pack_into(view, SEQUENCE_OFFSET, sequence + 1)
+        PAYLOAD.pack_into(
+            view,
+            HEADER.size,
+            os.getpid(),
+            round_idx,
+            session_idx,
+            num_rounds,
+            state,
+            TYPE_CODES.get(session_type, 0),
+            deadline,
+            remaining,
+            time.time(),
+        )
+        self._sequence = sequence + 2
+        SEQUENCE.pack_into(view, SEQUENCE_OFFSET, self._sequence)
+
+    def close(self) -> None:
+        """publish that the tracker stopped and release the file"""
+        if self._map is not None:
+            self.publish(STOPPED)
+            self._map.close()
+            self._map = None
+        if self._fd is not None:
+            # closing the descriptor releases the lock
+            os.close(self._fd)
+            self._fd = None
+
+
+@dataclass
+class StatusReader:
+    """read side of the status file, mapped once and read many times"""
+
+    path: str = field(default_factory=default_path)
+
+    # non init attributes
+    # copies started over because the writer was updating the payload
+    retries: int = 0
+    _map: mmap.mmap | None = field(default=None, repr=False)
+
+    def open(self) -> None:
+        if self._map is not None:
+            return
+        import mmap
+
+        try:
+            with open(self.path, "rb") as f:
+                view = mmap.mmap(f.fileno(), SIZE, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as exc:
+            raise SegmentError("focusedme is not publishing its status") from exc
+        magic, version, _, _ = HEADER.unpack_from(view)
+        if magic != MAGIC or version != VERSION:
+            view.close()
+            raise SegmentError("{} is not a focusedme status file".format(self.path))
+        self._map = view
+
+    def read(self, timeout: float = TIMEOUT) -> Snapshot | None:
+        """a consistent copy of the payload, or None if the writer stayed
+        in the middle of an update for ``timeout`` seconds
+        """
+        self.open()
+        view = self._map
+        assert view is not None
+        unpack_sequence = SEQUENCE.unpack_from
+        give_up_at = None
+        attempts = 0
+        while True:
+            (before,) = unpack_sequence(view, SEQUENCE_OFFSET)
+            if not before & 1:
+                payload = PAYLOAD.unpack_from(view, HEADER.size)
+                (after,) = unpack_sequence(view, SEQUENCE_OFFSET)
+                if before == after:
+                    break
+            self.retries += 1
+            attempts += 1
+            if attempts >= SPINS:
+                # the writer was preempted in the middle of an update: let
+                # it run instead of spinning
+                now = time.monotonic()
+                if give_up_at is None:
+                    give_up_at = now + timeout
+                elif now >= give_up_at:
+                    return None
+                time.sleep(0)
+        pid, r, s, num_rounds, state, kind, *times = payload
+        return Snapshot(
+            pid,
+            r,
+            s,
+            num_rounds,
+            STATE_NAMES[state] if state < len(STATE_NAMES) else "stopped",
+            TYPE_NAMES[kind] if kind < len(TYPE_NAMES) else "focus_time",
+            *times,
+        )
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+
+def read_status(path: str | None = None) -> Snapshot | None:
+    """read the status file once"""
+    reader = StatusReader(path or default_path())
+    try:
+        return reader.read()
+    finally:
+        reader.close()
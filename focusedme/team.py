@@ -0,0 +1,416 @@
+"""Many named timers served by one process over a Unix domain socket.
+
+``focusedme team`` hosts a timer per person, each with its own lengths and
+number of rounds, and answers one line requests naming the timer:
+
+    start NAME [FOCUS SHORT LONG ROUNDS] -> "ok"
+    status NAME                          -> "1/2 FOCUS TIME 24:59"
+    skip, pause, resume, quit NAME       -> "ok"
+    timers                               -> number of timers
+
+Every timer has an entry in a single heap ordered by the deadline of its
+current session, and one loop timer is armed for the earliest deadline, so
+the server only does work when a session ends or a request arrives, however
+many timers it holds. Entries made stale by a pause, a skip or a quit stay
+in the heap and are dropped when they reach the top.
+Each timer writes its transitions to its own journal, and picks up where
+it was when it is started again with the same lengths. Journals are left
+open between records and synced in batches on a worker thread, so a slow
+disk never delays a deadline or an answer.
+"""
+
+from __future__ import annotations
+
+import heapq
+import math
+import os
+import re
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Callable
+
+from focusedme import daemon
+from focusedme.__main__ import SECONDS_PER_MIN
+from focusedme.daemon import DaemonError, serve_lines, set_if_pending
+from focusedme.journal import Journal, replay
+from focusedme.journal import default_path as default_journal_path
+from focusedme.schedule import LABELS, Timeline
+from focusedme.util import CLOCK_SLACK
+
+if TYPE_CHECKING:  # pragma: no cover
+    import asyncio
+
+COMMANDS = ("start", "status", "skip", "pause", "resume", "quit", "timers")
+NAME = re.compile(r"[A-Za-z0-9_.@-]{1,64}")
+
+
+def default_socket_path() -> str:
+    return daemon.default_socket_path("focusedme-team")
+
+
+def default_journal_dir() -> str:
+    """team next to the journal of the timer, one journal file per timer"""
+    return os.path.join(os.path.dirname(default_journal_path()), "team")
+
+
+@dataclass
+class TeamTimer:
+    """position and deadlines of one named timer"""
+
+    name: str
+    time_args: dict[str, int]
+    template: tuple[str, ...]
+    journal: Journal | None = None
+
+    # non init attributes
+    round_idx: int = 0
+    session_idx: int = 0
+    # deadlines of the schedule on the loop clock, set by begin()
+    timeline: Timeline = field(init=False, repr=False)
+    finished: bool = False
+    # bumped whenever the deadline changes, invalidating older heap entries
+    generation: int = 0
+
+    def __post_init__(self) -> None:
+        self.timeline = Timeline.from_lengths(
+            [self.time_args[t] * SECONDS_PER_MIN for t in self.template],
+            self.time_args["num_rounds"],
+        )
+
+    @property
+    def deadline(self) -> float:
+        """loop time at which the current session ends, unless paused"""
+        return self.timeline.deadline(self.round_idx, self.session_idx)
+
+    @property
+    def paused(self) -> bool:
+        return self.timeline.paused_at is not None
+
+    def status(self, now: float) -> str:
+        position = None if self.finished else self.timeline.position(now)
+        if position is None:
+            return "done"
+        round_idx, session_idx, remaining = position
+        minutes, seconds = divmod(max(0, math.ceil(remaining - CLOCK_SLACK)), 60)
+        label = self.template[session_idx]
+        line = "{}/{} {} {:02}:{:02}".format(
+            round_idx + 1, session_idx + 1, LABELS.get(label, label), minutes, seconds
+        )
+        return "PAUSED " + line if self.paused else line
+
+    def __write(self, method: str, *args: object) -> None:
+        if self.journal is not None:
+            getattr(self.journal, method)(*args)
+
+    def begin(self, now: float) -> None:
+        """start the schedule, resuming the journal if it has the same lengths"""
+        elapsed = self.__restore()
+        if self.finished:
+            # stopped between the last session and the end of the run
+            self.__write("end")
+            return
+        if elapsed is None:
+            self.__write("begin", self.time_args)
+            elapsed = 0.0
+        self.__write("started", self.round_idx, self.session_idx)
+        self.timeline.seek(self.round_idx, self.session_idx, now, elapsed)
+
+    def __restore(self) -> float | None:
+        """move to the session the journal ends in; return the seconds
+        already spent in it, or None if there is nothing to resume
+        """
+        records = None
+        if self.journal is not None:
+            records = self.journal.resumable(self.time_args)
+        if records is None:
+            return None
+        sessions = list(replay(records, time.time()))
+        if not sessions:
+            return 0.0
+        record, status, spent = sessions[-1]
+        self.round_idx, self.session_idx = record.round, record.session
+        if status == "running":
+            return spent
+        self.__next_session()
+        return 0.0
+
+    def __next_session(self) -> None:
+        self.session_idx += 1
+        if self.session_idx == len(self.template):
+            self.session_idx = 0
+            self.round_idx += 1
+            num_rounds = self.time_args["num_rounds"]
+            self.finished = bool(num_rounds) and self.round_idx >= num_rounds
+
+    def advance(self, done: bool) -> None:
+        """end the current session; the next one starts on its deadline"""
+        if done:
+            self.__write("done", self.round_idx, self.session_idx)
+        self.__next_session()
+        self.generation += 1
+        if self.finished:
+            self.__write("end")
+            return
+        self.__write("started", self.round_idx, self.session_idx)
+
+    def skip(self, now: float) -> None:
+        """end the current session now, keeping the timer paused if it was"""
+        self.timeline.skip(now)
+        self.advance(done=False)
+        if self.paused and not self.finished:
+            self.__write("paused", self.round_idx, self.session_idx)
+
+    def pause(self, now: float) -> None:
+        if not self.paused and not self.finished:
+            self.timeline.pause(now)
+            self.generation += 1
+            self.__write("paused", self.round_idx, self.session_idx)
+
+    def resume(self, now: float) -> None:
+        if self.paused:
+            self.timeline.resume(now)
+            self.generation += 1
+            self.__write("resumed", self.round_idx, self.session_idx)
+
+    def quit(self) -> None:
+        self.generation += 1
+        if not self.finished:
+            self.__write("end")
+
+
+@dataclass
+class TeamServer:
+    """host named timers and answer requests about them"""
+
+    # lengths and number of rounds of timers started without their own
+    defaults: dict[str, int]
+    # order of the session types in a round
+    template: tuple[str, ...]
+    path: str = field(default_factory=default_socket_path)
+    # one journal per timer in this directory, none if empty
+    journal_dir: str = field(default_factory=default_journal_dir)
+    # raises ValueError for time_args that cannot be used
+    validate: Callable[[dict[str, int]], object] | None = None
+    # seconds between two syncs of the journals written to
+    sync_interval: float = 5.0
+    # written journals left open before they are synced early
+    max_open_journals: int = 256
+
+    # non init attributes
+    timers: dict[str, TeamTimer] = field(default_factory=dict)
+    # (deadline, sequence, generation, timer)
+    _heap: list[tuple[float, int, int, TeamTimer]] = field(
+        default_factory=list, repr=False
+    )
+    _sequence: int = field(default=0, repr=False)
+    _alarm: asyncio.TimerHandle | None = field(default=None, repr=False)
+    _stopped: asyncio.Future[None] | None = field(default=None, repr=False)
+    # journals written to since the last sync, by id
+    _unsynced: dict[int, Journal] = field(default_factory=dict, repr=False)
+    _sync_now: asyncio.Event | None = field(default=None, repr=False)
+
+    def __now(self) -> float:
+        import asyncio
+
+        return asyncio.get_running_loop().time()
+
+    def __push(self, timer: TeamTimer) -> None:
+        """schedule the current deadline of ``timer``"""
+        self._sequence += 1
+        entry = (timer.deadline, self._sequence, timer.generation, timer)
+        heapq.heappush(self._heap, entry)
+        # stale entries are dropped lazily; rebuild when they dominate
+        if len(self._heap) > 2 * len(self.timers) + 64:
+            self._heap = [e for e in self._heap if e[2] == e[3].generation]
+            heapq.heapify(self._heap)
+        if self._heap[0] is entry:
+            self.__arm()
+
+    def __arm(self) -> None:
+        """set the loop timer to the earliest deadline"""
+        import asyncio
+
+        if self._alarm is not None:
+            self._alarm.cancel()
+            self._alarm = None
+        if self._heap:
+            loop = asyncio.get_running_loop()
+            self._alarm = loop.call_at(self._heap[0][0], self.__expire)
+
+    def __written(self, timer: TeamTimer) -> None:
+        """queue the journal of ``timer`` for the next sync"""
+        journal = timer.journal
+        if journal is None:
+            return
+        self._unsynced[id(journal)] = journal
+        sync_now = self._sync_now
+        if len(self._unsynced) >= self.max_open_journals and sync_now is not None:
+            sync_now.set()
+
+    async def __sync(self) -> None:
+        """fsync and close the journals written to since the last call on a
+        worker thread; the next record opens them again
+        """
+        import asyncio
+
+        fds = [journal.detach() for journal in self._unsynced.values()]
+        self._unsynced.clear()
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, _sync_and_close, fds)
+
+    async def __sync_journals(self, sync_now: asyncio.Event) -> None:
+        import asyncio
+
+        while True:
+            try:
+                await asyncio.wait_for(sync_now.wait(), self.sync_interval)
+            except asyncio.TimeoutError:
+                pass
+            sync_now.clear()
+            await self.__sync()
+
+    def __expire(self) -> None:
+        """end every session whose deadline has passed"""
+        self._alarm = None
+        now = self.__now()
+        heap = self._heap
+        while heap and heap[0][0] <= now + CLOCK_SLACK:
+            _, _, generation, timer = heapq.heappop(heap)
+            if generation != timer.generation:
+                continue
+            # chained on the deadline, so a late wakeup is not carried over
+            timer.advance(done=True)
+            self.__written(timer)
+            if not timer.finished:
+                self._sequence += 1
+                entry = (timer.deadline, self._sequence, timer.generation, timer)
+                heapq.heappush(heap, entry)
+        self.__arm()
+
+    def __time_args(self, args: list[str]) -> dict[str, int]:
+        """the defaults, shared by every timer that does not override them"""
+        if not args:
+            return self.defaults
+        if len(args) != 4:
+            raise ValueError("expected FOCUS SHORT LONG ROUNDS")
+        keys = ("focus_time", "short_break", "long_break", "num_rounds")
+        time_args = {key: int(value) for key, value in zip(keys, args)}
+        # a session of no length would end again as soon as it starts
+        if min(time_args[key] for key in keys[:3]) <= 0:
+            raise ValueError("sessions must last at least a minute")
+        if time_args["num_rounds"] < 0:
+            raise ValueError("ROUNDS must be 0, for no limit, or more")
+        if self.validate is not None:
+            self.validate(time_args)
+        return time_args
+
+    def start(self, name: str, args: list[str] | None = None) -> TeamTimer:
+        if name in self.timers:
+            raise ValueError("timer {} is already running".format(name))
+        journal = None
+        if self.journal_dir:
+            path = os.path.join(self.journal_dir, name + ".bin")
+            journal = Journal(path, auto_sync=False)
+        timer = TeamTimer(name, self.__time_args(args or []), self.template, journal)
+        self.timers[name] = timer
+        timer.begin(self.__now())
+        self.__written(timer)
+        if not timer.finished:
+            self.__push(timer)
+        return timer
+
+    def command(self, line: str) -> str:
+        """answer one request"""
+        command, *args = line.split() or [""]
+        if command == "timers":
+            return str(len(self.timers))
+        if command not in COMMANDS or not args or not NAME.fullmatch(args[0]):
+            return "error: expected a command and a timer name"
+        name, *args = args
+        try:
+            if command == "start":
+                self.start(name, args)
+                return "ok"
+            timer = self.timers[name]
+        except KeyError:
+            return "error: unknown timer {}".format(name)
+        except ValueError as exc:
+            return "error: {}".format(exc)
+        return self.__control(timer, command)
+
+    def __control(self, timer: TeamTimer, command: str) -> str:
+        """apply a command other than start to a running timer"""
+        now = self.__now()
+        if command == "status":
+            return timer.status(now)
+        if command == "quit":
+            timer.quit()
+            self.__written(timer)
+            del self.timers[timer.name]
+        elif command == "pause":
+            timer.pause(now)
+        elif command == "resume" and timer.paused:
+            timer.resume(now)
+            self.__push(timer)
+        elif command == "skip" and not timer.finished:
+            self.__skip(timer, now)
+        return "ok"
+
+    def __skip(self, timer: TeamTimer, now: float) -> None:
+        """start the next session, paused if the timer was"""
+        timer.skip(now)
+        self.__written(timer)
+        if not timer.paused and not timer.finished:
+            self.__push(timer)
+
+    async def __answer(self, line: str) -> bytes:
+        return self.command(line).encode() + b"\n"
+
+    async def serve(self) -> None:
+        """answer requests until stop() is called, or SIGINT or SIGTERM is
+        received when running in the main thread
+        """
+        import asyncio
+        import signal
+        import threading
+
+        loop = asyncio.get_running_loop()
+        self._stopped = stopped = loop.create_future()
+        self._sync_now = sync_now = asyncio.Event()
+        syncing = loop.create_task(self.__sync_journals(sync_now))
+        signals: tuple[signal.Signals, ...] = ()
+        if threading.current_thread() is threading.main_thread():
+            signals = (signal.SIGINT, signal.SIGTERM)
+        for signum in signals:
+            loop.add_signal_handler(signum, set_if_pending, stopped)
+        try:
+            await serve_lines(self.path, self.__answer, lambda: stopped)
+        finally:
+            for signum in signals:
+                loop.remove_signal_handler(signum)
+            if self._alarm is not None:
+                self._alarm.cancel()
+            syncing.cancel()
+            await asyncio.gather(syncing, return_exceptions=True)
+            await self.__sync()
+
+    def stop(self) -> None:
+        """make serve() return; may be called from any thread"""
+        stopped = self._stopped
+        if stopped is not None:
+            stopped.get_loop().call_soon_threadsafe(set_if_pending, stopped)
+
+    def run(self) -> None:
+        import asyncio
+
+        try:
+            asyncio.run(self.serve())
+        except OSError as exc:
+            raise DaemonError(str(exc)) from exc
+
+
+def _sync_and_close(fds: list[int | None]) -> None:
+    for fd in fds:
+        if fd is not None:
+            os.fsync(fd)
+            os.close(fd)
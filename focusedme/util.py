@@ -4,17 +4,69 @@ https://github.com/JaDogg/pydoro
 to solve in app path references
 """
 
+import math
 import os
 import time
-from typing import Callable
+from typing import Callable, Optional
 
+# tolerance, in seconds, when comparing the clock against a deadline
+CLOCK_SLACK = 1e-3
 
-def every(delay: float, task: Callable[[], None]) -> None:
-    next_time = time.time() + delay
+
+def every(
+    delay: float,
+    task: Callable[[float], bool],
+    until: Optional[float] = None,
+    clock: Optional[Callable[[], float]] = None,
+    sleep: Optional[Callable[[float], None]] = None,
+) -> int:
+    """Call ``task(now)`` on a fixed grid of ``delay`` seconds until it
+    returns False or ``until`` is reached.
+
+    The grid is anchored to ``until`` (or to the first call when no deadline
+    is given) and every wakeup targets an absolute point on it, so time spent
+    inside ``task`` or oversleeping never accumulates; missed beats are
+    skipped. ``task`` is always called once more at ``until``.
+    Returns the number of times the loop slept.
+    """
+    clock = clock or time.monotonic
+    sleep = sleep or time.sleep
+
+    anchor = clock() if until is None else until
+    wakeups = 0
     while True:
-        time.sleep(max(0, next_time - time.time()))
-        task()
-        next_time += (time.time() - next_time) // delay * delay + delay
+        if not task(clock()):
+            return wakeups
+        now = clock()
+        if until is not None and now >= until:
+            return wakeups
+        next_time = anchor + (math.floor((now - anchor) / delay) + 1) * delay
+        if until is not None:
+            next_time = min(next_time, until)
+        sleep(max(0.0, next_time - now))
+        wakeups += 1
+
+
+class VirtualClock:
+    """Monotonic clock that jumps forward when slept on instead of waiting.
+
+    Pass ``monotonic`` and ``sleep`` wherever a clock and a sleeper are
+    accepted to run a schedule as fast as the code processing it allows.
+    """
+
+    def __init__(self, start: float = 0.0) -> None:
+        self.now = start
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += max(0.0, seconds)
+
+
+def as_bool(value: str) -> bool:
+    """read a yes/no setting; empty, 0, false, no and off are no"""
+    return value.strip().lower() not in ("", "0", "false", "no", "off")
 
 
 def in_app_path(path: str) -> str:
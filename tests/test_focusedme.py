@@ -2,13 +2,51 @@
 
 """Tests for `focusedme` package."""
 
+import asyncio
+import collections
+import io
+import itertools
+import math
+import os
+import pathlib
+import re
 import sys
+import threading
+import time
+import tracemalloc
 from unittest import mock
 
 import pytest
 
-from focusedme import util
-from focusedme.__main__ import Config
+import focusedme.__main__ as focusedme_main
+from focusedme import montecarlo, planner, profiling, util
+from focusedme.__main__ import (
+    BELL,
+    AsyncTracker,
+    Config,
+    ConfigError,
+    Log,
+    Pomodoro,
+    Settings,
+    Tracker,
+    View,
+)
+from focusedme.daemon import Daemon, DaemonError, request
+from focusedme.dashboard import Dashboard
+from focusedme.events import (
+    Event,
+    EventBus,
+    RoundCompleted,
+    SessionDone,
+    SessionStarted,
+    Tick,
+)
+from focusedme.export import FIELDS, write_csv, write_ndjson
+from focusedme.history import SCHEMA, History
+from focusedme.journal import Journal
+from focusedme.schedule import Status, Timeline
+from focusedme.segment import SegmentError, StatusReader, StatusSegment, read_status
+from focusedme.team import TeamServer, TeamTimer
 
 # Mock simpleaudio to avoid dependency issues in CI
 sys.modules["simpleaudio"] = mock.MagicMock()
@@ -60,3 +98,1175 @@ def test_load_init(call_load_init: tuple[dict[str, int], dict[str, str]]) -> Non
     assert time_args["long_break"] == 25
     assert time_args["num_rounds"] == 3
     assert sound_args["sound"]
+
+
+class FakeClock:
+    """monotonic clock that only moves when slept on"""
+
+    def __init__(self, start: float = 1000.0) -> None:
+        self.now = start
+        self.wakeups = 0
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.wakeups += 1
+        self.now += seconds
+
+
+@pytest.fixture(scope="function")
+def fake_clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    clock = FakeClock()
+    monkeypatch.setattr(time, "monotonic", clock.monotonic)
+    monkeypatch.setattr(time, "sleep", clock.sleep)
+    return clock
+
+
+TIME_ARGS = {"focus_time": 25, "short_break": 5, "long_break": 25, "num_rounds": 4}
+NO_SOUND = {"sound": "", "path": "Ring01.wav"}
+
+
+def test_tracker_has_no_drift(fake_clock: FakeClock) -> None:
+    rounds = Pomodoro(TIME_ARGS, TIME_ARGS["num_rounds"]).create_rounds()
+    shown = []
+
+    def show_time(remainder: int, *_: object) -> None:
+        shown.append(remainder)
+        # rendering is slow and takes a fraction of a second
+        fake_clock.now += 0.37
+
+    started = fake_clock.now
+    Tracker(rounds, Log()).start(show_time, NO_SOUND)
+
+    total = sum(s.length for r in rounds for s in r.sessions) * 60
+    assert total >= 8 * 60 * 60
+    assert fake_clock.now - started == pytest.approx(total, abs=1e-6)
+    assert all(s.status == "done" for r in rounds for s in r.sessions)
+    # one refresh per visible second and nothing more
+    assert len(shown) == total
+    assert fake_clock.wakeups == total
+
+
+def test_tracker_without_display_wakes_per_session(fake_clock: FakeClock) -> None:
+    rounds = Pomodoro(TIME_ARGS, TIME_ARGS["num_rounds"]).create_rounds()
+
+    started = fake_clock.now
+    Tracker(rounds, Log()).start(None, NO_SOUND)
+
+    sessions = sum(len(r.sessions) for r in rounds)
+    total = sum(s.length for r in rounds for s in r.sessions) * 60
+    assert fake_clock.now - started == pytest.approx(total, abs=1e-6)
+    assert fake_clock.wakeups == sessions
+
+
+# lengths are in minutes: 0.0005 min == 30 ms
+FAST_ARGS = {"focus_time": 0.0005, "short_break": 0.0005, "long_break": 0.0005}
+
+
+def test_async_trackers_share_one_loop() -> None:
+    trackers = [
+        AsyncTracker(Pomodoro(FAST_ARGS, 1).create_rounds(), Log()) for _ in range(200)
+    ]
+
+    async def run_all() -> None:
+        await asyncio.gather(*(t.start(None, NO_SOUND) for t in trackers))
+
+    asyncio.run(run_all())
+    for tracker in trackers:
+        assert all(s.status == "done" for s in tracker.rounds[0].sessions)
+
+
+def test_async_tracker_commands() -> None:
+    slow_args = {"focus_time": 10, "short_break": 10, "long_break": 10}
+    tracker = AsyncTracker(Pomodoro(slow_args, 1).create_rounds(), Log())
+    shown = []
+
+    async def scenario() -> None:
+        task = asyncio.create_task(
+            tracker.start(lambda r, *_: shown.append(r), NO_SOUND)
+        )
+        await asyncio.sleep(0.01)
+        await tracker.skip()
+        await asyncio.sleep(0.01)
+        await tracker.pause()
+        await asyncio.sleep(0.01)
+        assert tracker.paused
+        await tracker.resume()
+        await asyncio.sleep(0.01)
+        assert not tracker.paused
+        await tracker.quit()
+        await asyncio.wait_for(task, 1)
+
+    asyncio.run(scenario())
+    sessions = tracker.rounds[0].sessions
+    assert sessions[0].status == "skipped"
+    assert tracker.rounds[0].current_session_idx == 1
+    assert sessions[2].status == "not started"
+    assert shown[0] == shown[-1] == 600
+
+
+def test_ring_bell_decodes_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    decoded = []
+    played = []
+
+    class CountingWaveObject:
+        @classmethod
+        def from_wave_file(cls, file_path: str) -> "CountingWaveObject":
+            decoded.append(file_path)
+            return cls()
+
+        def play(self) -> None:
+            played.append(self)
+
+    monkeypatch.setattr(focusedme_main, "sa", mock.Mock(WaveObject=CountingWaveObject))
+    monkeypatch.setattr(sys, "platform", "linux")
+    monkeypatch.setattr(focusedme_main, "_SOUNDS", {})
+
+    View.preload_sounds(["Ring01.wav", "other.wav"]).join()
+    View.ring_bell("Ring01.wav")
+    View.ring_bell("Ring01.wav")
+
+    assert decoded == [util.in_app_path("Ring01.wav"), util.in_app_path("other.wav")]
+    assert len(played) == 2 and played[0] is played[1]
+
+
+@pytest.mark.parametrize("clip_finishes", [True, False])
+def test_session_start_ignores_clip_length(
+    fake_clock: FakeClock, monkeypatch: pytest.MonkeyPatch, clip_finishes: bool
+) -> None:
+    released = threading.Event()
+    if clip_finishes:
+        released.set()
+    rings = []
+
+    def ring_bell(PATH: str) -> None:
+        rings.append(PATH)
+        released.wait()
+
+    monkeypatch.setattr(View, "ring_bell", ring_bell)
+    rounds = Pomodoro(TIME_ARGS, 1).create_rounds()
+    starts = []
+
+    def show_time(remainder: int, num_round: int, num_session: int, *_: str) -> None:
+        if len(starts) < num_session:
+            starts.append(fake_clock.now)
+
+    began = fake_clock.now
+    Tracker(rounds, Log()).start(show_time, {"sound": "True", "path": "x.wav"})
+    released.set()
+    BELL.join()
+
+    lengths = [s.length * 60 for s in rounds[0].sessions]
+    assert starts == [began + sum(lengths[:i]) for i in range(len(lengths))]
+    assert 1 <= len(rings) <= len(lengths)
+
+
+def test_view_waits_for_the_last_bell(
+    fake_clock: FakeClock,
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture,
+) -> None:
+    released = threading.Event()
+    rings = []
+
+    def ring_bell(PATH: str) -> None:
+        released.wait(0.2)
+        rings.append(PATH)
+
+    monkeypatch.setattr(View, "ring_bell", ring_bell)
+    BELL.play("x.wav")
+    assert not BELL.join(0.01)
+    released.set()
+    assert BELL.join(1)
+
+    released.clear()
+    rings.clear()
+    args = dict(FAST_ARGS, num_rounds=1)
+    View(FakeTerminal()).run(args, {"sound": "True", "path": "x.wav"})
+    # the bell of the last session rang before run() returned
+    assert rings[-1:] == ["x.wav"]
+
+
+class FakeTerminal(io.StringIO):
+    """single line terminal understanding the few escapes View writes"""
+
+    def __init__(self, tty: bool = True) -> None:
+        super().__init__()
+        self.tty = tty
+        self.writes: list[str] = []
+
+    def isatty(self) -> bool:
+        return self.tty
+
+    def write(self, frame: str) -> int:
+        self.writes.append(frame)
+        return super().write(frame)
+
+    def screen(self) -> str:
+        line: list[str] = []
+        col = 0
+        tokens = re.split(r"(\r|\033\[\d*[CKm])", "".join(self.writes))
+        for token in tokens:
+            if token == "\r":
+                col = 0
+            elif token.endswith("C") and token.startswith("\033"):
+                col += int(token[2:-1])
+            elif token == "\033[K":
+                del line[col:]
+            elif not token.startswith("\033"):
+                for char in token:
+                    line[col : col + 1] = [char]
+                    col += 1
+        return "".join(line).rstrip()
+
+
+def test_show_time_writes_only_changed_cells() -> None:
+    term = FakeTerminal()
+    view = View(term)
+    for remainder in (1500, 1499, 1498, 1441, 1440, 1439):
+        view.show_time(remainder, 1, 2, "focus_time")
+    assert term.screen() == "Round 1 / Session 2 - FOCUS TIME :  23min 59s remaining"
+    assert len(term.writes) == 6
+    assert term.writes[1] == "\r\033[37C4min 59s remaining\r"
+    assert term.writes[2] == "\r\033[43C8\r"
+
+    view.show_time(300, 1, 3, "short_break")
+    assert term.screen() == "Round 1 / Session 3 - SHORT BREAK :  5min 0s remaining"
+
+
+def test_show_time_skips_frames_off_tty() -> None:
+    term = FakeTerminal(tty=False)
+    view = View(term)
+    for remainder in range(180, 0, -1):
+        view.show_time(remainder, 1, 1, "focus_time")
+    assert term.getvalue().splitlines() == [
+        "Round 1 / Session 1 - FOCUS TIME :  3min 0s remaining",
+        "Round 1 / Session 1 - FOCUS TIME :  2min 59s remaining",
+        "Round 1 / Session 1 - FOCUS TIME :  1min 59s remaining",
+        "Round 1 / Session 1 - FOCUS TIME :  0min 59s remaining",
+    ]
+
+
+def test_journal_recovers_after_crash(
+    fake_clock: FakeClock, monkeypatch: pytest.MonkeyPatch, tmp_path: pathlib.Path
+) -> None:
+    args = dict(TIME_ARGS, num_rounds=2)
+    wall = [1_700_000_000.0]
+    monkeypatch.setattr(time, "time", lambda: wall[0])
+
+    journal = Journal(str(tmp_path / "journal.bin"))
+    journal.begin(args)
+    journal.started(0, 0)
+    journal.done(0, 0)
+    journal.started(0, 1)  # skipped by the user
+    journal.started(0, 2)
+    journal.close()  # the process dies here
+    wall[0] += 300
+
+    tracker = Tracker(Pomodoro(args, 2).create_rounds(), Log(), journal=journal)
+    assert journal.restore(tracker, args)
+    statuses = [s.status for s in tracker.rounds[0].sessions[:3]]
+    assert statuses == ["done", "skipped", "not started"]
+    assert tracker.rounds[0].current_session_idx == 2
+    assert tracker.elapsed == 300
+
+    started = fake_clock.now
+    shown = []
+    tracker.start(lambda *a: shown.append(a[:3]), NO_SOUND)
+    assert shown[0] == (25 * 60 - 300, 1, 3)
+    remaining = sum(s.length for s in tracker.rounds[0].sessions[2:]) + sum(
+        s.length for s in tracker.rounds[1].sessions
+    )
+    assert fake_clock.now - started == pytest.approx(remaining * 60 - 300)
+
+    # a finished run or different settings start from scratch
+    fresh = Tracker(Pomodoro(args, 2).create_rounds(), Log())
+    assert not journal.restore(fresh, dict(args, focus_time=50))
+    journal.end()
+    assert not journal.restore(fresh, args)
+
+    # nor does a run left alone for longer than its longest session
+    many = dict(args, num_rounds=70_000)
+    journal.begin(many)
+    journal.started(69_999, 0)
+    assert journal.last_run() is not None
+    wall[0] += 25 * 60 + 1
+    assert journal.last_run() is None
+
+
+def test_journal_leaves_pauses_out_of_the_elapsed_time(
+    fake_clock: FakeClock, tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    args = dict(TIME_ARGS, num_rounds=2)
+    wall = [1_700_000_000.0]
+    monkeypatch.setattr(time, "time", lambda: wall[0] + fake_clock.now)
+    journal = Journal(str(tmp_path / "journal.bin"))
+    journal.begin(args)
+    tracker = Tracker(Pomodoro(args, 2).create_rounds(), Log(), journal=journal)
+
+    def show_time(remainder: int, *_: object) -> None:
+        if remainder == 25 * 60 - 100:
+            raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        tracker.start(show_time, NO_SOUND)
+    journal.close()  # the process dies in the menu, 500 seconds later
+    wall[0] += 500
+
+    restored = Tracker(Pomodoro(args, 2).create_rounds(), Log())
+    assert journal.restore(restored, args)
+    assert restored.elapsed == 100
+
+    # a resumed pause is left out as well
+    journal.resumed(0, 0)
+    wall[0] += 50
+    assert journal.restore(restored, args)
+    assert restored.elapsed == 150
+
+
+def test_history_rollups(tmp_path: pathlib.Path) -> None:
+    history = History(str(tmp_path / "history.sqlite3"), project="book")
+    nine = time.mktime((2026, 10, 12, 9, 0, 0, 0, 0, -1))
+    history.record("focus_time", nine, nine + 1500, 25, "done")
+    history.record("focus_time", nine + 1800, nine + 2400, 25, "skipped")
+    history.record("short_break", nine + 1500, nine + 1800, 5, "done")
+    history.project = "code"
+    history.record("focus_time", nine + 86400, nine + 86400 + 1500, 25, "done")
+
+    assert history.focus_minutes() == [("2026-10-12", 35.0), ("2026-10-13", 25.0)]
+    assert history.focus_minutes("week") == [("2026-W41", 60.0)]
+    assert history.focus_minutes("project") == [("book", 35.0), ("code", 25.0)]
+    assert history.focus_minutes(since="2026-10-13") == [("2026-10-13", 25.0)]
+    assert history.skip_rate_by_hour() == [(9, 1 / 3)]
+    assert history.skip_rate_by_hour("code") == [(9, 0.0)]
+
+
+def test_tracker_records_history(fake_clock: FakeClock) -> None:
+    history = History(":memory:")
+    rounds = Pomodoro(TIME_ARGS, 1).create_rounds()
+    Tracker(rounds, Log(), history=history).start(None, NO_SOUND)
+
+    assert sum(minutes for _, minutes in history.focus_minutes()) == 100
+    assert all(s.ended_at >= s.started_at > 0 for s in rounds[0].sessions)
+
+    # a paused session counts the time spent in it, not the time it took
+    tracker = Tracker(Pomodoro(TIME_ARGS, 1).create_rounds(), Log(), history=history)
+
+    def show_time(remainder: int, *_: object) -> None:
+        if remainder == 25 * 60 - 60:
+            raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        tracker.start(show_time, NO_SOUND)
+    fake_clock.now += 600
+    tracker.skip()
+    assert sum(minutes for _, minutes in history.focus_minutes()) == 101
+
+
+def test_history_adds_the_spent_column(tmp_path: pathlib.Path) -> None:
+    import sqlite3
+
+    path = str(tmp_path / "history.sqlite3")
+    # a database and rollup trigger made before the column existed
+    column = SCHEMA[SCHEMA.index("    -- seconds actually") : SCHEMA.index(");")]
+    old_schema = SCHEMA.replace("session INTEGER,", "session INTEGER").replace(
+        column, ""
+    )
+    old_schema = old_schema.replace("COALESCE(NEW.spent, ", "(")
+    assert "spent" not in old_schema
+    db = sqlite3.connect(path)
+    db.executescript(old_schema)
+    db.close()
+
+    history = History(path)
+    history.record("focus_time", 0.0, 1500.0, 25, "done")
+    history.record("focus_time", 1800.0, 3600.0, 25, "done", 1, 2, spent=1500.0)
+    assert history.focus_minutes(by="project") == [("", 50.0)]
+
+
+def test_export_streams_history(tmp_path: pathlib.Path, fake_clock: FakeClock) -> None:
+    import csv
+    import json
+
+    path = str(tmp_path / "history.sqlite3")
+    # a database created before sessions had a round and session number
+    old = History(path)
+    old.record("focus_time", 0.0, 1500.0, 25, "done")
+    old.close()
+    history = History(path)
+    Tracker(Pomodoro(TIME_ARGS, 2).create_rounds(), Log(), history=history).start(
+        None, NO_SOUND
+    )
+    rows = history.sessions()
+    assert not isinstance(rows, list)
+
+    out = io.StringIO()
+    assert write_ndjson(rows, out) == 17
+    lines = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert list(lines[0]) == list(FIELDS)
+    assert lines[0]["round"] is None
+    assert lines[0]["started_at"] == "1970-01-01T00:00:00+00:00"
+    assert [(r["round"], r["session"]) for r in lines[1:3]] == [(1, 1), (1, 2)]
+    assert lines[-1]["session_type"] == "long_break"
+    assert (lines[-1]["round"], lines[-1]["session"]) == (2, 8)
+
+    out = io.StringIO()
+    since = time.strftime("%Y-%m-%d", time.localtime(time.time() - 86400))
+    assert write_csv(history.sessions(since), out) == 16
+    rows = list(csv.DictReader(io.StringIO(out.getvalue())))
+    assert rows[0]["status"] == "done" and rows[0]["planned"] == "25.0"
+
+
+def test_export_rejects_malformed_days(
+    monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture
+) -> None:
+    monkeypatch.setattr(sys, "argv", ["focusedme", "export", "--since", "2026/01/01"])
+    with pytest.raises(SystemExit):
+        focusedme_main.main()
+    assert "expected a date as YYYY-MM-DD" in capsys.readouterr().err
+    # days are compared as text, so they are written out in full
+    assert focusedme_main._day("2026-1-5") == "2026-01-05"
+
+
+@pytest.mark.parametrize("workers", ["0", "-2", "two"])
+def test_simulate_rejects_fewer_than_one_worker(
+    workers: str, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture
+) -> None:
+    monkeypatch.setattr(sys, "argv", ["focusedme", "simulate", "--workers", workers])
+    with pytest.raises(SystemExit):
+        focusedme_main.main()
+    assert "argument --workers" in capsys.readouterr().err
+
+
+def test_compact_rounds_behave_like_rounds(fake_clock: FakeClock) -> None:
+    pomodoro = Pomodoro(TIME_ARGS, 2)
+    compact = pomodoro.create_compact_rounds()
+    plain = pomodoro.create_rounds()
+    for a, b in zip(compact, plain):
+        assert [(s.session_type, s.length, s.status) for s in a.sessions] == [
+            (s.session_type, s.length, s.status) for s in b.sessions
+        ]
+
+    Tracker(compact, Log()).start(None, NO_SOUND)
+    schedule = compact[0].sessions[0].schedule
+    assert schedule.statuses == bytearray([Status.DONE]) * 16
+    assert schedule.ended_at[-1] - schedule.started_at[0] == pytest.approx(280 * 60)
+
+
+def test_streamed_sessions_use_flat_memory() -> None:
+    sessions = Pomodoro(FAST_ARGS, 0).iter_sessions()
+    tracemalloc.start()
+    try:
+        for _ in itertools.islice(sessions, 1000):
+            pass
+        warm, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        last = collections.deque(itertools.islice(sessions, 1_000_000), maxlen=1)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert last[0][0] == 1_001_000 // 8 - 1
+    assert peak - warm < 4096
+
+
+def test_timeline_lookups_and_offsets() -> None:
+    lengths = [60.0 * s.length for s in focusedme_main.Round(TIME_ARGS).sessions]
+    timeline = Timeline.from_lengths(lengths, num_rounds=2, origin=100.0)
+    assert timeline.total == 2 * 140 * 60
+    assert timeline.position(100.0) == (0, 0, 1500.0)
+    assert timeline.position(100.0 + 1500) == (0, 1, 300.0)
+    assert timeline.position(100.0 + 140 * 60 + 1) == (1, 0, 1499.0)
+    assert timeline.position(100.0 + timeline.total) is None
+
+    # pausing shifts every later deadline by the time spent paused
+    deadline = timeline.deadline(1, 7)
+    timeline.pause(200.0)
+    assert timeline.position(5000.0) == (0, 0, 1400.0)
+    timeline.resume(260.0)
+    assert timeline.deadline(1, 7) == deadline + 60
+    # skipping moves them back by the time left in the session
+    timeline.skip(260.0)
+    assert timeline.position(260.0) == (0, 1, 300.0)
+    assert timeline.deadline(1, 7) == deadline + 60 - 1400
+
+    timeline.seek(1, 3, 1000.0, into=10.0)
+    assert timeline.position(1000.0) == (1, 3, 290.0)
+    endless = Timeline.from_lengths(lengths)
+    assert endless.locate(1e6 * 140 * 60 + 1500) == (1_000_000, 1, 300.0)
+
+
+def test_tracker_position_follows_the_countdown(fake_clock: FakeClock) -> None:
+    tracker = Tracker(Pomodoro(TIME_ARGS, 1).create_rounds(), Log())
+    seen = []
+
+    def show_time(remainder: int, num_round: int, num_session: int, _: str) -> None:
+        position = tracker.position()
+        assert position is not None
+        seen.append((position[0] + 1, position[1] + 1, math.ceil(position[2])))
+        assert seen[-1] == (num_round, num_session, remainder)
+
+    tracker.start(show_time, NO_SOUND)
+    assert len(seen) == 140 * 60
+    assert tracker.position() is None
+
+
+def test_tracker_pause_keeps_remaining_time(fake_clock: FakeClock) -> None:
+    rounds = Pomodoro(TIME_ARGS, 1).create_rounds()
+    tracker = Tracker(rounds, Log())
+    shown: list[tuple[int, int]] = []
+    interrupt_at = {(1, 1000), (2, 100)}
+
+    def show_time(remainder: int, num_round: int, num_session: int, _: str) -> None:
+        shown.append((num_session, remainder))
+        if (num_session, remainder) in interrupt_at:
+            interrupt_at.remove((num_session, remainder))
+            raise KeyboardInterrupt
+
+    started = fake_clock.now
+    with pytest.raises(KeyboardInterrupt):
+        tracker.start(show_time, NO_SOUND)
+    # ten minutes in the menu
+    fake_clock.now += 600
+    with pytest.raises(KeyboardInterrupt):
+        tracker.start(show_time, NO_SOUND)
+    # the focus session went on with the time it had left
+    assert shown.count((1, 1000)) == 2
+    assert (1, 999) in shown
+
+    fake_clock.now += 30
+    tracker.skip()
+    tracker.start(show_time, NO_SOUND)
+    assert [s.status for s in rounds[0].sessions[:3]] == ["done", "skipped", "done"]
+    # the short break was cut 100 seconds short, the pauses add 630 seconds
+    assert fake_clock.now - started == pytest.approx(140 * 60 - 100 + 630)
+    # the summary counts the time spent, not the time planned or paused
+    summary = tracker.log.summaries[0]
+    assert (summary.marks, summary.focus_done, summary.focus_skipped) == (b"XXXX", 4, 0)
+    assert summary.focus_seconds == pytest.approx(100 * 60)
+    assert summary.break_seconds == pytest.approx(40 * 60 - 100)
+    assert tracker.log.total == summary
+
+
+def test_dashboard_redraws_only_changed_rows(fake_clock: FakeClock) -> None:
+    lengths = [60.0 * s.length for s in focusedme_main.Round(TIME_ARGS).sessions]
+    trackers = {}
+    for name, offset in (("alice", -0.9), ("bob", 0.0), ("carol", 0.0)):
+        tracker = Tracker(Pomodoro(TIME_ARGS, 1).create_rounds(), Log())
+        tracker.timeline = Timeline.from_lengths(lengths, 1, fake_clock.now + offset)
+        trackers[name] = tracker
+    trackers["carol"].pause()
+    out = io.StringIO()
+    board = Dashboard(trackers, out, height=3)
+
+    board.draw()
+    frame = out.getvalue()
+    assert "alice" in frame and "bob" in frame and "carol" not in frame
+    assert "3 timers, 1 paused, 0 done" in frame
+    assert board.rows_written == 3
+    # nothing changed, nothing written
+    board.draw()
+    assert out.getvalue() == frame
+    # only the row whose second ticked over is rewritten
+    fake_clock.now += 0.25
+    board.draw()
+    assert board.rows_written == 4
+    # the label is styled by rich, in the color View.show_time gives it
+    assert re.fullmatch(
+        r"\033\[2;1Halice +1/1 \033\[91mFOCUS TIME +\033\[0m 24:59\033\[K",
+        out.getvalue()[len(frame) :],
+    )
+    assert list(board._labels) == ["focus_time"]
+    fake_clock.now += 140 * 60
+    board.draw()
+    assert "done" in out.getvalue()[len(frame) :]
+    assert not board._finished
+    trackers["carol"].resume()
+    fake_clock.now += 140 * 60
+    board.draw()
+    assert board._finished
+
+
+def test_dashboard_runs_async_trackers_on_one_loop() -> None:
+    # focus sessions of 30 ms, breaks of 10 minutes
+    fast = {"focus_time": 0.0005, "short_break": 10, "long_break": 10}
+    board = Dashboard(out=io.StringIO(), fps=50, height=4)
+    trackers = [AsyncTracker(Pomodoro(fast, 1).create_rounds()) for _ in range(2)]
+    for name, tracker in zip(("alice", "bob"), trackers):
+        board.add(name, tracker)
+    assert board.render().count("starting") == 2
+
+    async def main() -> None:
+        tasks = [asyncio.ensure_future(t.start(None, NO_SOUND)) for t in trackers]
+        await asyncio.sleep(0.1)
+        assert trackers[0].position() == (0, 1, pytest.approx(600, abs=1))
+        await trackers[1].pause()
+        await asyncio.sleep(0.01)
+        paused = trackers[1].position()
+        await asyncio.sleep(0.05)
+        assert trackers[1].position() == paused
+        for tracker in trackers:
+            await tracker.quit()
+        await board.run()
+        await asyncio.gather(*tasks)
+
+    asyncio.run(main())
+    assert board._finished
+    assert all(tracker.position() is None for tracker in trackers)
+    assert trackers[0].log.total.focus_done == 1
+
+
+def test_tracker_publishes_status_file(
+    fake_clock: FakeClock, tmp_path: pathlib.Path
+) -> None:
+    path = str(tmp_path / "focusedme.status")
+    status_file = StatusSegment(path)
+    tracker = Tracker(Pomodoro(TIME_ARGS, 1).create_rounds(), Log())
+    tracker.status_file = status_file
+    reader = StatusReader(path)
+    lines = []
+    wall_offset = time.time() - fake_clock.now
+
+    def show_time(remainder: int, num_round: int, num_session: int, _: str) -> None:
+        if num_session == 2 and remainder == 200:
+            snapshot = reader.read()
+            assert snapshot is not None and snapshot.pid == os.getpid()
+            # readers derive the remainder from the deadline on the wall clock
+            lines.append(snapshot.line(fake_clock.now + wall_offset))
+            raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        tracker.start(show_time, NO_SOUND)
+    assert lines == ["1/2 SHORT BREAK 03:20"]
+    assert reader.read().line() == "PAUSED 1/2 SHORT BREAK 03:20"
+    with pytest.raises(SegmentError):
+        StatusSegment(path).open()
+    tracker.start(None, NO_SOUND)
+    assert reader.read().state == "done"
+    status_file.close()
+    assert read_status(path).line() == "stopped"
+
+
+def test_view_publishes_the_round_count_of_the_schedule(
+    fake_clock: FakeClock,
+    tmp_path: pathlib.Path,
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture,
+) -> None:
+    path = str(tmp_path / "focusedme.status")
+    status_file = StatusSegment(path)
+    reader = StatusReader(path)
+    snapshots = []
+
+    def show_time(self: View, remainder: int, *_: object) -> None:
+        if remainder == 60:
+            snapshots.append(reader.read())
+
+    monkeypatch.setattr(View, "show_time", show_time)
+    # the rounds are pulled from Pomodoro.iter_rounds() as they start
+    args = dict(TIME_ARGS, num_rounds=2)
+    View(FakeTerminal()).run(args, NO_SOUND, status_file=status_file)
+    assert {s.num_rounds for s in snapshots} == {2}
+    assert snapshots[-1].round == 1
+    snapshot = reader.read()
+    assert snapshot.state == "done" and snapshot.num_rounds == 2
+    status_file.close()
+
+
+def test_status_file_reads_are_never_torn(tmp_path: pathlib.Path) -> None:
+    import subprocess
+
+    path = str(tmp_path / "focusedme.status")
+    created = StatusSegment(path)
+    created.open()
+    created.close()
+    # every payload the writer publishes has equal fields
+    writer = subprocess.Popen(
+        [
+            sys.executable,
+            "-c",
+            "import sys\n"
+            "from focusedme.segment import RUNNING, StatusSegment\n"
+            "segment = StatusSegment(sys.argv[1])\n"
+            "for i in range(1, 50001):\n"
+            "    segment.publish(RUNNING, i, i, 'focus_time', i, i, i)\n",
+            path,
+        ],
+        cwd=pathlib.Path(__file__).parent.parent,
+    )
+    reader = StatusReader(path)
+    try:
+        # however the two interleave, no read may mix two payloads
+        for _ in range(20000):
+            snapshot = reader.read()
+            assert snapshot is not None
+            values = snapshot[1:4] + snapshot[6:8]
+            assert len(set(values)) == 1, snapshot
+    finally:
+        writer.wait()
+    assert writer.returncode == 0
+
+    # a writer that died in the middle of an update leaves the sequence odd
+    with open(path, "r+b") as f:
+        f.seek(8)
+        f.write((1).to_bytes(8, "little"))
+    assert StatusReader(path).read(timeout=0.01) is None
+
+
+def test_log_plots_the_time_actually_spent(capsys: pytest.CaptureFixture) -> None:
+    log = Log()
+    log.record(0, "focus_time", "done", 1500.0)
+    log.record(0, "short_break", "done", 300.0)
+    log.record(0, "focus_time", "skipped", 610.0)
+    log.record(1, "focus_time", "done", 1500.0)
+    log.plot_results(View().plot)
+    out = capsys.readouterr().out
+    assert "Round #1: \nXO - 35 minutes\n" in out
+    assert "Round #2: \nX - 25 minutes\n" in out
+    assert "Total: 2 completed, 1 skipped - 60 minutes focused, 5 minutes" in out
+
+
+def test_tracker_only_materializes_started_rounds(fake_clock: FakeClock) -> None:
+    tracker = Tracker([], Log(), upcoming=Pomodoro(TIME_ARGS, 0).iter_rounds())
+    started = 0
+
+    def show_time(remainder: int, num_round: int, *_: object) -> None:
+        nonlocal started
+        started = num_round
+        if num_round == 5:
+            raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        tracker.start(show_time, NO_SOUND)
+    assert started == len(tracker.rounds) == 5
+    assert tracker.log.tracked_rounds is tracker.rounds
+
+
+def test_startup_defers_heavy_imports() -> None:
+    import subprocess
+
+    probe = (
+        "import sys, focusedme.__main__; "
+        "print(sorted({'asyncio', 'sqlite3', 'simpleaudio', 'subprocess',"
+        " 'configparser', 'importlib.metadata', 'focusedme.daemon',"
+        " 'focusedme.events', 'focusedme.history', 'focusedme.journal',"
+        " 'focusedme.profiling', 'focusedme.schedule', 'focusedme.segment'}"
+        " & set(sys.modules)))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", probe], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "[]"
+
+
+def _wait_for_server(path: str, command: str = "status") -> None:
+    """wait until the server answers, not just until its socket exists"""
+    for _ in range(200):
+        try:
+            request(command, path)
+            return
+        except DaemonError:
+            time.sleep(0.01)
+
+
+def test_daemon_serves_status_and_commands(tmp_path: pathlib.Path) -> None:
+    path = str(tmp_path / "fm.sock")
+    slow_args = {"focus_time": 10, "short_break": 10, "long_break": 10}
+    tracker = AsyncTracker(Pomodoro(slow_args, 1).create_rounds())
+    daemon = Daemon(tracker, NO_SOUND, path)
+    thread = threading.Thread(target=daemon.run)
+    thread.start()
+    try:
+        _wait_for_server(path)
+        assert request("status", path) in ("starting", "1/1 FOCUS TIME 10:00")
+        assert request("skip", path) == "ok"
+        time.sleep(0.05)
+        assert request("status", path) == "1/2 SHORT BREAK 10:00"
+        assert request("pause", path) == "ok"
+        assert request("status", path) == "PAUSED 1/2 SHORT BREAK 10:00"
+        assert request("resume", path) == "ok"
+        assert request("bogus", path) == "error: unknown command"
+        with pytest.raises(DaemonError):
+            Daemon(tracker, NO_SOUND, path).run()
+    finally:
+        request("quit", path)
+        thread.join(2)
+    assert not thread.is_alive()
+    assert not os.path.exists(path)
+    with pytest.raises(DaemonError):
+        request("status", path)
+
+
+def test_team_server_runs_named_timers(
+    tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    path = str(tmp_path / "team.sock")
+    fsync = os.fsync
+    synced_on: set[threading.Thread] = set()
+
+    def recording_fsync(fd: int) -> None:
+        synced_on.add(threading.current_thread())
+        fsync(fd)
+
+    monkeypatch.setattr(os, "fsync", recording_fsync)
+    journals = str(tmp_path / "journals")
+    template = focusedme_main.Round.round_template
+
+    def serve(defaults: dict[str, float]) -> tuple[TeamServer, threading.Thread]:
+        server = TeamServer(defaults, template, path, journals)
+        thread = threading.Thread(target=server.run)
+        thread.start()
+        _wait_for_server(path, "timers")
+        return server, thread
+
+    # one focus session of 30 ms then breaks of 10 minutes
+    fast = {"focus_time": 0.0005, "short_break": 10, "long_break": 10}
+    server, thread = serve(dict(fast, num_rounds=1))
+    try:
+        assert request("start alice", path) == "ok"
+        assert request("start bob 25 5 15 2", path) == "ok"
+        assert request("start bob", path) == "error: timer bob is already running"
+        assert request("start ../bob", path).startswith("error")
+        assert request("start dave 0 5 15 2", path).startswith("error")
+        assert request("timers", path) == "2"
+        time.sleep(0.1)
+        # alice moved on by herself, bob is still focusing
+        assert request("status alice", path) == "1/2 SHORT BREAK 10:00"
+        assert request("status bob", path) == "1/1 FOCUS TIME 25:00"
+        assert request("pause bob", path) == "ok"
+        assert request("skip bob", path) == "ok"
+        assert request("status bob", path) == "PAUSED 1/2 SHORT BREAK 05:00"
+        assert request("skip bob", path) == "ok"
+        assert request("status carol", path) == "error: unknown timer carol"
+        assert request("quit alice", path) == "ok"
+        assert request("timers", path) == "1"
+    finally:
+        server.stop()
+        thread.join(2)
+    assert not thread.is_alive()
+    assert not os.path.exists(path)
+    # journals are synced on worker threads, never by the loop
+    assert synced_on and thread not in synced_on
+
+    # bob resumes from his journal, alice starts over
+    server, thread = serve(dict(fast, num_rounds=1))
+    try:
+        assert request("start bob 25 5 15 2", path) == "ok"
+        assert request("status bob", path) == "1/3 FOCUS TIME 25:00"
+        assert request("start alice", path) == "ok"
+        assert request("status alice", path).startswith("1/1 FOCUS TIME")
+    finally:
+        server.stop()
+        thread.join(2)
+    assert sorted(os.listdir(journals)) == ["alice.bin", "bob.bin"]
+
+
+def test_team_timer_resumes_without_its_pauses(
+    tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    wall = [1_700_000_000.0]
+    monkeypatch.setattr(time, "time", lambda: wall[0])
+    args = dict(TIME_ARGS, num_rounds=2)
+    template = focusedme_main.Round.round_template
+    path = str(tmp_path / "bob.bin")
+
+    timer = TeamTimer("bob", args, template, Journal(path))
+    timer.begin(0.0)
+    wall[0] += 100
+    timer.pause(100.0)
+    assert timer.status(400.0) == "PAUSED 1/1 FOCUS TIME 23:20"
+    wall[0] += 500  # the server dies while bob is paused
+
+    timer = TeamTimer("bob", args, template, Journal(path))
+    timer.begin(1000.0)
+    assert timer.status(1000.0) == "1/1 FOCUS TIME 23:20"
+    assert timer.deadline == 1000.0 + 1400
+    # a session skipped to while paused is resumed paused as well
+    timer.pause(1000.0)
+    timer.skip(1000.0)
+    assert timer.status(1000.0) == "PAUSED 1/2 SHORT BREAK 05:00"
+    wall[0] += 200
+
+    timer = TeamTimer("bob", args, template, Journal(path))
+    timer.begin(0.0)
+    assert timer.status(0.0) == "1/2 SHORT BREAK 05:00"
+
+
+def test_client_sends_requests_to_the_server_answering_them(
+    tmp_path: pathlib.Path,
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture,
+) -> None:
+    from focusedme import daemon, team
+
+    requests = daemon.COMMANDS + focusedme_main.TEAM_REQUESTS
+    assert sorted(requests) == sorted(team.COMMANDS)
+    path = str(tmp_path / "team.sock")
+    server = TeamServer(TIME_ARGS, focusedme_main.Round.round_template, path, "")
+    thread = threading.Thread(target=server.run)
+    thread.start()
+    _wait_for_server(path, "timers")
+
+    def client(*argv: str) -> str:
+        monkeypatch.setattr(sys, "argv", ["focusedme", "--socket", path, "client"])
+        sys.argv.extend(argv)
+        focusedme_main.main()
+        return capsys.readouterr().out.strip()
+
+    try:
+        lengths = ["--lengths", "25", "5", "15", "2"]
+        assert client("start", "--timer", "bob", *lengths) == "ok"
+        assert client("status", "--timer", "bob") == "1/1 FOCUS TIME 25:00"
+        assert client("timers") == "1"
+        for argv, error in (
+            (["start"], "needs the --timer"),
+            (["timers", "--timer", "bob"], "leave out --timer"),
+            (["pause", "--timer", "bob", *lengths], "only sent with start"),
+        ):
+            with pytest.raises(SystemExit):
+                client(*argv)
+            assert error in capsys.readouterr().err
+    finally:
+        server.stop()
+        thread.join(2)
+
+
+def test_event_bus_coalesces_for_slow_subscribers(
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    bus = EventBus()
+    gate = threading.Event()
+    slow: list[Event] = []
+    fast: list[Event] = []
+    received = threading.Event()
+
+    def fast_subscriber(event: Event) -> None:
+        fast.append(event)
+        received.set()
+
+    slow_sub = bus.subscribe(lambda e: gate.wait() and slow.append(e))
+    bus.subscribe(fast_subscriber, [Tick])
+    throttled = bus.subscribe(lambda e: None, [Tick], min_interval=3600)
+    broken = bus.subscribe(lambda e: 1 / 0, [SessionDone])
+
+    bus.publish(SessionStarted(1, 1, "focus_time", 25))
+    time.sleep(0.05)  # the slow subscriber is now stuck on this event
+    for remainder in range(1500, 1000, -1):
+        bus.publish(Tick(1, 1, remainder, "focus_time"))
+        # the fast subscriber is not held up by the slow one
+        assert received.wait(2)
+        received.clear()
+    bus.publish(SessionDone(1, 1, "focus_time"))
+    bus.publish(Tick(1, 2, 300, "short_break"))
+    gate.set()
+    assert bus.flush(2)
+
+    assert slow == [
+        SessionStarted(1, 1, "focus_time", 25),
+        Tick(1, 1, 1001, "focus_time"),
+        SessionDone(1, 1, "focus_time"),
+        Tick(1, 2, 300, "short_break"),
+    ]
+    assert slow_sub.coalesced == 499
+    assert [e.remainder for e in fast] == list(range(1500, 1000, -1)) + [300]
+    assert throttled.delivered == 1
+    assert throttled.delivered + throttled.throttled + throttled.coalesced == 501
+    assert broken.delivered == 1
+    assert "ZeroDivisionError" in caplog.text
+
+
+def test_tracker_publishes_transitions(fake_clock: FakeClock) -> None:
+    bus = EventBus()
+    transitions: list[Event] = []
+    ticks = bus.subscribe(lambda e: None, [Tick])
+    bus.subscribe(transitions.append, [SessionStarted, SessionDone, RoundCompleted])
+    rounds = Pomodoro(TIME_ARGS, 1).create_rounds()
+    Tracker(rounds, Log(), events=bus).start(None, NO_SOUND)
+    assert bus.flush(2)
+
+    assert transitions[:3] == [
+        SessionStarted(1, 1, "focus_time", 25),
+        SessionDone(1, 1, "focus_time"),
+        SessionStarted(1, 2, "short_break", 5),
+    ]
+    assert transitions[-1] == RoundCompleted(1, 8)
+    assert len(transitions) == 17
+    assert ticks.delivered + ticks.coalesced + bus.coalesced == 140 * 60
+
+
+def test_simulate_matches_a_real_run(fake_clock: FakeClock) -> None:
+    def run(time_args: dict[str, int], simulated: bool) -> tuple[Log, list[Event]]:
+        bus = EventBus()
+        events: list[Event] = []
+        ticks = bus.subscribe(lambda e: None, [Tick])
+        bus.subscribe(events.append, [SessionStarted, SessionDone, RoundCompleted])
+        if simulated:
+            log = focusedme_main.simulate(time_args, bus)
+        else:
+            rounds = Pomodoro(time_args, time_args["num_rounds"]).create_rounds()
+            log = Log()
+            Tracker(rounds, log, events=bus).start(None, NO_SOUND)
+        assert bus.flush(2)
+        assert ticks.delivered + ticks.coalesced + bus.coalesced == 4 * 140 * 60
+        return log, events
+
+    started = fake_clock.now
+    log, events = run(TIME_ARGS, simulated=True)
+    # the real clock never moved
+    assert fake_clock.now == started
+
+    def sessions(log: Log) -> list[tuple[str, int, str, float]]:
+        # timestamps differ, durations do not
+        return [
+            (s.session_type, s.length, s.status, round(s.ended_at - s.started_at, 6))
+            for r in log.tracked_rounds
+            for s in r.sessions
+        ]
+
+    expected_log, expected_events = run(TIME_ARGS, simulated=False)
+    assert sessions(log) == sessions(expected_log)
+    assert events == expected_events
+
+    with pytest.raises(ConfigError):
+        focusedme_main.simulate(dict(TIME_ARGS, num_rounds=0))
+
+
+def test_monte_carlo_does_not_depend_on_workers(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    plan = montecarlo.Plan.parse("25,5,25,2")
+    # without interruptions every day is the whole schedule
+    steady = montecarlo.monte_carlo(
+        plan, montecarlo.Behaviour(interrupt=0.0), 10, workers=1
+    )
+    assert steady.minutes == {200: 10}
+    assert (steady.completed, steady.length) == (80, 10 * 280)
+
+    monkeypatch.setattr(montecarlo, "CHUNK_DAYS", 50)
+    behaviour = montecarlo.Behaviour(interrupt=0.5, quit=0.1)
+    alone = montecarlo.monte_carlo(plan, behaviour, 300, workers=1, seed=7)
+    pooled = montecarlo.monte_carlo(plan, behaviour, 300, workers=2, seed=7)
+    assert alone == pooled
+    assert alone.days == 300
+    assert 0 < alone.percentile(10) < alone.mean() < alone.percentile(90) <= 200
+
+    short = montecarlo.Plan.parse("25,5,25,2:FSFL")
+    assert short.template == ("focus_time", "short_break", "focus_time", "long_break")
+    with pytest.raises(ValueError):
+        montecarlo.Plan.parse("25,5,25,0")
+
+
+def test_planner_lays_out_working_days(monkeypatch: pytest.MonkeyPatch) -> None:
+    import datetime
+
+    time_args = dict(TIME_ARGS, num_rounds=2)
+    # Friday afternoon, then the weekend is skipped
+    start = datetime.datetime(2026, 10, 23, 16, 5)
+    table = planner.plan(time_args, start, days=4)
+    rows = list(table.rows())
+    days = [datetime.datetime.fromtimestamp(r[0]) for r in rows]
+    assert {d.date().isoformat() for d in days} == {"2026-10-23", "2026-10-26"}
+    assert days[0] == start
+    # Friday ends at 17:00, before the fourth session would
+    assert [r[2:] for r in rows if r[0] < start.timestamp() + 86400] == [
+        ("focus_time", 1, 1),
+        ("short_break", 1, 2),
+        ("focus_time", 1, 3),
+    ]
+    # Monday runs both rounds, the session that would overlap lunch after it
+    monday = [(d.strftime("%H:%M"), r[2]) for d, r in zip(days, rows) if d.day == 26]
+    assert monday[0] == ("09:00", "focus_time") and len(monday) == 16
+    assert monday[9:11] == [("11:45", "short_break"), ("13:00", "focus_time")]
+    # same sessions as the rounds built one by one
+    rounds = Pomodoro(time_args, 2).create_rounds()
+    expected = [(s.session_type, 60 * s.length) for r in rounds for s in r.sessions]
+    assert [(r[2], r[1] - r[0]) for r in rows[3:]] == expected
+
+    monkeypatch.setattr(planner, "_numpy", lambda: None)
+    fallback = planner.plan(time_args, start, days=4)
+    assert list(fallback.rows()) == rows
+
+    out = io.StringIO()
+    assert planner.write_csv(table, out) == 19
+    assert out.getvalue().splitlines()[1] == (
+        "2026-10-23T16:05:00,2026-10-23T16:30:00,focus_time,1,1"
+    )
+    out = io.StringIO()
+    assert planner.write_ics(table, out, breaks=False) == 10
+    assert out.getvalue().count("BEGIN:VEVENT\r\n") == 10
+    assert re.search(r"UID:20261023T\d{6}Z-1-1@focusedme\r\n", out.getvalue())
+    assert "SUMMARY:FOCUS TIME 1/1\r\n" in out.getvalue()
+
+
+def test_profiler_histograms(
+    fake_clock: FakeClock, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    for value, wanted in (("1", True), ("yes", True), ("0", False), ("false", False)):
+        monkeypatch.setenv(profiling.ENV_VAR, value)
+        assert profiling.requested() is wanted
+    monkeypatch.delenv(profiling.ENV_VAR)
+    assert not profiling.requested()
+
+    histogram = profiling.Histogram("lateness")
+    for micros in range(1, 100_001):
+        histogram.record(micros / 1e6)
+    assert len(histogram.counts) == profiling.NUM_BUCKETS
+    assert histogram.percentile(50) == pytest.approx(50_000, rel=0.01)
+    assert histogram.percentile(99.9) == pytest.approx(99_900, rel=0.01)
+    assert histogram.percentile(100) == histogram.max == 100_000
+
+    profiler = profiling.enable(dump_at_exit=False)
+    try:
+        sleep = time.sleep
+
+        def oversleep(seconds: float) -> None:
+            sleep(seconds + 0.002)
+
+        rounds = Pomodoro(TIME_ARGS, 1).create_rounds()
+        Tracker(rounds, Log(), sleep=oversleep).start(lambda *_: None, NO_SOUND)
+    finally:
+        profiling.disable()
+
+    total = 140 * 60
+    assert profiler.render.count == total
+    assert profiler.lateness.count == total
+    assert profiler.lateness.percentile(50) == pytest.approx(2000, rel=0.01)
+    out = io.StringIO()
+    profiler.dump(out)
+    assert "tick lateness: n=8400" in out.getvalue()
+
+
+def test_config_cache_follows_file_changes(tmp_path: pathlib.Path) -> None:
+    file = str(tmp_path / "fm.init")
+    assert Config.load(file) == Settings()
+
+    Config.save(Settings(focus_time=50, num_rounds=0, sound=False), file)
+    loaded = Config.load(file)
+    assert loaded is Config.load(file)
+    assert loaded.time_args()["focus_time"] == 50
+    assert loaded.sound_args() == {"sound": "", "path": "Ring01.wav"}
+    assert os.listdir(tmp_path) == ["fm.init"]
+    umask = os.umask(0o022)
+    os.umask(umask)
+    assert os.stat(file).st_mode & 0o777 == 0o666 & ~umask
+    # saving again keeps the mode of the file it replaces
+    os.chmod(file, 0o640)
+    Config.save(Settings(focus_time=50, num_rounds=0, sound=False), file)
+    assert os.stat(file).st_mode & 0o777 == 0o640
+
+    with open(file) as f:
+        text = f.read().replace("focus_time = 50", "focus_time = 45")
+    with open(file, "w") as f:
+        f.write(text)
+    os.utime(file, ns=(1, 1))
+    assert Config.load(file).focus_time == 45
+
+    with open(file, "w") as f:
+        f.write(text.replace("focus_time = 45", "focus_time = -1"))
+    with pytest.raises(ConfigError):
+        Config.load(file)
+
+
+def test_config_saves_where_it_loads() -> None:
+    assert Config.file().endswith(os.path.join("config", "fm.init"))
+    assert os.path.exists(Config.file())